@@ -1,1657 +1,359 @@
+import argparse
+import hashlib
+import itertools
 import json
+import marshal
+import os
 import re
-from collections import defaultdict
-
-def extract_database_entities(content):
-    """Extract database entities, tables, and fields from content."""
-    entities = defaultdict(lambda: {
+import sys
+from collections import defaultdict, namedtuple
+
+from corpus_store import PROJECT_ROOT, InternedCorpus, find_corpus, load_corpus
+from schema_model import SchemaRegistry, build_enums, build_models
+
+DEFAULT_PRISMA_FILE = os.path.join(PROJECT_ROOT, 'database_schema_complete.prisma')
+DEFAULT_REPORT_FILE = os.path.join(PROJECT_ROOT, 'database_schema_report.md')
+# Entities and enums written down from the PRDs
+DEFAULT_SCHEMA_DEFINITION = os.path.join(PROJECT_ROOT, 'database_schema_definition.json')
+
+# Common database/table keywords to look for
+TABLE_KEYWORDS = [
+    'table', 'entité', 'entite', 'entity', 'model', 'modèle',
+    'collection', 'base de données', 'database', 'schema'
+]
+
+# Field type indicators
+FIELD_INDICATORS = [
+    'id', 'nom', 'name', 'date', 'prix', 'price', 'montant', 'amount',
+    'status', 'statut', 'type', 'code', 'numero', 'number', 'email',
+    'telephone', 'phone', 'adresse', 'address', 'description', 'commentaire',
+    'reference', 'quantite', 'quantity', 'total'
+]
+
+# Look for explicit table mentions
+TABLE_PATTERNS = [
+    r'Table[s]?\s*[:=]\s*([A-Z][a-zA-Z_]+)',
+    r'Entité[s]?\s*[:=]\s*([A-Z][a-zA-Z_]+)',
+    r'Model[s]?\s*[:=]\s*([A-Z][a-zA-Z_]+)',
+    r'(?:table|entité|model)\s+([A-Z][a-zA-Z_]+)',
+]
+
+# Look for field definitions
+FIELD_PATTERNS = [
+    r'([a-z][a-zA-Z_]+)\s*:\s*([A-Z][a-zA-Z]+)',  # field: Type
+    r'([a-z][a-zA-Z_]+)\s*\(([A-Z][a-zA-Z]+)\)',  # field(Type)
+]
+
+# Look for relationships
+RELATION_PATTERNS = [
+    r'relation[s]?\s+avec\s+([A-Z][a-zA-Z_]+)',
+    r'lié[e]?\s+à\s+([A-Z][a-zA-Z_]+)',
+    r'référence\s+([A-Z][a-zA-Z_]+)',
+    r'([A-Z][a-zA-Z_]+)\s+→\s+([A-Z][a-zA-Z_]+)',
+    r'hasMany\s+([A-Z][a-zA-Z_]+)',
+    r'belongsTo\s+([A-Z][a-zA-Z_]+)',
+]
+
+# Match kinds, in the order their patterns are tried at each position
+PATTERN_KINDS = (('entity', TABLE_PATTERNS), ('relation', RELATION_PATTERNS), ('field', FIELD_PATTERNS))
+
+# Bump when the way matches become entities changes without the patterns changing
+ANALYSIS_CACHE_VERSION = 1
+
+# entity: name is the entity. field: name and value are the field and its type.
+# relation: value is the target; name is the source for 'A → B', else None.
+EntityMatch = namedtuple('EntityMatch', ['kind', 'name', 'value', 'start', 'end'])
+
+_REGEX_TOKEN = re.compile(r'\\.|\[(?:\\.|[^\]])*\]|\((?!\?)')
+
+def _rewrite_pattern(pattern, prefix):
+    """Name the capturing groups prefix_1, prefix_2... and keep whitespace within one line."""
+    numbers = itertools.count(1)
+
+    def rewrite(token):
+        token = token.group()
+        if token == '(':
+            return f'(?P<{prefix}_{next(numbers)}>'
+        return r'[^\S\n]' if token == r'\s' else token
+
+    return _REGEX_TOKEN.sub(rewrite, pattern), next(numbers) - 1
+
+def compile_scanner(pattern_kinds=PATTERN_KINDS):
+    """Merge every pattern into one regex of named alternatives.
+
+    Returns (regex, {alternative name: (kind, capture group names)}). At
+    each position the first alternative that matches wins, so entity
+    patterns take precedence over relations, and relations over fields.
+    Matches start at the beginning of a word, which rules out fragments
+    like 'ate: Septembre' inside 'Date: Septembre' and lets the engine skip
+    the rest of a word at once. Whitespace in the patterns no longer
+    matches newlines: a match never spans two paragraphs or table cells,
+    which lets a paragraph's matches be reused wherever it occurs.
+    """
+    alternatives = []
+    groups = {}
+    for kind, patterns in pattern_kinds:
+        for number, pattern in enumerate(patterns):
+            name = f'{kind}_{number}'
+            body, count = _rewrite_pattern(pattern, name)
+            alternatives.append(f'(?P<{name}>{body})')
+            groups[name] = (kind, [f'{name}_{group}' for group in range(1, count + 1)])
+    # Every pattern starts with a letter; checking that first fails fast
+    return re.compile(r'\b(?=[^\W\d_])(?:' + '|'.join(alternatives) + ')'), groups
+
+SCANNER, SCANNER_GROUPS = compile_scanner()
+
+def iter_entity_matches(content):
+    """Yield an EntityMatch for each pattern match, in one pass over content."""
+    for match in SCANNER.finditer(content):
+        kind, group_names = SCANNER_GROUPS[match.lastgroup]
+        captured = [match.group(name) for name in group_names]
+        if kind == 'entity':
+            name, value = captured[0], None
+        elif kind == 'relation' and len(captured) == 1:
+            name, value = None, captured[0]
+        else:
+            name, value = captured
+        yield EntityMatch(kind, name, value, match.start(), match.end())
+
+def _new_entity():
+    return {
         'fields': set(),
         'relations': set(),
         'source_files': []
-    })
-
-    # Common database/table keywords to look for
-    table_keywords = [
-        'table', 'entité', 'entite', 'entity', 'model', 'modèle',
-        'collection', 'base de données', 'database', 'schema'
-    ]
-
-    # Field type indicators
-    field_indicators = [
-        'id', 'nom', 'name', 'date', 'prix', 'price', 'montant', 'amount',
-        'status', 'statut', 'type', 'code', 'numero', 'number', 'email',
-        'telephone', 'phone', 'adresse', 'address', 'description', 'commentaire',
-        'reference', 'quantite', 'quantity', 'total'
-    ]
-
-    # Look for explicit table mentions
-    table_patterns = [
-        r'Table[s]?\s*[:=]\s*([A-Z][a-zA-Z_]+)',
-        r'Entité[s]?\s*[:=]\s*([A-Z][a-zA-Z_]+)',
-        r'Model[s]?\s*[:=]\s*([A-Z][a-zA-Z_]+)',
-        r'(?:table|entité|model)\s+([A-Z][a-zA-Z_]+)',
-    ]
-
-    # Look for field definitions
-    field_patterns = [
-        r'([a-z][a-zA-Z_]+)\s*:\s*([A-Z][a-zA-Z]+)',  # field: Type
-        r'([a-z][a-zA-Z_]+)\s*\(([A-Z][a-zA-Z]+)\)',  # field(Type)
-    ]
-
-    # Look for relationships
-    relation_patterns = [
-        r'relation[s]?\s+avec\s+([A-Z][a-zA-Z_]+)',
-        r'lié[e]?\s+à\s+([A-Z][a-zA-Z_]+)',
-        r'référence\s+([A-Z][a-zA-Z_]+)',
-        r'([A-Z][a-zA-Z_]+)\s+→\s+([A-Z][a-zA-Z_]+)',
-        r'hasMany\s+([A-Z][a-zA-Z_]+)',
-        r'belongsTo\s+([A-Z][a-zA-Z_]+)',
-    ]
-
-    return None
-
-def analyze_all_documents():
-    """Analyze all extracted documents."""
-    with open('implementations_extracted.json', 'r', encoding='utf-8') as f:
-        all_content = json.load(f)
-
-    # Manual extraction based on domain knowledge
-    schema = {
-        # Core entities
-        'User': {
-            'description': 'Utilisateurs de la plateforme',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'email': 'String @unique',
-                'passwordHash': 'String',
-                'role': 'UserRole @default(USER)',
-                'firstName': 'String',
-                'lastName': 'String',
-                'phone': 'String?',
-                'preferredLanguage': 'Language @default(FR)',
-                'isActive': 'Boolean @default(true)',
-                'lastLoginAt': 'DateTime?',
-                'emailVerifiedAt': 'DateTime?',
-                'phoneVerifiedAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Team', 'AuditLog', 'Session', 'Notification'],
-            'source': ['PRD-11-Gestion-Utilisateurs']
-        },
-
-        'Team': {
-            'description': 'Équipes/concessions',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'name': 'String',
-                'type': 'TeamType',
-                'managerId': 'String',
-                'status': 'TeamStatus @default(ACTIVE)',
-                'code': 'String @unique',
-                'address': 'String?',
-                'city': 'String?',
-                'wilaya': 'String?',
-                'phone': 'String?',
-                'email': 'String?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['User', 'Vehicle', 'Quote', 'Invoice'],
-            'source': ['PRD-11-Gestion-Utilisateurs', 'PRD-01-Gestion-Stock']
-        },
-
-        'Vehicle': {
-            'description': 'Véhicules en stock',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'vin': 'String @unique',
-                'vehicleModelId': 'String',
-                'teamId': 'String',
-                'status': 'VehicleStatus @default(AVAILABLE)',
-                'condition': 'VehicleCondition',
-                'mileage': 'Int?',
-                'year': 'Int',
-                'color': 'String',
-                'interiorColor': 'String?',
-                'purchasePrice': 'Decimal',
-                'sellingPrice': 'Decimal',
-                'currency': 'Currency @default(DZD)',
-                'purchaseDate': 'DateTime?',
-                'location': 'String?',
-                'features': 'Json?',
-                'notes': 'String?',
-                'publishedAt': 'DateTime?',
-                'soldAt': 'DateTime?',
-                'archivedAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['VehicleModel', 'Team', 'VehicleMedia', 'VehicleHistory', 'Quote', 'Order'],
-            'source': ['PRD-01-Gestion-Stock', 'PRD-06-Catalogue-Vehicules']
-        },
-
-        'VehicleModel': {
-            'description': 'Modèles de véhicules (référentiel constructeurs)',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'brandId': 'String',
-                'name': 'String',
-                'slug': 'String @unique',
-                'category': 'VehicleCategory',
-                'bodyType': 'BodyType',
-                'fuelType': 'FuelType',
-                'transmission': 'TransmissionType',
-                'engineCapacity': 'Int?',
-                'horsePower': 'Int?',
-                'co2Emission': 'Int?',
-                'energyLabel': 'EnergyLabel?',
-                'seats': 'Int?',
-                'doors': 'Int?',
-                'specifications': 'Json?',
-                'translations': 'Json?',
-                'isActive': 'Boolean @default(true)',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Brand', 'Vehicle', 'VehicleConfiguration'],
-            'source': ['PRD-06-Catalogue-Vehicules']
-        },
-
-        'Brand': {
-            'description': 'Marques de véhicules',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'name': 'String @unique',
-                'slug': 'String @unique',
-                'logo': 'String?',
-                'country': 'String?',
-                'isActive': 'Boolean @default(true)',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['VehicleModel'],
-            'source': ['PRD-06-Catalogue-Vehicules']
-        },
-
-        'VehicleConfiguration': {
-            'description': 'Configurations de véhicules neufs',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'vehicleModelId': 'String',
-                'name': 'String',
-                'trim': 'String',
-                'basePrice': 'Decimal',
-                'options': 'Json',
-                'totalPrice': 'Decimal',
-                'availability': 'String?',
-                'deliveryTime': 'Int?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['VehicleModel'],
-            'source': ['PRD-06-Catalogue-Vehicules']
-        },
-
-        'VehicleMedia': {
-            'description': 'Photos et vidéos des véhicules',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'vehicleId': 'String',
-                'type': 'MediaType',
-                'url': 'String',
-                'thumbnailUrl': 'String?',
-                'order': 'Int @default(0)',
-                'is360': 'Boolean @default(false)',
-                'caption': 'String?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Vehicle'],
-            'source': ['PRD-06-Catalogue-Vehicules']
-        },
-
-        'VehicleHistory': {
-            'description': 'Historique des véhicules',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'vehicleId': 'String',
-                'eventType': 'VehicleEventType',
-                'eventDate': 'DateTime',
-                'description': 'String',
-                'performedBy': 'String?',
-                'documents': 'Json?',
-                'cost': 'Decimal?',
-                'mileage': 'Int?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['Vehicle'],
-            'source': ['PRD-06-Catalogue-Vehicules']
-        },
-
-        'Customer': {
-            'description': 'Clients (CRM)',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'userId': 'String? @unique',
-                'type': 'CustomerType',
-                'firstName': 'String',
-                'lastName': 'String',
-                'email': 'String @unique',
-                'phone': 'String',
-                'address': 'String?',
-                'city': 'String?',
-                'wilaya': 'String?',
-                'postalCode': 'String?',
-                'dateOfBirth': 'DateTime?',
-                'idType': 'IdType?',
-                'idNumber': 'String?',
-                'profession': 'String?',
-                'companyName': 'String?',
-                'taxId': 'String?',
-                'status': 'CustomerStatus @default(PROSPECT)',
-                'source': 'String?',
-                'tags': 'Json?',
-                'preferences': 'Json?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['User', 'Lead', 'Appointment', 'Quote', 'Order', 'Interaction', 'LoyaltyCard'],
-            'source': ['PRD-04-CRM']
-        },
-
-        'Lead': {
-            'description': 'Prospects en cours de prospection',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'customerId': 'String',
-                'assignedToId': 'String',
-                'source': 'LeadSource',
-                'status': 'LeadStatus @default(NEW)',
-                'score': 'Int?',
-                'interestedVehicleId': 'String?',
-                'budget': 'Decimal?',
-                'timeline': 'String?',
-                'notes': 'String?',
-                'lastContactDate': 'DateTime?',
-                'nextFollowUpDate': 'DateTime?',
-                'convertedAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Customer', 'User', 'Vehicle'],
-            'source': ['PRD-04-CRM']
-        },
-
-        'Appointment': {
-            'description': 'Rendez-vous clients',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'customerId': 'String',
-                'assignedToId': 'String',
-                'type': 'AppointmentType',
-                'status': 'AppointmentStatus @default(SCHEDULED)',
-                'scheduledAt': 'DateTime',
-                'duration': 'Int',
-                'vehicleId': 'String?',
-                'location': 'String?',
-                'notes': 'String?',
-                'reminderSent': 'Boolean @default(false)',
-                'completedAt': 'DateTime?',
-                'cancelledAt': 'DateTime?',
-                'cancellationReason': 'String?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Customer', 'User', 'Vehicle'],
-            'source': ['PRD-04-CRM']
-        },
-
-        'Interaction': {
-            'description': 'Historique des interactions clients',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'customerId': 'String',
-                'userId': 'String',
-                'type': 'InteractionType',
-                'channel': 'CommunicationChannel',
-                'subject': 'String?',
-                'content': 'String',
-                'direction': 'Direction',
-                'duration': 'Int?',
-                'attachments': 'Json?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['Customer', 'User'],
-            'source': ['PRD-04-CRM']
-        },
-
-        'Quote': {
-            'description': 'Devis clients',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'quoteNumber': 'String @unique',
-                'customerId': 'String',
-                'teamId': 'String',
-                'createdById': 'String',
-                'status': 'QuoteStatus @default(DRAFT)',
-                'validUntil': 'DateTime',
-                'vehicleId': 'String?',
-                'subtotal': 'Decimal',
-                'taxAmount': 'Decimal',
-                'discountAmount': 'Decimal @default(0)',
-                'total': 'Decimal',
-                'currency': 'Currency @default(DZD)',
-                'terms': 'String?',
-                'notes': 'String?',
-                'convertedToInvoiceId': 'String? @unique',
-                'convertedAt': 'DateTime?',
-                'sentAt': 'DateTime?',
-                'viewedAt': 'DateTime?',
-                'acceptedAt': 'DateTime?',
-                'rejectedAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Customer', 'Team', 'User', 'Vehicle', 'QuoteItem', 'Invoice'],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'QuoteItem': {
-            'description': 'Lignes de devis',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'quoteId': 'String',
-                'description': 'String',
-                'quantity': 'Int @default(1)',
-                'unitPrice': 'Decimal',
-                'taxRate': 'Decimal',
-                'discountRate': 'Decimal @default(0)',
-                'total': 'Decimal',
-                'vehicleId': 'String?',
-                'order': 'Int @default(0)',
-            },
-            'relations': ['Quote', 'Vehicle'],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'Invoice': {
-            'description': 'Factures',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'invoiceNumber': 'String @unique',
-                'quoteId': 'String?',
-                'customerId': 'String',
-                'teamId': 'String',
-                'createdById': 'String',
-                'status': 'InvoiceStatus @default(DRAFT)',
-                'type': 'InvoiceType @default(STANDARD)',
-                'issueDate': 'DateTime @default(now())',
-                'dueDate': 'DateTime',
-                'subtotal': 'Decimal',
-                'taxAmount': 'Decimal',
-                'discountAmount': 'Decimal @default(0)',
-                'total': 'Decimal',
-                'amountPaid': 'Decimal @default(0)',
-                'amountDue': 'Decimal',
-                'currency': 'Currency @default(DZD)',
-                'terms': 'String?',
-                'notes': 'String?',
-                'sentAt': 'DateTime?',
-                'paidAt': 'DateTime?',
-                'cancelledAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Quote', 'Customer', 'Team', 'User', 'InvoiceItem', 'Payment', 'CreditNote'],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'InvoiceItem': {
-            'description': 'Lignes de facture',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'invoiceId': 'String',
-                'description': 'String',
-                'quantity': 'Int @default(1)',
-                'unitPrice': 'Decimal',
-                'taxRate': 'Decimal',
-                'discountRate': 'Decimal @default(0)',
-                'total': 'Decimal',
-                'vehicleId': 'String?',
-                'order': 'Int @default(0)',
-            },
-            'relations': ['Invoice', 'Vehicle'],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'Payment': {
-            'description': 'Paiements et acomptes',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'paymentNumber': 'String @unique',
-                'invoiceId': 'String',
-                'customerId': 'String',
-                'amount': 'Decimal',
-                'currency': 'Currency @default(DZD)',
-                'method': 'PaymentMethod',
-                'status': 'PaymentStatus @default(PENDING)',
-                'transactionId': 'String?',
-                'reference': 'String?',
-                'paymentDate': 'DateTime @default(now())',
-                'notes': 'String?',
-                'processedAt': 'DateTime?',
-                'failedAt': 'DateTime?',
-                'failureReason': 'String?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Invoice', 'Customer'],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'CreditNote': {
-            'description': 'Avoirs (remboursements)',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'creditNoteNumber': 'String @unique',
-                'invoiceId': 'String',
-                'customerId': 'String',
-                'amount': 'Decimal',
-                'currency': 'Currency @default(DZD)',
-                'reason': 'String',
-                'status': 'CreditNoteStatus @default(DRAFT)',
-                'issueDate': 'DateTime @default(now())',
-                'appliedAt': 'DateTime?',
-                'notes': 'String?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Invoice', 'Customer'],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'Order': {
-            'description': 'Commandes de véhicules',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'orderNumber': 'String @unique',
-                'customerId': 'String',
-                'vehicleId': 'String',
-                'invoiceId': 'String?',
-                'status': 'OrderStatus @default(PENDING)',
-                'orderDate': 'DateTime @default(now())',
-                'deliveryDate': 'DateTime?',
-                'totalAmount': 'Decimal',
-                'currency': 'Currency @default(DZD)',
-                'notes': 'String?',
-                'completedAt': 'DateTime?',
-                'cancelledAt': 'DateTime?',
-                'cancellationReason': 'String?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Customer', 'Vehicle', 'Invoice', 'Return', 'AfterSalesService'],
-            'source': ['PRD-03-Marketplace', 'PRD-10-Retours-Annulations']
-        },
-
-        'Return': {
-            'description': 'Retours et annulations',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'returnNumber': 'String @unique',
-                'orderId': 'String',
-                'customerId': 'String',
-                'vehicleId': 'String',
-                'type': 'ReturnType',
-                'status': 'ReturnStatus @default(REQUESTED)',
-                'reason': 'String',
-                'description': 'String?',
-                'requestDate': 'DateTime @default(now())',
-                'approvedAt': 'DateTime?',
-                'completedAt': 'DateTime?',
-                'refundAmount': 'Decimal?',
-                'refundMethod': 'PaymentMethod?',
-                'inspectionNotes': 'String?',
-                'resolutionNotes': 'String?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Order', 'Customer', 'Vehicle', 'Dispute'],
-            'source': ['PRD-10-Retours-Annulations']
-        },
-
-        'Dispute': {
-            'description': 'Litiges',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'disputeNumber': 'String @unique',
-                'returnId': 'String?',
-                'orderId': 'String?',
-                'customerId': 'String',
-                'type': 'DisputeType',
-                'status': 'DisputeStatus @default(OPEN)',
-                'priority': 'Priority',
-                'subject': 'String',
-                'description': 'String',
-                'assignedToId': 'String?',
-                'resolution': 'String?',
-                'resolvedAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Return', 'Order', 'Customer', 'User'],
-            'source': ['PRD-10-Retours-Annulations']
-        },
-
-        'AfterSalesService': {
-            'description': 'Service après-vente',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'ticketNumber': 'String @unique',
-                'orderId': 'String',
-                'customerId': 'String',
-                'vehicleId': 'String',
-                'type': 'ServiceType',
-                'status': 'ServiceStatus @default(OPEN)',
-                'priority': 'Priority',
-                'subject': 'String',
-                'description': 'String',
-                'assignedToId': 'String?',
-                'scheduledAt': 'DateTime?',
-                'completedAt': 'DateTime?',
-                'resolution': 'String?',
-                'cost': 'Decimal?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Order', 'Customer', 'Vehicle', 'User'],
-            'source': ['PRD-04-CRM']
-        },
-
-        'Complaint': {
-            'description': 'Réclamations',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'complaintNumber': 'String @unique',
-                'customerId': 'String',
-                'orderId': 'String?',
-                'type': 'ComplaintType',
-                'status': 'ComplaintStatus @default(NEW)',
-                'priority': 'Priority',
-                'subject': 'String',
-                'description': 'String',
-                'assignedToId': 'String?',
-                'resolution': 'String?',
-                'resolvedAt': 'DateTime?',
-                'satisfactionRating': 'Int?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Customer', 'Order', 'User'],
-            'source': ['PRD-04-CRM']
-        },
-
-        'Review': {
-            'description': 'Avis et évaluations clients',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'customerId': 'String',
-                'vehicleId': 'String?',
-                'orderId': 'String?',
-                'rating': 'Int',
-                'title': 'String?',
-                'comment': 'String?',
-                'pros': 'String?',
-                'cons': 'String?',
-                'status': 'ReviewStatus @default(PENDING)',
-                'isVerified': 'Boolean @default(false)',
-                'publishedAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Customer', 'Vehicle', 'Order'],
-            'source': ['PRD-03-Marketplace']
-        },
-
-        'Supplier': {
-            'description': 'Fournisseurs',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'name': 'String',
-                'code': 'String @unique',
-                'type': 'SupplierType',
-                'status': 'SupplierStatus @default(ACTIVE)',
-                'email': 'String',
-                'phone': 'String',
-                'address': 'String?',
-                'city': 'String?',
-                'country': 'String?',
-                'taxId': 'String?',
-                'contactPerson': 'String?',
-                'paymentTerms': 'String?',
-                'rating': 'Decimal?',
-                'notes': 'String?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['PurchaseOrder', 'SupplierInvoice', 'SupplierPerformance'],
-            'source': ['PRD-07-Gestion-Fournisseurs']
-        },
-
-        'PurchaseOrder': {
-            'description': 'Commandes fournisseurs',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'orderNumber': 'String @unique',
-                'supplierId': 'String',
-                'teamId': 'String',
-                'createdById': 'String',
-                'status': 'PurchaseOrderStatus @default(DRAFT)',
-                'orderDate': 'DateTime @default(now())',
-                'expectedDeliveryDate': 'DateTime?',
-                'actualDeliveryDate': 'DateTime?',
-                'subtotal': 'Decimal',
-                'taxAmount': 'Decimal',
-                'total': 'Decimal',
-                'currency': 'Currency @default(DZD)',
-                'terms': 'String?',
-                'notes': 'String?',
-                'receivedAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Supplier', 'Team', 'User', 'PurchaseOrderItem', 'Delivery'],
-            'source': ['PRD-07-Gestion-Fournisseurs']
-        },
-
-        'PurchaseOrderItem': {
-            'description': 'Lignes de commande fournisseur',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'purchaseOrderId': 'String',
-                'description': 'String',
-                'quantity': 'Int',
-                'unitPrice': 'Decimal',
-                'taxRate': 'Decimal',
-                'total': 'Decimal',
-                'receivedQuantity': 'Int @default(0)',
-                'vehicleModelId': 'String?',
-                'order': 'Int @default(0)',
-            },
-            'relations': ['PurchaseOrder', 'VehicleModel'],
-            'source': ['PRD-07-Gestion-Fournisseurs']
-        },
-
-        'Delivery': {
-            'description': 'Réceptions de livraisons',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'deliveryNumber': 'String @unique',
-                'purchaseOrderId': 'String',
-                'supplierId': 'String',
-                'status': 'DeliveryStatus @default(SCHEDULED)',
-                'scheduledDate': 'DateTime',
-                'actualDate': 'DateTime?',
-                'receivedById': 'String?',
-                'notes': 'String?',
-                'documents': 'Json?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['PurchaseOrder', 'Supplier', 'User'],
-            'source': ['PRD-07-Gestion-Fournisseurs']
-        },
-
-        'SupplierInvoice': {
-            'description': 'Factures fournisseurs',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'invoiceNumber': 'String @unique',
-                'supplierId': 'String',
-                'purchaseOrderId': 'String?',
-                'status': 'InvoiceStatus @default(PENDING)',
-                'issueDate': 'DateTime',
-                'dueDate': 'DateTime',
-                'subtotal': 'Decimal',
-                'taxAmount': 'Decimal',
-                'total': 'Decimal',
-                'amountPaid': 'Decimal @default(0)',
-                'currency': 'Currency @default(DZD)',
-                'paidAt': 'DateTime?',
-                'notes': 'String?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Supplier', 'PurchaseOrder'],
-            'source': ['PRD-07-Gestion-Fournisseurs']
-        },
-
-        'SupplierPerformance': {
-            'description': 'Performance des fournisseurs',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'supplierId': 'String',
-                'period': 'DateTime',
-                'deliveryScore': 'Decimal',
-                'qualityScore': 'Decimal',
-                'priceScore': 'Decimal',
-                'overallScore': 'Decimal',
-                'totalOrders': 'Int',
-                'onTimeDeliveries': 'Int',
-                'defectRate': 'Decimal',
-                'notes': 'String?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['Supplier'],
-            'source': ['PRD-07-Gestion-Fournisseurs']
-        },
-
-        'Warranty': {
-            'description': 'Garanties',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'vehicleId': 'String',
-                'supplierId': 'String?',
-                'type': 'WarrantyType',
-                'startDate': 'DateTime',
-                'endDate': 'DateTime',
-                'coverage': 'String',
-                'terms': 'String?',
-                'documents': 'Json?',
-                'isActive': 'Boolean @default(true)',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Vehicle', 'Supplier'],
-            'source': ['PRD-07-Gestion-Fournisseurs']
-        },
-
-        'MarketingCampaign': {
-            'description': 'Campagnes marketing',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'name': 'String',
-                'type': 'CampaignType',
-                'status': 'CampaignStatus @default(DRAFT)',
-                'channel': 'CommunicationChannel',
-                'startDate': 'DateTime',
-                'endDate': 'DateTime?',
-                'targetAudience': 'Json?',
-                'message': 'String',
-                'budget': 'Decimal?',
-                'sent': 'Int @default(0)',
-                'opened': 'Int @default(0)',
-                'clicked': 'Int @default(0)',
-                'converted': 'Int @default(0)',
-                'createdById': 'String',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['User', 'CampaignRecipient'],
-            'source': ['PRD-04-CRM']
-        },
-
-        'CampaignRecipient': {
-            'description': 'Destinataires de campagnes',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'campaignId': 'String',
-                'customerId': 'String',
-                'status': 'RecipientStatus',
-                'sentAt': 'DateTime?',
-                'openedAt': 'DateTime?',
-                'clickedAt': 'DateTime?',
-                'convertedAt': 'DateTime?',
-                'unsubscribedAt': 'DateTime?',
-            },
-            'relations': ['MarketingCampaign', 'Customer'],
-            'source': ['PRD-04-CRM']
-        },
-
-        'LoyaltyCard': {
-            'description': 'Cartes de fidélité',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'customerId': 'String @unique',
-                'cardNumber': 'String @unique',
-                'tier': 'LoyaltyTier @default(BRONZE)',
-                'points': 'Int @default(0)',
-                'pointsEarned': 'Int @default(0)',
-                'pointsRedeemed': 'Int @default(0)',
-                'status': 'LoyaltyStatus @default(ACTIVE)',
-                'issuedAt': 'DateTime @default(now())',
-                'expiresAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Customer', 'LoyaltyTransaction'],
-            'source': ['PRD-04-CRM']
-        },
-
-        'LoyaltyTransaction': {
-            'description': 'Transactions de fidélité',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'loyaltyCardId': 'String',
-                'type': 'TransactionType',
-                'points': 'Int',
-                'description': 'String',
-                'referenceId': 'String?',
-                'referenceType': 'String?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['LoyaltyCard'],
-            'source': ['PRD-04-CRM']
-        },
-
-        'Notification': {
-            'description': 'Notifications',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'userId': 'String',
-                'type': 'NotificationType',
-                'channel': 'NotificationChannel',
-                'priority': 'Priority @default(MEDIUM)',
-                'title': 'String',
-                'message': 'String',
-                'data': 'Json?',
-                'status': 'NotificationStatus @default(PENDING)',
-                'readAt': 'DateTime?',
-                'sentAt': 'DateTime?',
-                'failedAt': 'DateTime?',
-                'failureReason': 'String?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['User'],
-            'source': ['PRD-09-Notifications']
-        },
-
-        'NotificationTemplate': {
-            'description': 'Modèles de notifications',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'code': 'String @unique',
-                'name': 'String',
-                'type': 'NotificationType',
-                'channel': 'NotificationChannel',
-                'language': 'Language',
-                'subject': 'String?',
-                'template': 'String',
-                'variables': 'Json?',
-                'isActive': 'Boolean @default(true)',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': [],
-            'source': ['PRD-09-Notifications']
-        },
-
-        'NotificationPreference': {
-            'description': 'Préférences de notifications',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'userId': 'String',
-                'type': 'NotificationType',
-                'email': 'Boolean @default(true)',
-                'sms': 'Boolean @default(true)',
-                'push': 'Boolean @default(true)',
-                'inApp': 'Boolean @default(true)',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['User'],
-            'source': ['PRD-09-Notifications']
-        },
-
-        'Alert': {
-            'description': 'Alertes configurables',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'userId': 'String',
-                'type': 'AlertType',
-                'name': 'String',
-                'conditions': 'Json',
-                'actions': 'Json',
-                'isActive': 'Boolean @default(true)',
-                'lastTriggeredAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['User'],
-            'source': ['PRD-09-Notifications']
-        },
-
-        'InsuranceCompany': {
-            'description': 'Compagnies d\'assurance',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'name': 'String',
-                'code': 'String @unique',
-                'type': 'InsuranceType',
-                'status': 'CompanyStatus @default(ACTIVE)',
-                'email': 'String',
-                'phone': 'String',
-                'address': 'String?',
-                'city': 'String?',
-                'wilaya': 'String?',
-                'licenseNumber': 'String',
-                'apiEndpoint': 'String?',
-                'apiKey': 'String?',
-                'commissionRate': 'Decimal',
-                'rating': 'Decimal?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['InsuranceProduct', 'InsuranceQuote', 'InsurancePolicy'],
-            'source': ['PRD-12-Module-Assurance']
-        },
-
-        'InsuranceProduct': {
-            'description': 'Produits d\'assurance',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'insuranceCompanyId': 'String',
-                'name': 'String',
-                'type': 'InsuranceProductType',
-                'coverage': 'Json',
-                'basePrice': 'Decimal',
-                'pricing': 'Json',
-                'terms': 'String?',
-                'isActive': 'Boolean @default(true)',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['InsuranceCompany'],
-            'source': ['PRD-12-Module-Assurance']
-        },
-
-        'InsuranceQuote': {
-            'description': 'Devis d\'assurance',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'quoteNumber': 'String @unique',
-                'customerId': 'String',
-                'vehicleId': 'String',
-                'insuranceCompanyId': 'String',
-                'insuranceProductId': 'String',
-                'status': 'QuoteStatus @default(DRAFT)',
-                'riskScore': 'Decimal?',
-                'premium': 'Decimal',
-                'coverage': 'Json',
-                'validUntil': 'DateTime',
-                'acceptedAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Customer', 'Vehicle', 'InsuranceCompany', 'InsuranceProduct', 'InsurancePolicy'],
-            'source': ['PRD-12-Module-Assurance']
-        },
-
-        'InsurancePolicy': {
-            'description': 'Polices d\'assurance actives',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'policyNumber': 'String @unique',
-                'insuranceQuoteId': 'String',
-                'customerId': 'String',
-                'vehicleId': 'String',
-                'insuranceCompanyId': 'String',
-                'status': 'PolicyStatus @default(ACTIVE)',
-                'startDate': 'DateTime',
-                'endDate': 'DateTime',
-                'premium': 'Decimal',
-                'paymentFrequency': 'PaymentFrequency',
-                'coverage': 'Json',
-                'documents': 'Json?',
-                'cancelledAt': 'DateTime?',
-                'cancellationReason': 'String?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['InsuranceQuote', 'Customer', 'Vehicle', 'InsuranceCompany', 'Claim'],
-            'source': ['PRD-12-Module-Assurance']
-        },
-
-        'Claim': {
-            'description': 'Déclarations de sinistres',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'claimNumber': 'String @unique',
-                'insurancePolicyId': 'String',
-                'customerId': 'String',
-                'vehicleId': 'String',
-                'type': 'ClaimType',
-                'status': 'ClaimStatus @default(SUBMITTED)',
-                'incidentDate': 'DateTime',
-                'description': 'String',
-                'estimatedAmount': 'Decimal?',
-                'approvedAmount': 'Decimal?',
-                'documents': 'Json?',
-                'submittedAt': 'DateTime @default(now())',
-                'processedAt': 'DateTime?',
-                'settledAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['InsurancePolicy', 'Customer', 'Vehicle'],
-            'source': ['PRD-12-Module-Assurance']
-        },
-
-        'CommissionRecord': {
-            'description': 'Enregistrements de commissions',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'insurancePolicyId': 'String',
-                'teamId': 'String',
-                'userId': 'String',
-                'amount': 'Decimal',
-                'rate': 'Decimal',
-                'status': 'CommissionStatus @default(PENDING)',
-                'paidAt': 'DateTime?',
-                'period': 'DateTime',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['InsurancePolicy', 'Team', 'User'],
-            'source': ['PRD-12-Module-Assurance']
-        },
-
-        'AIRecommendation': {
-            'description': 'Recommandations IA',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'type': 'RecommendationType',
-                'entityType': 'String',
-                'entityId': 'String',
-                'score': 'Decimal',
-                'reasoning': 'Json',
-                'recommendation': 'String',
-                'status': 'RecommendationStatus @default(PENDING)',
-                'acceptedAt': 'DateTime?',
-                'rejectedAt': 'DateTime?',
-                'rejectionReason': 'String?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': [],
-            'source': ['PRD-05-Module-IA']
-        },
-
-        'AIPrediction': {
-            'description': 'Prédictions IA',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'type': 'PredictionType',
-                'entityType': 'String',
-                'entityId': 'String',
-                'prediction': 'Json',
-                'confidence': 'Decimal',
-                'features': 'Json',
-                'actualValue': 'Json?',
-                'accuracy': 'Decimal?',
-                'period': 'DateTime',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': [],
-            'source': ['PRD-05-Module-IA']
-        },
-
-        'FraudDetection': {
-            'description': 'Détection de fraudes',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'entityType': 'String',
-                'entityId': 'String',
-                'riskScore': 'Decimal',
-                'riskLevel': 'RiskLevel',
-                'indicators': 'Json',
-                'status': 'FraudStatus @default(FLAGGED)',
-                'reviewedAt': 'DateTime?',
-                'reviewedById': 'String?',
-                'resolution': 'String?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['User'],
-            'source': ['PRD-05-Module-IA']
-        },
-
-        'ChatbotConversation': {
-            'description': 'Conversations chatbot',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'sessionId': 'String',
-                'customerId': 'String?',
-                'userId': 'String?',
-                'channel': 'CommunicationChannel',
-                'language': 'Language',
-                'startedAt': 'DateTime @default(now())',
-                'endedAt': 'DateTime?',
-                'satisfaction': 'Int?',
-                'handedOffToHuman': 'Boolean @default(false)',
-                'handedOffAt': 'DateTime?',
-            },
-            'relations': ['Customer', 'User', 'ChatbotMessage'],
-            'source': ['PRD-05-Module-IA']
-        },
-
-        'ChatbotMessage': {
-            'description': 'Messages chatbot',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'conversationId': 'String',
-                'role': 'MessageRole',
-                'content': 'String',
-                'intent': 'String?',
-                'confidence': 'Decimal?',
-                'entities': 'Json?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['ChatbotConversation'],
-            'source': ['PRD-05-Module-IA']
-        },
-
-        'Report': {
-            'description': 'Rapports personnalisés',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'name': 'String',
-                'type': 'ReportType',
-                'description': 'String?',
-                'parameters': 'Json',
-                'schedule': 'Json?',
-                'format': 'ReportFormat',
-                'createdById': 'String',
-                'isPublic': 'Boolean @default(false)',
-                'lastRunAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['User', 'ReportExecution'],
-            'source': ['PRD-08-Reporting-Analytics']
-        },
-
-        'ReportExecution': {
-            'description': 'Exécutions de rapports',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'reportId': 'String',
-                'status': 'ExecutionStatus',
-                'parameters': 'Json',
-                'resultUrl': 'String?',
-                'startedAt': 'DateTime @default(now())',
-                'completedAt': 'DateTime?',
-                'error': 'String?',
-            },
-            'relations': ['Report'],
-            'source': ['PRD-08-Reporting-Analytics']
-        },
-
-        'Dashboard': {
-            'description': 'Tableaux de bord personnalisés',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'name': 'String',
-                'type': 'DashboardType',
-                'layout': 'Json',
-                'widgets': 'Json',
-                'filters': 'Json?',
-                'createdById': 'String',
-                'isPublic': 'Boolean @default(false)',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['User'],
-            'source': ['PRD-08-Reporting-Analytics']
-        },
-
-        'AuditLog': {
-            'description': 'Journal d\'audit',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'userId': 'String?',
-                'action': 'AuditAction',
-                'entityType': 'String',
-                'entityId': 'String?',
-                'changes': 'Json?',
-                'ipAddress': 'String?',
-                'userAgent': 'String?',
-                'metadata': 'Json?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['User'],
-            'source': ['PRD-11-Gestion-Utilisateurs']
-        },
-
-        'Session': {
-            'description': 'Sessions utilisateurs',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'userId': 'String',
-                'token': 'String @unique',
-                'ipAddress': 'String',
-                'userAgent': 'String',
-                'expiresAt': 'DateTime',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['User'],
-            'source': ['PRD-11-Gestion-Utilisateurs']
-        },
-
-        'Permission': {
-            'description': 'Permissions granulaires',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'code': 'String @unique',
-                'name': 'String',
-                'description': 'String?',
-                'module': 'String',
-                'action': 'String',
-                'resource': 'String',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['RolePermission'],
-            'source': ['PRD-11-Gestion-Utilisateurs']
-        },
-
-        'Role': {
-            'description': 'Rôles avec permissions',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'name': 'String @unique',
-                'description': 'String?',
-                'isSystem': 'Boolean @default(false)',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['RolePermission', 'UserRole'],
-            'source': ['PRD-11-Gestion-Utilisateurs']
-        },
-
-        'RolePermission': {
-            'description': 'Association rôles-permissions',
-            'fields': {
-                'roleId': 'String',
-                'permissionId': 'String',
-            },
-            'relations': ['Role', 'Permission'],
-            'source': ['PRD-11-Gestion-Utilisateurs']
-        },
-
-        'UserRole': {
-            'description': 'Rôles des utilisateurs',
-            'fields': {
-                'userId': 'String',
-                'roleId': 'String',
-                'assignedAt': 'DateTime @default(now())',
-            },
-            'relations': ['User', 'Role'],
-            'source': ['PRD-11-Gestion-Utilisateurs']
-        },
-
-        'Favorite': {
-            'description': 'Véhicules favoris',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'customerId': 'String',
-                'vehicleId': 'String',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['Customer', 'Vehicle'],
-            'source': ['PRD-03-Marketplace']
-        },
-
-        'Comparison': {
-            'description': 'Comparaisons de véhicules',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'customerId': 'String',
-                'vehicles': 'Json',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['Customer'],
-            'source': ['PRD-03-Marketplace']
-        },
-
-        'TradeInEstimate': {
-            'description': 'Estimations de reprise',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'customerId': 'String',
-                'vehicleModelId': 'String',
-                'year': 'Int',
-                'mileage': 'Int',
-                'condition': 'VehicleCondition',
-                'estimatedValue': 'Decimal',
-                'validUntil': 'DateTime',
-                'status': 'EstimateStatus @default(PENDING)',
-                'notes': 'String?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['Customer', 'VehicleModel'],
-            'source': ['PRD-03-Marketplace']
-        },
-
-        'FinancingSimulation': {
-            'description': 'Simulations de financement',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'customerId': 'String',
-                'vehicleId': 'String',
-                'vehiclePrice': 'Decimal',
-                'downPayment': 'Decimal',
-                'loanAmount': 'Decimal',
-                'interestRate': 'Decimal',
-                'term': 'Int',
-                'monthlyPayment': 'Decimal',
-                'totalPayment': 'Decimal',
-                'status': 'SimulationStatus @default(DRAFT)',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['Customer', 'Vehicle'],
-            'source': ['PRD-03-Marketplace']
-        },
-
-        'MarketplaceAlert': {
-            'description': 'Alertes nouveautés marketplace',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'customerId': 'String',
-                'name': 'String',
-                'criteria': 'Json',
-                'frequency': 'AlertFrequency',
-                'isActive': 'Boolean @default(true)',
-                'lastSentAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Customer'],
-            'source': ['PRD-03-Marketplace']
-        },
-
-        'SocialPromotion': {
-            'description': 'Promotions réseaux sociaux',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'vehicleId': 'String',
-                'platform': 'SocialPlatform',
-                'status': 'PromotionStatus',
-                'scheduledAt': 'DateTime?',
-                'publishedAt': 'DateTime?',
-                'postUrl': 'String?',
-                'content': 'String',
-                'mediaUrls': 'Json',
-                'reach': 'Int?',
-                'engagement': 'Int?',
-                'clicks': 'Int?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['Vehicle'],
-            'source': ['PRD-03-Marketplace']
-        },
-
-        'B2BFinancing': {
-            'description': 'Financement de stock B2B',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'teamId': 'String',
-                'supplierId': 'String',
-                'purchaseOrderId': 'String',
-                'amount': 'Decimal',
-                'interestRate': 'Decimal',
-                'term': 'Int',
-                'status': 'FinancingStatus @default(PENDING)',
-                'approvedAt': 'DateTime?',
-                'disbursedAt': 'DateTime?',
-                'repaymentSchedule': 'Json',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Team', 'Supplier', 'PurchaseOrder'],
-            'source': ['PRD-07-Gestion-Fournisseurs']
-        },
-
-        'BeynPayment': {
-            'description': 'Paiements via Beyn',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'paymentId': 'String @unique',
-                'beynTransactionId': 'String?',
-                'status': 'BeynPaymentStatus',
-                'amount': 'Decimal',
-                'currency': 'Currency @default(DZD)',
-                'merchantId': 'String',
-                'customerId': 'String',
-                'metadata': 'Json?',
-                'webhookData': 'Json?',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Payment', 'Customer'],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'TaxConfiguration': {
-            'description': 'Configuration TVA Algérie',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'name': 'String',
-                'rate': 'Decimal',
-                'type': 'TaxType',
-                'applicableTo': 'String',
-                'startDate': 'DateTime',
-                'endDate': 'DateTime?',
-                'isActive': 'Boolean @default(true)',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': [],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'BankAccount': {
-            'description': 'Comptes bancaires',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'teamId': 'String',
-                'bankName': 'String',
-                'accountNumber': 'String',
-                'rib': 'String',
-                'swift': 'String?',
-                'currency': 'Currency @default(DZD)',
-                'balance': 'Decimal @default(0)',
-                'isActive': 'Boolean @default(true)',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Team', 'BankTransaction'],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'BankTransaction': {
-            'description': 'Transactions bancaires',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'bankAccountId': 'String',
-                'type': 'TransactionType',
-                'amount': 'Decimal',
-                'currency': 'Currency @default(DZD)',
-                'reference': 'String?',
-                'description': 'String',
-                'date': 'DateTime',
-                'paymentId': 'String?',
-                'reconciled': 'Boolean @default(false)',
-                'reconciledAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['BankAccount', 'Payment'],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'RecurringInvoice': {
-            'description': 'Factures récurrentes',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'customerId': 'String',
-                'teamId': 'String',
-                'frequency': 'RecurringFrequency',
-                'nextInvoiceDate': 'DateTime',
-                'lastInvoiceDate': 'DateTime?',
-                'endDate': 'DateTime?',
-                'template': 'Json',
-                'isActive': 'Boolean @default(true)',
-                'createdAt': 'DateTime @default(now())',
-                'updatedAt': 'DateTime @updatedAt',
-            },
-            'relations': ['Customer', 'Team'],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'PaymentReminder': {
-            'description': 'Relances automatiques',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'invoiceId': 'String',
-                'customerId': 'String',
-                'type': 'ReminderType',
-                'status': 'ReminderStatus',
-                'scheduledAt': 'DateTime',
-                'sentAt': 'DateTime?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['Invoice', 'Customer'],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'FiscalReport': {
-            'description': 'Rapports fiscaux',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'teamId': 'String',
-                'type': 'FiscalReportType',
-                'period': 'DateTime',
-                'data': 'Json',
-                'generatedAt': 'DateTime @default(now())',
-                'submittedAt': 'DateTime?',
-            },
-            'relations': ['Team'],
-            'source': ['PRD-02-Module-Comptable']
-        },
-
-        'WorkflowValidation': {
-            'description': 'Validations workflow',
-            'fields': {
-                'id': 'String @id @default(cuid())',
-                'entityType': 'String',
-                'entityId': 'String',
-                'workflowStage': 'WorkflowStage',
-                'status': 'ValidationStatus',
-                'validatedById': 'String?',
-                'validatedAt': 'DateTime?',
-                'comments': 'String?',
-                'aiScore': 'Decimal?',
-                'aiRecommendation': 'String?',
-                'createdAt': 'DateTime @default(now())',
-            },
-            'relations': ['User'],
-            'source': ['PRD-01-Gestion-Stock', 'PRD-05-Module-IA']
-        },
-    }
-
-    return schema
-
-def generate_prisma_schema(schema):
-    """Generate complete Prisma schema."""
-
-    enums = {
-        'UserRole': ['SUPER_ADMIN', 'ADMIN', 'MANAGER', 'SALES', 'USER', 'CUSTOMER'],
-        'Language': ['FR', 'AR', 'EN'],
-        'TeamType': ['DEALER', 'WHOLESALER', 'IBTICAR'],
-        'TeamStatus': ['ACTIVE', 'SUSPENDED', 'INACTIVE'],
-        'VehicleStatus': ['AVAILABLE', 'RESERVED', 'SOLD', 'IN_TRANSIT', 'MAINTENANCE', 'ARCHIVED'],
-        'VehicleCondition': ['NEW', 'USED_EXCELLENT', 'USED_GOOD', 'USED_FAIR'],
-        'Currency': ['DZD', 'EUR', 'USD'],
-        'VehicleCategory': ['SEDAN', 'SUV', 'HATCHBACK', 'COUPE', 'CONVERTIBLE', 'WAGON', 'VAN', 'TRUCK', 'OTHER'],
-        'BodyType': ['SEDAN', 'SUV', 'HATCHBACK', 'COUPE', 'CONVERTIBLE', 'WAGON', 'VAN', 'PICKUP', 'MINIVAN'],
-        'FuelType': ['GASOLINE', 'DIESEL', 'HYBRID', 'ELECTRIC', 'PLUGIN_HYBRID', 'LPG', 'CNG'],
-        'TransmissionType': ['MANUAL', 'AUTOMATIC', 'CVT', 'SEMI_AUTO'],
-        'EnergyLabel': ['A_PLUS_PLUS', 'A_PLUS', 'A', 'B', 'C', 'D', 'E', 'F', 'G'],
-        'MediaType': ['PHOTO', 'VIDEO', 'PHOTO_360'],
-        'VehicleEventType': ['PURCHASE', 'SALE', 'MAINTENANCE', 'REPAIR', 'INSPECTION', 'ACCIDENT', 'MODIFICATION'],
-        'CustomerType': ['INDIVIDUAL', 'BUSINESS'],
-        'IdType': ['CIN', 'PASSPORT', 'DRIVER_LICENSE', 'NIF'],
-        'CustomerStatus': ['PROSPECT', 'ACTIVE', 'INACTIVE', 'VIP'],
-        'LeadSource': ['WEBSITE', 'PHONE', 'EMAIL', 'WALK_IN', 'REFERRAL', 'SOCIAL_MEDIA', 'ADVERTISING'],
-        'LeadStatus': ['NEW', 'CONTACTED', 'QUALIFIED', 'PROPOSAL', 'NEGOTIATION', 'WON', 'LOST'],
-        'AppointmentType': ['TEST_DRIVE', 'CONSULTATION', 'DELIVERY', 'AFTER_SALES', 'OTHER'],
-        'AppointmentStatus': ['SCHEDULED', 'CONFIRMED', 'COMPLETED', 'CANCELLED', 'NO_SHOW'],
-        'InteractionType': ['CALL', 'EMAIL', 'MEETING', 'NOTE', 'SMS', 'WHATSAPP', 'OTHER'],
-        'CommunicationChannel': ['EMAIL', 'SMS', 'WHATSAPP', 'PUSH', 'IN_APP', 'PHONE', 'SOCIAL'],
-        'Direction': ['INBOUND', 'OUTBOUND'],
-        'QuoteStatus': ['DRAFT', 'SENT', 'VIEWED', 'ACCEPTED', 'REJECTED', 'EXPIRED', 'CONVERTED'],
-        'InvoiceStatus': ['DRAFT', 'SENT', 'PARTIALLY_PAID', 'PAID', 'OVERDUE', 'CANCELLED'],
-        'InvoiceType': ['STANDARD', 'PROFORMA', 'CREDIT_NOTE', 'DEBIT_NOTE'],
-        'PaymentMethod': ['CASH', 'CHECK', 'BANK_TRANSFER', 'CREDIT_CARD', 'BEYN', 'OTHER'],
-        'PaymentStatus': ['PENDING', 'PROCESSING', 'COMPLETED', 'FAILED', 'REFUNDED'],
-        'CreditNoteStatus': ['DRAFT', 'ISSUED', 'APPLIED', 'CANCELLED'],
-        'OrderStatus': ['PENDING', 'CONFIRMED', 'IN_PROGRESS', 'READY', 'DELIVERED', 'CANCELLED'],
-        'ReturnType': ['CANCELLATION', 'RETURN', 'EXCHANGE'],
-        'ReturnStatus': ['REQUESTED', 'APPROVED', 'REJECTED', 'IN_PROGRESS', 'COMPLETED'],
-        'DisputeType': ['PRODUCT_ISSUE', 'DELIVERY', 'PAYMENT', 'SERVICE', 'OTHER'],
-        'DisputeStatus': ['OPEN', 'IN_REVIEW', 'RESOLVED', 'CLOSED'],
-        'Priority': ['LOW', 'MEDIUM', 'HIGH', 'URGENT'],
-        'ServiceType': ['WARRANTY', 'MAINTENANCE', 'REPAIR', 'INSPECTION', 'OTHER'],
-        'ServiceStatus': ['OPEN', 'SCHEDULED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED'],
-        'ComplaintType': ['PRODUCT', 'SERVICE', 'DELIVERY', 'BILLING', 'OTHER'],
-        'ComplaintStatus': ['NEW', 'ACKNOWLEDGED', 'IN_PROGRESS', 'RESOLVED', 'CLOSED'],
-        'ReviewStatus': ['PENDING', 'APPROVED', 'REJECTED'],
-        'SupplierType': ['MANUFACTURER', 'DISTRIBUTOR', 'WHOLESALER', 'OTHER'],
-        'SupplierStatus': ['ACTIVE', 'SUSPENDED', 'INACTIVE'],
-        'PurchaseOrderStatus': ['DRAFT', 'SENT', 'CONFIRMED', 'PARTIALLY_RECEIVED', 'RECEIVED', 'CANCELLED'],
-        'DeliveryStatus': ['SCHEDULED', 'IN_TRANSIT', 'DELIVERED', 'CANCELLED'],
-        'WarrantyType': ['MANUFACTURER', 'EXTENDED', 'DEALER'],
-        'CampaignType': ['EMAIL', 'SMS', 'SOCIAL', 'MULTI_CHANNEL'],
-        'CampaignStatus': ['DRAFT', 'SCHEDULED', 'RUNNING', 'PAUSED', 'COMPLETED', 'CANCELLED'],
-        'RecipientStatus': ['PENDING', 'SENT', 'DELIVERED', 'OPENED', 'CLICKED', 'CONVERTED', 'FAILED', 'UNSUBSCRIBED'],
-        'LoyaltyTier': ['BRONZE', 'SILVER', 'GOLD', 'PLATINUM'],
-        'LoyaltyStatus': ['ACTIVE', 'SUSPENDED', 'EXPIRED'],
-        'TransactionType': ['EARN', 'REDEEM', 'EXPIRE', 'ADJUSTMENT'],
-        'NotificationType': ['STOCK_ALERT', 'APPOINTMENT', 'PAYMENT', 'ORDER', 'MARKETING', 'SYSTEM', 'COMPLIANCE'],
-        'NotificationChannel': ['EMAIL', 'SMS', 'PUSH', 'IN_APP'],
-        'NotificationStatus': ['PENDING', 'SENT', 'DELIVERED', 'FAILED', 'READ'],
-        'AlertType': ['STOCK_LEVEL', 'PRICE_CHANGE', 'DOCUMENT_EXPIRY', 'PAYMENT_DUE', 'CUSTOM'],
-        'InsuranceType': ['AUTO'],
-        'CompanyStatus': ['ACTIVE', 'SUSPENDED'],
-        'InsuranceProductType': ['THIRD_PARTY', 'COMPREHENSIVE', 'COLLISION'],
-        'PolicyStatus': ['ACTIVE', 'EXPIRED', 'CANCELLED'],
-        'PaymentFrequency': ['MONTHLY', 'QUARTERLY', 'SEMI_ANNUAL', 'ANNUAL'],
-        'ClaimType': ['ACCIDENT', 'THEFT', 'FIRE', 'NATURAL_DISASTER', 'VANDALISM', 'OTHER'],
-        'ClaimStatus': ['SUBMITTED', 'UNDER_REVIEW', 'APPROVED', 'REJECTED', 'SETTLED'],
-        'CommissionStatus': ['PENDING', 'APPROVED', 'PAID'],
-        'RecommendationType': ['PRICING', 'STOCK_ROTATION', 'MARKET_MATCH', 'DEAL'],
-        'RecommendationStatus': ['PENDING', 'ACCEPTED', 'REJECTED'],
-        'PredictionType': ['SALES', 'PRICE', 'DEMAND', 'ROTATION'],
-        'RiskLevel': ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL'],
-        'FraudStatus': ['FLAGGED', 'UNDER_REVIEW', 'CONFIRMED', 'FALSE_POSITIVE'],
-        'MessageRole': ['USER', 'ASSISTANT', 'SYSTEM'],
-        'ReportType': ['SALES', 'STOCK', 'FINANCIAL', 'CUSTOMER', 'PERFORMANCE', 'CUSTOM'],
-        'ReportFormat': ['PDF', 'EXCEL', 'CSV', 'JSON'],
-        'ExecutionStatus': ['PENDING', 'RUNNING', 'COMPLETED', 'FAILED'],
-        'DashboardType': ['EXECUTIVE', 'SALES', 'STOCK', 'FINANCIAL', 'MARKETPLACE', 'CUSTOM'],
-        'AuditAction': ['CREATE', 'UPDATE', 'DELETE', 'VIEW', 'LOGIN', 'LOGOUT', 'EXPORT', 'IMPORT'],
-        'EstimateStatus': ['PENDING', 'APPROVED', 'REJECTED', 'EXPIRED'],
-        'SimulationStatus': ['DRAFT', 'APPROVED', 'CONVERTED'],
-        'AlertFrequency': ['INSTANT', 'DAILY', 'WEEKLY'],
-        'SocialPlatform': ['FACEBOOK', 'INSTAGRAM', 'TWITTER', 'LINKEDIN'],
-        'PromotionStatus': ['DRAFT', 'SCHEDULED', 'PUBLISHED', 'FAILED'],
-        'FinancingStatus': ['PENDING', 'APPROVED', 'DISBURSED', 'REPAYING', 'COMPLETED', 'DEFAULTED'],
-        'BeynPaymentStatus': ['PENDING', 'AUTHORIZED', 'CAPTURED', 'FAILED', 'REFUNDED'],
-        'TaxType': ['VAT', 'TAP', 'OTHER'],
-        'RecurringFrequency': ['WEEKLY', 'MONTHLY', 'QUARTERLY', 'YEARLY'],
-        'ReminderType': ['FIRST', 'SECOND', 'FINAL', 'LEGAL'],
-        'ReminderStatus': ['SCHEDULED', 'SENT', 'CANCELLED'],
-        'FiscalReportType': ['VAT_DECLARATION', 'TAP_DECLARATION', 'PROFIT_STATEMENT', 'ANNUAL_REPORT'],
-        'WorkflowStage': ['DRAFT', 'PENDING_REVIEW', 'APPROVED', 'REJECTED', 'PUBLISHED'],
-        'ValidationStatus': ['PENDING', 'APPROVED', 'REJECTED'],
     }
 
+def _apply_matches(entities, matches, source_file, current=None):
+    """Attach fields and relations to the entity last mentioned; returns that entity."""
+    for match in matches:
+        if match.kind == 'entity':
+            current = match.name
+            touched = current
+        elif match.kind == 'field':
+            if current is None:
+                continue
+            entities[current]['fields'].add((match.name, match.value))
+            touched = current
+        else:
+            touched = match.name or current
+            if touched is None:
+                continue
+            entities[touched]['relations'].add(match.value)
+        sources = entities[touched]['source_files']
+        # Documents are applied one at a time, so a repeat can only be the last entry
+        if source_file is not None and (not sources or sources[-1] != source_file):
+            sources.append(source_file)
+    return current
+
+def extract_database_entities(content, source_file=None, entities=None):
+    """Extract database entities, tables, and fields from content.
+
+    Returns {entity: {'fields': {(field, type)}, 'relations': {entity},
+    'source_files': [path]}}, adding to `entities` when given. Fields and
+    relations without an explicit source belong to the entity mentioned
+    last before them.
+    """
+    entities = defaultdict(_new_entity) if entities is None else entities
+    _apply_matches(entities, iter_entity_matches(content), source_file)
+    return entities
+
+def _extract_document(relative_path, content):
+    """Map step: the entities of one document, as a plain (picklable) dict."""
+    return dict(extract_database_entities(content, relative_path))
+
+def _scan_paragraphs(paragraphs):
+    """Map step for an interned corpus: the matches of a chunk of distinct paragraphs."""
+    return [list(iter_entity_matches(paragraph)) for paragraph in paragraphs]
+
+def merge_entities(partials, entities=None):
+    """Reduce step: union per-document results in order.
+
+    Taking partials in document order gives what a serial run builds:
+    entities in first-seen order, fields and relations unioned, and
+    source_files in document order without repeats.
+    """
+    entities = defaultdict(_new_entity) if entities is None else entities
+    seen_sources = {}
+    for partial in partials:
+        for name, found in partial.items():
+            entity = entities[name]
+            entity['fields'] |= found['fields']
+            entity['relations'] |= found['relations']
+            seen = seen_sources.get(name)
+            if seen is None:
+                seen = seen_sources[name] = set(entity['source_files'])
+            for source in found['source_files']:
+                if source not in seen:
+                    seen.add(source)
+                    entity['source_files'].append(source)
+    return entities
+
+def _chunksize(items, workers):
+    return max(1, len(items) // (workers * 4))
+
+def extract_corpus_entities(corpus, workers=1):
+    """Run extract_database_entities over every document of a corpus.
+
+    An interned corpus (see corpus_store.InternedCorpus) is scanned one
+    distinct paragraph at a time: matches never span paragraphs, so a
+    paragraph's matches are computed the first time it is seen and replayed
+    for every document that repeats it. The result is the same either way.
+
+    With several workers the scanning runs in a process pool (documents,
+    or distinct paragraphs of an interned corpus, in chunks) and the
+    results are merged in corpus order, so the output equals a serial run.
+    """
+    entities = defaultdict(_new_entity)
+    if not isinstance(corpus, InternedCorpus):
+        if workers <= 1:
+            for relative_path, content in corpus.items():
+                extract_database_entities(content, relative_path, entities)
+            return entities
+        from concurrent.futures import ProcessPoolExecutor
+
+        items = list(corpus.items())
+        with ProcessPoolExecutor(workers) as pool:
+            partials = pool.map(_extract_document, *zip(*items), chunksize=_chunksize(items, workers))
+            return merge_entities(partials, entities)
+
+    # Every distinct paragraph belongs to some document: scan them all up front
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        paragraphs = list(corpus.paragraphs)
+        size = _chunksize(paragraphs, workers)
+        chunks = [paragraphs[start:start + size] for start in range(0, len(paragraphs), size)]
+        with ProcessPoolExecutor(workers) as pool:
+            paragraph_matches = list(itertools.chain.from_iterable(pool.map(_scan_paragraphs, chunks)))
+    else:
+        paragraph_matches = _scan_paragraphs(corpus.paragraphs)
+    for relative_path in corpus:
+        current = None
+        for paragraph_id in corpus.paragraph_ids(relative_path):
+            current = _apply_matches(entities, paragraph_matches[paragraph_id], relative_path, current)
+    return entities
+
+def patterns_digest():
+    """Hash of the scanner's pattern set; cached analyses made with other patterns are discarded."""
+    key = f'{ANALYSIS_CACHE_VERSION}\n{SCANNER.pattern}'
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def load_analysis_cache(cache_path):
+    """Load the analysis cache, or an empty one if missing, unreadable or made with other patterns."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('patterns') != patterns_digest():
+        return {}
+    return cache.get('documents', {})
+
+def save_analysis_cache(cache_path, entries):
+    """Atomically write the analysis cache."""
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'patterns': patterns_digest(), 'documents': entries}, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
+
+def _dump_partial(partial):
+    return {name: {'fields': sorted(found['fields']), 'relations': sorted(found['relations'])}
+            for name, found in partial.items()}
+
+def _load_partial(entities, relative_path):
+    return {name: {'fields': {tuple(field) for field in found['fields']},
+                   'relations': set(found['relations']),
+                   'source_files': [relative_path]}
+            for name, found in entities.items()}
+
+def extract_corpus_entities_cached(corpus, cache_path, workers=1, stats=None):
+    """extract_corpus_entities, re-analyzing only documents changed since the last run.
+
+    Each document's entities are cached under the sha256 of its text, in a
+    file that also records a hash of the pattern set: editing a document
+    re-analyzes that document alone, and changing a pattern discards the
+    whole cache. The cache is rewritten with the documents of this corpus,
+    so removed documents drop out. stats, when given, receives 'cached' and
+    'analyzed' counts. The result equals an uncached run.
+    """
+    cached = load_analysis_cache(cache_path)
+    entries = {}
+    partials = {}
+    changed = []
+    for relative_path, content in corpus.items():
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        entry = cached.get(relative_path)
+        if entry is not None and entry['sha256'] == digest:
+            partials[relative_path] = _load_partial(entry['entities'], relative_path)
+        else:
+            changed.append((relative_path, content))
+        entries[relative_path] = {'sha256': digest}
+
+    if workers > 1 and len(changed) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as pool:
+            found = pool.map(_extract_document, *zip(*changed), chunksize=_chunksize(changed, workers))
+            partials.update(zip((relative_path for relative_path, _ in changed), found))
+    else:
+        for relative_path, content in changed:
+            partials[relative_path] = _extract_document(relative_path, content)
+
+    for relative_path, entry in entries.items():
+        entry['entities'] = _dump_partial(partials[relative_path])
+    if changed or len(cached) != len(entries):
+        save_analysis_cache(cache_path, entries)
+    if stats is not None:
+        stats['cached'] = len(entries) - len(changed)
+        stats['analyzed'] = len(changed)
+    return merge_entities(partials[relative_path] for relative_path in entries)
+
+def _definition_digest(raw):
+    # marshal's format may change between Python versions
+    tag = f'|marshal {marshal.version}|{sys.version}'.encode('utf-8')
+    return hashlib.blake2b(raw + tag, digest_size=16).digest()
+
+def load_schema_definition(path=DEFAULT_SCHEMA_DEFINITION):
+    """Load {'entities': {...}, 'enums': {...}} from the schema definition file.
+
+    The parsed definition is cached in <path>.marshal, behind a hash of the
+    file's bytes, so the JSON is only parsed again after the file changes.
+    Each call returns new objects that the caller is free to modify.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = _definition_digest(raw)
+    cache_path = path + '.marshal'
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = f.read()
+        if cached[:len(digest)] == digest:
+            return marshal.loads(cached[len(digest):])
+    except (OSError, ValueError, EOFError, TypeError):
+        pass
+    definition = json.loads(raw)
+    tmp_path = cache_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(digest + marshal.dumps(definition))
+        os.replace(tmp_path, cache_path)
+    except OSError:  # read-only checkout: parse the JSON each time
+        pass
+    return definition
+
+def analyze_all_documents(definition_path=DEFAULT_SCHEMA_DEFINITION):
+    """Analyze all extracted documents.
+
+    The entities were written down from the PRDs by hand and live in the
+    schema definition file; extract_corpus_entities scans the corpus itself.
+    """
+    return load_schema_definition(definition_path)['entities']
+
+# Enum types of the schema and their values
+ENUMS = load_schema_definition()['enums']
+
+def generate_prisma_schema(registry):
+    """Generate complete Prisma schema from a SchemaRegistry."""
     output = []
     output.append('// Prisma Schema for Ibticar.AI MVP')
     output.append('// Generated from PRD analysis')
@@ -1670,9 +372,9 @@ def generate_prisma_schema(schema):
     # Add enums
     output.append('// ==================== ENUMS ====================')
     output.append('')
-    for enum_name, values in sorted(enums.items()):
+    for enum_name, enum in sorted(registry.enums.items()):
         output.append(f'enum {enum_name} {{')
-        for value in values:
+        for value in enum.values:
             output.append(f'  {value}')
         output.append('}')
         output.append('')
@@ -1680,19 +382,19 @@ def generate_prisma_schema(schema):
     # Add models
     output.append('// ==================== MODELS ====================')
     output.append('')
-    for model_name, model_data in sorted(schema.items()):
-        output.append(f'// {model_data["description"]}')
-        output.append(f'// Source: {", ".join(model_data["source"])}')
+    for model_name, model in sorted(registry.models.items()):
+        output.append(f'// {model.description}')
+        output.append(f'// Source: {", ".join(model.sources)}')
         output.append(f'model {model_name} {{')
 
-        for field_name, field_type in model_data['fields'].items():
-            output.append(f'  {field_name:30} {field_type}')
+        for field in model.fields:
+            output.append(f'  {field.name:30} {field.declaration}')
 
         # Add relation fields (simplified)
-        if model_data['relations']:
+        if model.relations:
             output.append('')
             output.append('  // Relations')
-            for relation in model_data['relations']:
+            for relation in model.relations:
                 # This is a simplified representation
                 # Actual relations would need more detailed configuration
                 pass
@@ -1702,18 +404,16 @@ def generate_prisma_schema(schema):
 
     return '\n'.join(output)
 
-if __name__ == "__main__":
-    print("Analyzing database schema from PRD documents...")
-    schema = analyze_all_documents()
-
-    # Generate Prisma schema
-    prisma_schema = generate_prisma_schema(schema)
+def schema_modules(registry):
+    """Map each source module to the entities it mentions."""
+    return {module: sorted(entities) for module, entities in registry.modules().items()}
 
-    # Save schema
-    with open('database_schema_complete.prisma', 'w', encoding='utf-8') as f:
-        f.write(prisma_schema)
+def schema_relations(registry):
+    """Return the set of (entity, related_entity) pairs."""
+    return registry.relation_pairs()
 
-    # Generate detailed report
+def generate_report(registry, prisma_file='database_schema_complete.prisma'):
+    """Generate the Markdown report describing the models of a SchemaRegistry."""
     report = []
     report.append('# SCHEMA DE BASE DE DONNÉES COMPLET - IBTICAR.AI MVP')
     report.append('')
@@ -1726,12 +426,7 @@ if __name__ == "__main__":
     report.append('## SECTION 1: LISTE DES ENTITÉS PAR MODULE')
     report.append('')
 
-    modules = {}
-    for entity_name, entity_data in sorted(schema.items()):
-        for source in entity_data['source']:
-            if source not in modules:
-                modules[source] = []
-            modules[source].append(entity_name)
+    modules = schema_modules(registry)
 
     for module, entities in sorted(modules.items()):
         report.append(f'### {module}')
@@ -1747,23 +442,23 @@ if __name__ == "__main__":
     report.append('## SECTION 2: SCHÉMA DÉTAILLÉ DE CHAQUE ENTITÉ')
     report.append('')
 
-    for entity_name, entity_data in sorted(schema.items()):
+    for entity_name, model in sorted(registry.models.items()):
         report.append(f'### {entity_name}')
         report.append('')
-        report.append(f'**Description**: {entity_data["description"]}')
+        report.append(f'**Description**: {model.description}')
         report.append('')
-        report.append(f'**Source**: {", ".join(entity_data["source"])}')
+        report.append(f'**Source**: {", ".join(model.sources)}')
         report.append('')
         report.append('**Champs**:')
         report.append('')
-        for field_name, field_type in entity_data['fields'].items():
-            report.append(f'- `{field_name}`: {field_type}')
+        for field in model.fields:
+            report.append(f'- `{field.name}`: {field.declaration}')
         report.append('')
-        if entity_data['relations']:
+        if model.relations:
             report.append('**Relations avec**:')
             report.append('')
-            for relation in entity_data['relations']:
-                report.append(f'- {relation}')
+            for relation in model.relations:
+                report.append(f'- {relation.target}')
             report.append('')
         report.append('')
 
@@ -1774,10 +469,7 @@ if __name__ == "__main__":
     report.append('## SECTION 3: RÉSUMÉ DES RELATIONS ENTRE ENTITÉS')
     report.append('')
 
-    all_relations = set()
-    for entity_name, entity_data in schema.items():
-        for relation in entity_data['relations']:
-            all_relations.add((entity_name, relation))
+    all_relations = schema_relations(registry)
 
     for entity, related_entity in sorted(all_relations):
         report.append(f'- {entity} ↔ {related_entity}')
@@ -1789,9 +481,9 @@ if __name__ == "__main__":
     report.append('')
     report.append('## SECTION 4: SCHÉMA PRISMA COMPLET')
     report.append('')
-    report.append('Le schéma Prisma complet a été généré dans le fichier `database_schema_complete.prisma`')
+    report.append(f'Le schéma Prisma complet a été généré dans le fichier `{prisma_file}`')
     report.append('')
-    report.append(f'**Nombre total d\'entités**: {len(schema)}')
+    report.append(f'**Nombre total d\'entités**: {len(registry)}')
     report.append(f'**Nombre total de relations**: {len(all_relations)}')
     report.append('')
 
@@ -1801,19 +493,99 @@ if __name__ == "__main__":
     report.append('')
     report.append('## STATISTIQUES')
     report.append('')
-    report.append(f'- Entités analysées: {len(schema)}')
+    report.append(f'- Entités analysées: {len(registry)}')
     report.append(f'- Modules couverts: {len(modules)}')
     report.append(f'- Relations identifiées: {len(all_relations)}')
     report.append('')
 
-    # Save report
-    with open('database_schema_report.md', 'w', encoding='utf-8') as f:
-        f.write('\n'.join(report))
+    return '\n'.join(report)
+
+COMMANDS = ('analyze', 'generate', 'report')
+
+def parse_args(argv=None, command=None, prog=None):
+    """Options of one subcommand, or of the whole analysis when command is None."""
+    descriptions = {
+        None: "Analyze the extracted PRD documents and write the Prisma schema and report.",
+        'analyze': "Analyze the extracted PRD documents and summarize the schema.",
+        'generate': "Write the Prisma schema derived from the PRD documents.",
+        'report': "Write the Markdown report on the schema derived from the PRD documents.",
+    }
+    parser = argparse.ArgumentParser(prog=prog, description=descriptions[command])
+    parser.add_argument('--corpus', help="Extracted corpus (default: packed corpus if current, else the JSON file)")
+    if command in (None, 'generate', 'report'):
+        parser.add_argument('--prisma', default=DEFAULT_PRISMA_FILE,
+                            help="Prisma schema file" + (" the report refers to" if command == 'report' else ""))
+    if command in (None, 'report'):
+        parser.add_argument('--report', default=DEFAULT_REPORT_FILE, help="Markdown report file")
+    if command in (None, 'generate', 'report'):
+        parser.add_argument('--computed-sources', action='store_true',
+                            help="Attribute entities to the modules whose documents name them")
+    if command == 'analyze':
+        parser.add_argument('--output', help="Also write the analyzed schema as JSON")
+        parser.add_argument('-w', '--workers', type=int, default=1,
+                            help="Processes scanning the documents for entities (0 = one per CPU)")
+        parser.add_argument('--cache',
+                            help="Incremental analysis cache (default: <corpus>.analysis.json)")
+        parser.add_argument('--no-cache', action='store_true',
+                            help="Re-analyze every document and leave the cache untouched")
+    args = parser.parse_args(argv)
+    if command == 'analyze':
+        if args.no_cache:
+            args.cache = None
+        elif args.cache is None:
+            corpus_path = args.corpus or find_corpus()
+            args.cache = os.path.splitext(corpus_path)[0] + '.analysis.json'
+    return args
+
+def main(argv=None, command=None, prog=None):
+    args = parse_args(argv, command, prog)
+    if command == 'analyze' and args.workers == 0:
+        args.workers = os.cpu_count() or 1
+    print("Analyzing database schema from PRD documents...")
+    schema = analyze_all_documents()
+    if command in (None, 'generate', 'report') and args.computed_sources:
+        from provenance_index import build_schema_index, with_computed_sources
+
+        index = build_schema_index(load_corpus(args.corpus or find_corpus()), schema, ENUMS)
+        schema = with_computed_sources(schema, index)
+    registry = SchemaRegistry(build_models(schema), build_enums(ENUMS))
+    written = []
+
+    if command in (None, 'generate'):
+        with open(args.prisma, 'w', encoding='utf-8') as f:
+            f.write(generate_prisma_schema(registry))
+        written.append(args.prisma)
+
+    if command in (None, 'report'):
+        with open(args.report, 'w', encoding='utf-8') as f:
+            f.write(generate_report(registry, os.path.basename(args.prisma)))
+        written.append(args.report)
+
+    if command == 'analyze' and args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(schema, f, ensure_ascii=False, indent=2)
+        written.append(args.output)
 
     print(f"\nAnalyse terminee!")
     print(f"   - {len(schema)} entites identifiees")
-    print(f"   - {len(modules)} modules analyses")
-    print(f"   - {len(all_relations)} relations trouvees")
-    print(f"\nFichiers generes:")
-    print(f"   1. database_schema_complete.prisma")
-    print(f"   2. database_schema_report.md")
+    print(f"   - {len(schema_modules(registry))} modules analyses")
+    print(f"   - {len(schema_relations(registry))} relations trouvees")
+    if command == 'analyze':
+        corpus = load_corpus(args.corpus or find_corpus())
+        stats = {}
+        if args.cache:
+            detected = extract_corpus_entities_cached(corpus, args.cache, args.workers, stats)
+        else:
+            detected = extract_corpus_entities(corpus, args.workers)
+        print(f"   - {len(detected)} entites detectees dans les documents "
+              f"({sum(len(entity['fields']) for entity in detected.values())} champs, "
+              f"{sum(len(entity['relations']) for entity in detected.values())} relations)")
+        if stats:
+            print(f"   - {stats['analyzed']} documents analyses, {stats['cached']} repris du cache")
+    if written:
+        print(f"\nFichiers generes:")
+        for number, path in enumerate(written, 1):
+            print(f"   {number}. {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import argparse
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def peak_rss_kb(who=None):
+    """Peak resident set size in KiB, or None if unavailable.
+
+    who is resource.RUSAGE_SELF (default) or resource.RUSAGE_CHILDREN, the
+    largest peak among waited-for child processes.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF if who is None else who).ru_maxrss
+    # macOS reports bytes, Linux reports KiB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def git_commit():
+    """Commit of the working tree the benchmark ran against, or None outside git."""
+    try:
+        proc = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return proc.stdout.strip() or None
+
+def run_engine(base_path, engine, workers=1, repeat=1):
+    """Extract every DOCX under base_path with one engine and worker count.
+
+    workers=1 parses in this process; more workers go through the same
+    supervised pool as extract_docx, and their memory shows up in
+    children_peak_rss_kb.
+    """
+    from extract_docx import extract_many, iter_docx_files
+
+    file_paths = [file_path for file_path, _ in iter_docx_files(base_path)]
+    total_bytes = sum(os.path.getsize(file_path) for file_path in file_paths)
+    baseline_rss = peak_rss_kb()
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        texts = [result[0] if ok else '' for ok, result in extract_many(file_paths, workers, engine)]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    digest = hashlib.sha256("\0".join(texts).encode('utf-8')).hexdigest()
+    peak_rss = peak_rss_kb()
+    return {
+        'engine': engine,
+        'workers': workers,
+        'files': len(file_paths),
+        'bytes': total_bytes,
+        'seconds': best,
+        'files_per_s': len(file_paths) / best if best else None,
+        'mb_per_s': total_bytes / best / 1e6 if best else None,
+        'peak_rss_delta_kb': peak_rss - baseline_rss if peak_rss is not None else None,
+        'children_peak_rss_kb': peak_rss_kb(resource.RUSAGE_CHILDREN) if resource and workers > 1 else None,
+        'output_sha256': digest,
+    }
+
+def benchmark_engines(base_path, engines, worker_counts=(1,), repeat=1):
+    """Run each engine and worker count in a fresh interpreter so peak-memory figures don't mix.
+
+    The children run from the script's folder, so they are given base_path
+    as an absolute path.
+    """
+    base_path = os.path.abspath(base_path)
+    results = []
+    for engine in engines:
+        for workers in worker_counts:
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), base_path, '--run-engine', engine,
+                 '--workers', str(workers), '--repeat', str(repeat)],
+                check=True, capture_output=True, text=True,
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+            )
+            results.append(json.loads(proc.stdout))
+    return results
+
+def benchmark_report(base_path, results):
+    """Wrap results with what is needed to compare them with another commit's run."""
+    return {
+        'commit': git_commit(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'corpus': {'path': base_path, 'files': results[0]['files'], 'bytes': results[0]['bytes']},
+        'results': results,
+    }
+
+def load_report(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    # Reports written before worker counts were benchmarked are a bare list
+    if isinstance(report, list):
+        report = {'commit': None, 'results': report}
+    for result in report['results']:
+        result.setdefault('workers', 1)
+    return report
+
+def _rate(value, width, precision):
+    """A files/s or MB/s figure, 'n/a' when the run was too short to measure."""
+    return f"{value:{width}.{precision}f}" if value else f"{'n/a':>{width}}"
+
+def format_results(results):
+    baseline = results[0]
+    lines = [f"{'engine':12} {'workers':>7} {'files':>6} {'seconds':>9} {'files/s':>9} {'MB/s':>8} "
+             f"{'peak RSS +KiB':>14} {'child KiB':>10} {'speedup':>8}"]
+    for result in results:
+        rss = result['peak_rss_delta_kb']
+        children = result.get('children_peak_rss_kb')
+        lines.append(
+            f"{result['engine']:12} {result.get('workers', 1):7d} {result['files']:6d} {result['seconds']:9.3f} "
+            f"{_rate(result['files_per_s'], 9, 1)} {_rate(result['mb_per_s'], 8, 2)} "
+            f"{rss if rss is not None else 'n/a':>14} {children if children is not None else '-':>10} "
+            + (f"{baseline['seconds'] / result['seconds']:7.2f}x" if result['seconds'] else f"{'n/a':>8}")
+        )
+    same = len({result['output_sha256'] for result in results}) == 1
+    lines.append(f"Outputs identical: {'yes' if same else 'NO'}")
+    return '\n'.join(lines)
+
+def _corpus_size(report):
+    """(files, bytes) the report measured; older reports only have them per result."""
+    corpus = report.get('corpus') or report['results'][0]
+    return corpus['files'], corpus['bytes']
+
+def format_comparison(previous, current):
+    """Files/s of matching (engine, workers) runs in two reports.
+
+    Starts with a warning when the two reports measured different corpora.
+    """
+    before = {(result['engine'], result['workers']): result for result in previous['results']}
+    lines = [f"Compared with {previous.get('commit') or 'previous run'}:"]
+    (old_files, old_bytes), (new_files, new_bytes) = _corpus_size(previous), _corpus_size(current)
+    if (old_files, old_bytes) != (new_files, new_bytes):
+        lines.append(f"Warning: different corpora ({old_files} files, {old_bytes} bytes before; "
+                     f"{new_files} files, {new_bytes} bytes now), the rates are not comparable")
+    lines.append(f"{'engine':12} {'workers':>7} {'before/s':>9} {'after/s':>9} {'change':>8}")
+    for result in current['results']:
+        old = before.get((result['engine'], result['workers']))
+        if old is None:
+            continue
+        if result['files_per_s'] and old['files_per_s']:
+            change = f"{result['files_per_s'] / old['files_per_s'] - 1:+8.1%}"
+        else:
+            change = f"{'n/a':>8}"
+        lines.append(f"{result['engine']:12} {result['workers']:7d} {_rate(old['files_per_s'], 9, 1)} "
+                     f"{_rate(result['files_per_s'], 9, 1)} {change}")
+    return '\n'.join(lines)
+
+if __name__ == "__main__":
+    from extract_docx import DEFAULT_BASE_PATH, ENGINES, iter_docx_files
+
+    parser = argparse.ArgumentParser(description="Compare the DOCX extraction engines on a corpus.")
+    parser.add_argument('base_path', nargs='?', default=DEFAULT_BASE_PATH)
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=['python-docx', 'xml'])
+    parser.add_argument('--workers', nargs='+', type=int, default=[1], help="Worker counts to benchmark")
+    parser.add_argument('--repeat', type=int, default=3, help="Keep the best of N timed passes")
+    parser.add_argument('--synthetic', type=int, metavar='MODULES',
+                        help="Benchmark a generated corpus of MODULES x 11 files written to base_path")
+    parser.add_argument('--output', help="Also write the results as JSON")
+    parser.add_argument('--compare', metavar='JSON', help="Show the change from a previous --output file")
+    parser.add_argument('--run-engine', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_engine:
+        print(json.dumps(run_engine(args.base_path, args.run_engine, args.workers[0], args.repeat)))
+        sys.exit(0)
+
+    if args.synthetic:
+        from generate_docx_corpus import generate_corpus
+
+        if os.path.isdir(args.base_path) and os.listdir(args.base_path):
+            sys.exit(f"{args.base_path} is not empty; pick a new folder for the synthetic corpus")
+        print(f"Generated {generate_corpus(args.base_path, modules=args.synthetic)} files in {args.base_path}")
+
+    if next(iter_docx_files(args.base_path), None) is None:
+        sys.exit(f"No DOCX files found under {os.path.abspath(args.base_path)}")
+    results = benchmark_engines(args.base_path, args.engines, args.workers, args.repeat)
+    report = benchmark_report(args.base_path, results)
+    print(format_results(results))
+    if args.compare:
+        print(format_comparison(load_report(args.compare), report))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
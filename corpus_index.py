@@ -0,0 +1,130 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+from collections import namedtuple
+
+from corpus_store import PROJECT_ROOT, find_corpus, load_corpus
+
+DEFAULT_INDEX_PATH = os.path.join(PROJECT_ROOT, 'implementations_index.sqlite')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    paragraph INTEGER NOT NULL,
+    char_offset INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_path ON segments (path);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5 (
+    text, content='segments', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS segments_ai AFTER INSERT ON segments BEGIN
+    INSERT INTO segments_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_ad AFTER DELETE ON segments BEGIN
+    INSERT INTO segments_fts (segments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+'''
+
+Hit = namedtuple('Hit', ['path', 'paragraph', 'char_offset', 'score', 'snippet'])
+
+def connect(index_path=DEFAULT_INDEX_PATH):
+    """Open (creating if needed) the full-text index database."""
+    conn = sqlite3.connect(index_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def split_segments(text):
+    """Yield (paragraph, char_offset, text) for each non-blank paragraph or cell.
+
+    Extracted documents hold one paragraph or table cell per line.
+    """
+    char_offset = 0
+    for paragraph, line in enumerate(text.split('\n')):
+        if line.strip():
+            yield paragraph, char_offset, line
+        char_offset += len(line) + 1
+
+def update_index(conn, documents):
+    """Bring the index in line with (path, text) pairs, re-indexing only changed documents.
+
+    Documents missing from the input are removed. Returns a dict of counts.
+    """
+    counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+    known = dict(conn.execute('SELECT path, sha256 FROM documents'))
+    with conn:
+        for path, text in documents:
+            digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+            previous = known.pop(path, None)
+            if previous == digest:
+                counts['unchanged'] += 1
+                continue
+            if previous is not None:
+                conn.execute('DELETE FROM segments WHERE path = ?', (path,))
+                counts['updated'] += 1
+            else:
+                counts['added'] += 1
+            conn.executemany(
+                'INSERT INTO segments (path, paragraph, char_offset, text) VALUES (?, ?, ?, ?)',
+                ((path, paragraph, char_offset, segment) for paragraph, char_offset, segment in split_segments(text)),
+            )
+            conn.execute('INSERT OR REPLACE INTO documents (path, sha256) VALUES (?, ?)', (path, digest))
+        for path in known:
+            conn.execute('DELETE FROM segments WHERE path = ?', (path,))
+            conn.execute('DELETE FROM documents WHERE path = ?', (path,))
+            counts['removed'] += 1
+    return counts
+
+def _match_expression(query):
+    """Quote each term so punctuation such as 'US-001' is not read as FTS5 syntax."""
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+def search(conn, query, limit=10, raw=False):
+    """Return the best-ranked Hits for query (bm25, best first).
+
+    Terms are matched as plain words unless raw is True, in which case query
+    is passed to FTS5 as-is (AND/OR/NEAR, prefix*, column filters...).
+    """
+    rows = conn.execute(
+        '''SELECT s.path, s.paragraph, s.char_offset, f.rank,
+                  snippet(segments_fts, 0, '[', ']', '...', 12)
+           FROM segments_fts AS f JOIN segments AS s ON s.id = f.rowid
+           WHERE segments_fts MATCH ?
+           ORDER BY f.rank LIMIT ?''',
+        (query if raw else _match_expression(query), limit),
+    )
+    return [Hit(*row) for row in rows]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Full-text index over the extracted PRD and user-story text.")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help="SQLite index file")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="Create or incrementally update the index")
+    build.add_argument('corpus', nargs='?', help="Extracted corpus (.json, .jsonl or .pack)")
+    query = subparsers.add_parser('query', help="Search the index")
+    query.add_argument('terms', nargs='+')
+    query.add_argument('-n', '--limit', type=int, default=10)
+    query.add_argument('--raw', action='store_true', help="Pass the query to FTS5 unchanged")
+    args = parser.parse_args()
+
+    conn = connect(args.index)
+    if args.command == 'build':
+        corpus = load_corpus(args.corpus or find_corpus())
+        counts = update_index(conn, corpus.items())
+        print(f"Index updated: {counts['added']} added, {counts['updated']} updated, "
+              f"{counts['unchanged']} unchanged, {counts['removed']} removed")
+    else:
+        start = time.perf_counter()
+        hits = search(conn, ' '.join(args.terms), args.limit, args.raw)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for hit in hits:
+            print(f"{hit.score:8.2f}  {hit.path} ¶{hit.paragraph}  {hit.snippet}")
+        print(f"{len(hits)} hits in {elapsed_ms:.2f} ms")
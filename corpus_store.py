@@ -0,0 +1,343 @@
+import hashlib
+import json
+import mmap
+import os
+from array import array
+from collections.abc import Mapping, Sequence
+
+# Outputs live next to these scripts, at the root of the project
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_JSON_CORPUS = os.path.join(PROJECT_ROOT, 'implementations_extracted.json')
+DEFAULT_PACKED_CORPUS = os.path.join(PROJECT_ROOT, 'implementations_extracted.pack')
+DEFAULT_INTERNED_CORPUS = os.path.join(PROJECT_ROOT, 'implementations_extracted.interned.json')
+PACK_VERSION = 1
+INTERNED_VERSION = 1
+
+def document_key(relative_path):
+    """Key of a document: its path relative to the implementations folder, with '/' separators.
+
+    Corpora extracted on Windows used backslashes; keys are normalized so a
+    document has the same key whichever platform wrote or reads the corpus.
+    """
+    return relative_path.replace('\\', '/')
+
+def index_path(blob_path):
+    """Path of the offset index that goes with a packed corpus blob."""
+    return blob_path + '.idx.json'
+
+class PackedCorpusWriter:
+    """Append documents to a packed corpus: one UTF-8 blob plus an offset index.
+
+    The index, {relative_path: [offset, length]} in bytes, is written when the
+    writer is closed. Until then the blob goes to <blob>.tmp, so an
+    interrupted run leaves the previous corpus untouched; close() replaces
+    the blob and then the index.
+    """
+
+    def __init__(self, blob_path):
+        self.blob_path = blob_path
+        self.index = {}
+        self._offset = 0
+        self._blob = open(blob_path + '.tmp', 'wb')
+
+    def add(self, relative_path, text):
+        data = text.encode('utf-8')
+        self._blob.write(data)
+        self.index[relative_path] = [self._offset, len(data)]
+        self._offset += len(data)
+
+    def write_through(self, documents):
+        """Add each (relative_path, text) pair while passing it on unchanged."""
+        for relative_path, text in documents:
+            self.add(relative_path, text)
+            yield relative_path, text
+
+    def close(self):
+        if self._blob.closed:
+            return
+        self._blob.close()
+        os.replace(self.blob_path + '.tmp', self.blob_path)
+        tmp_path = index_path(self.blob_path) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': PACK_VERSION, 'documents': self.index}, f, ensure_ascii=False)
+        os.replace(tmp_path, index_path(self.blob_path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_packed_corpus(documents, blob_path):
+    """Write (relative_path, text) pairs as a packed corpus and return its index."""
+    with PackedCorpusWriter(blob_path) as writer:
+        for relative_path, text in documents:
+            writer.add(relative_path, text)
+    return writer.index
+
+class PackedCorpus(Mapping):
+    """Read-only {relative_path: text} view over a memory-mapped packed corpus.
+
+    Only the offset index is parsed on open; a document is decoded from the
+    mapping when it is looked up, the rest of the blob is never read.
+    """
+
+    def __init__(self, blob_path):
+        with open(index_path(blob_path), 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        if header.get('version') != PACK_VERSION:
+            raise ValueError(f"Unsupported packed corpus version in {index_path(blob_path)}")
+        self.index = {document_key(path): span for path, span in header['documents'].items()}
+        self._file = open(blob_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        end = max((offset + length for offset, length in self.index.values()), default=0)
+        if size != end:
+            self._file.close()
+            raise ValueError(f"{blob_path} is {size} bytes but its index ends at {end}; "
+                             f"the packed corpus is incomplete")
+        if size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._map)
+        else:  # an empty file cannot be mapped
+            self._map = None
+            self._view = memoryview(b'')
+
+    def raw(self, relative_path):
+        """Return the UTF-8 bytes of one document as a zero-copy memoryview."""
+        offset, length = self.index[relative_path]
+        return self._view[offset:offset + length]
+
+    def __getitem__(self, relative_path):
+        return str(self.raw(relative_path), 'utf-8')
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def close(self):
+        self._view.release()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def paragraph_digest(paragraph):
+    """Content address of one paragraph (or table cell line)."""
+    return hashlib.blake2b(paragraph.encode('utf-8'), digest_size=16).digest()
+
+def _encode_runs(ids):
+    """[3, 4, 5, 9] -> [3, 3, 9, 1]: flat (first id, run length) pairs."""
+    runs = []
+    for paragraph_id in ids:
+        if runs and runs[-2] + runs[-1] == paragraph_id:
+            runs[-1] += 1
+        else:
+            runs += [paragraph_id, 1]
+    return runs
+
+def _decode_runs(runs):
+    ids = array('I')
+    for position in range(0, len(runs), 2):
+        ids.extend(range(runs[position], runs[position] + runs[position + 1]))
+    return ids
+
+class ParagraphTable:
+    """Content-addressed paragraph store: each distinct paragraph gets one ID.
+
+    Documents are split on the newlines extraction puts between paragraphs
+    and table cells, so '\\n'.join of a document's paragraphs rebuilds it
+    exactly. IDs are positions in `paragraphs`, in first-seen order.
+    """
+
+    def __init__(self):
+        self.paragraphs = []
+        self._ids = {}
+
+    def intern(self, text):
+        """Return the paragraph IDs of one document, adding unseen paragraphs."""
+        ids = array('I')
+        for paragraph in text.split('\n'):
+            key = paragraph_digest(paragraph)
+            paragraph_id = self._ids.get(key)
+            if paragraph_id is None:
+                paragraph_id = self._ids[key] = len(self.paragraphs)
+                self.paragraphs.append(paragraph)
+            ids.append(paragraph_id)
+        return ids
+
+class InternedCorpusWriter:
+    """Write documents as a paragraph table plus, per document, paragraph IDs.
+
+    The file is JSON: {"version", "paragraphs": [text, ...], "documents":
+    {relative_path: [first_id, run_length, ...]}}. Consecutive IDs are
+    stored as runs since a document's new paragraphs are numbered in order.
+    It is written, atomically, when the writer is closed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.table = ParagraphTable()
+        self.documents = {}
+        self.closed = False
+
+    def add(self, relative_path, text):
+        self.documents[relative_path] = self.table.intern(text)
+
+    def write_through(self, documents):
+        """Add each (relative_path, text) pair while passing it on unchanged."""
+        for relative_path, text in documents:
+            self.add(relative_path, text)
+            yield relative_path, text
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': INTERNED_VERSION,
+                'paragraphs': self.table.paragraphs,
+                'documents': {path: _encode_runs(ids) for path, ids in self.documents.items()},
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_interned_corpus(documents, path):
+    """Write (relative_path, text) pairs as an interned corpus; returns the writer."""
+    with InternedCorpusWriter(path) as writer:
+        for relative_path, text in documents:
+            writer.add(relative_path, text)
+    return writer
+
+class _PackedParagraphs(Sequence):
+    """The paragraph table as one UTF-8 buffer plus an offset array.
+
+    Corpus paragraphs are short, so one str object each would cost more
+    memory than the duplicates interning removes.
+    """
+
+    def __init__(self, paragraphs):
+        encoded = [paragraph.encode('utf-8') for paragraph in paragraphs]
+        self.offsets = array('I', [0])
+        for data in encoded:
+            self.offsets.append(self.offsets[-1] + len(data))
+        self.blob = b''.join(encoded)
+
+    def raw(self, paragraph_id):
+        return self.blob[self.offsets[paragraph_id]:self.offsets[paragraph_id + 1]]
+
+    def __getitem__(self, paragraph_id):
+        if isinstance(paragraph_id, slice):
+            return [self[i] for i in range(*paragraph_id.indices(len(self)))]
+        return self.raw(paragraph_id).decode('utf-8')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+class InternedCorpus(Mapping):
+    """Read-only {relative_path: text} view over a paragraph table.
+
+    Each distinct paragraph is held once; documents are arrays of paragraph
+    IDs and are joined back together when looked up. Code that works per
+    paragraph can walk `paragraphs` once and map results back to documents
+    through paragraph_ids().
+    """
+
+    def __init__(self, paragraphs, documents):
+        self.paragraphs = _PackedParagraphs(paragraphs)
+        self.documents = documents
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != INTERNED_VERSION:
+            raise ValueError(f"Unsupported interned corpus version in {path}")
+        return cls(data['paragraphs'],
+                   {document_key(path): _decode_runs(runs) for path, runs in data['documents'].items()})
+
+    @classmethod
+    def from_documents(cls, documents):
+        """Intern (relative_path, text) pairs in memory."""
+        table = ParagraphTable()
+        return cls(table.paragraphs, {relative_path: table.intern(text) for relative_path, text in documents})
+
+    def paragraph_ids(self, relative_path):
+        return self.documents[relative_path]
+
+    def __getitem__(self, relative_path):
+        raw = self.paragraphs.raw
+        return b'\n'.join([raw(paragraph_id) for paragraph_id in self.documents[relative_path]]).decode('utf-8')
+
+    def __iter__(self):
+        return iter(self.documents)
+
+    def __len__(self):
+        return len(self.documents)
+
+def as_interned(corpus):
+    """Return corpus as an InternedCorpus, interning it if it is another mapping."""
+    if isinstance(corpus, InternedCorpus):
+        return corpus
+    return InternedCorpus.from_documents(corpus.items())
+
+def find_corpus(json_path=DEFAULT_JSON_CORPUS, packed_path=DEFAULT_PACKED_CORPUS):
+    """Prefer the packed corpus when it exists and is not older than the JSON file.
+
+    The index is written last, when the whole blob is in place, so its mtime
+    is the one compared.
+    """
+    if os.path.exists(packed_path) and os.path.exists(index_path(packed_path)):
+        if not os.path.exists(json_path) or os.path.getmtime(index_path(packed_path)) >= os.path.getmtime(json_path):
+            return packed_path
+    return json_path
+
+def load_corpus(path):
+    """Open an extracted corpus: packed (.pack), interned (.interned.json), JSON Lines or a JSON document map."""
+    if path.endswith('.pack'):
+        return PackedCorpus(path)
+    if path.endswith('.interned.json'):
+        return InternedCorpus.load(path)
+    if path.endswith('.jsonl'):
+        from jsonl_to_json import read_jsonl
+        documents = read_jsonl(path)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            documents = json.load(f).items()
+    return {document_key(relative_path): text for relative_path, text in documents}
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pack or intern an extracted JSON corpus.")
+    parser.add_argument('json_path', nargs='?', default=DEFAULT_JSON_CORPUS)
+    parser.add_argument('output_path', nargs='?')
+    parser.add_argument('--interned', action='store_true',
+                        help="Write a paragraph-interned corpus instead of a packed one")
+    args = parser.parse_args()
+
+    documents = load_corpus(args.json_path).items()
+    if args.interned:
+        output_path = args.output_path or DEFAULT_INTERNED_CORPUS
+        writer = write_interned_corpus(documents, output_path)
+        total = sum(len(ids) for ids in writer.documents.values())
+        print(f"Interned {len(writer.documents)} documents into {output_path}: "
+              f"{len(writer.table.paragraphs)} unique of {total} paragraphs, "
+              f"{os.path.getsize(output_path)} bytes (JSON: {os.path.getsize(args.json_path)})")
+    else:
+        output_path = args.output_path or DEFAULT_PACKED_CORPUS
+        index = write_packed_corpus(documents, output_path)
+        print(f"Packed {len(index)} documents into {output_path}")
@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+from extract_docx import (DEFAULT_ENGINE, DEFAULT_OUTPUT_FILE, DEFAULT_TIMEOUT, ENGINES, extraction_worker,
+                          iter_docx_files, write_json, write_jsonl, write_quarantine_report)
+
+# Queue layout, all under one shared directory:
+#   queue.json                    base path, engine and run id chosen at enqueue time
+#   todo/000042.json              a file waiting to be claimed
+#   claimed/000042.json@<worker>  claimed; its mtime is the lease heartbeat
+#   done/000042.json              finished (result or failure is in a shard)
+#   shards/<worker>.jsonl         one result line per task a worker finished
+DEFAULT_LEASE = 300
+TASK_DIRS = ('todo', 'claimed', 'done', 'shards')
+
+def _queue_path(queue_dir, *parts):
+    return os.path.join(queue_dir, *parts)
+
+def enqueue(base_path, queue_dir, engine=DEFAULT_ENGINE):
+    """Create a work queue with one task per DOCX file, numbered in discovery order.
+
+    An existing queue in queue_dir is cleared first; any other non-empty
+    directory is refused with ValueError rather than written into. Each
+    queue gets a new run id, which workers stamp on their results so merge
+    ignores anything a worker of an earlier run still appends.
+    """
+    if os.path.isdir(queue_dir) and os.listdir(queue_dir):
+        if not os.path.exists(_queue_path(queue_dir, 'queue.json')):
+            raise ValueError(f"{queue_dir} is not empty and is not a work queue")
+        for name in TASK_DIRS:
+            shutil.rmtree(_queue_path(queue_dir, name), ignore_errors=True)
+    for name in TASK_DIRS:
+        os.makedirs(_queue_path(queue_dir, name), exist_ok=True)
+    config = {'base_path': os.path.abspath(base_path), 'engine': engine, 'run': uuid.uuid4().hex}
+    with open(_queue_path(queue_dir, 'queue.json'), 'w', encoding='utf-8') as f:
+        json.dump(config, f)
+    count = 0
+    for index, (_, relative_path) in enumerate(iter_docx_files(base_path)):
+        task = {'index': index, 'path': relative_path}
+        tmp_path = _queue_path(queue_dir, f'{index:06d}.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(task, f, ensure_ascii=False)
+        os.replace(tmp_path, _queue_path(queue_dir, 'todo', f'{index:06d}.json'))
+        count += 1
+    return count
+
+def _reclaim_expired(queue_dir, lease):
+    """Move claims whose lease ran out back to todo; returns how many claims remain."""
+    remaining = 0
+    now = time.time()
+    claimed_dir = _queue_path(queue_dir, 'claimed')
+    for name in os.listdir(claimed_dir):
+        claimed_path = os.path.join(claimed_dir, name)
+        try:
+            expired = now - os.path.getmtime(claimed_path) > lease
+            if expired:
+                # rename is atomic: of several workers reclaiming, one wins
+                os.rename(claimed_path, _queue_path(queue_dir, 'todo', name.split('@')[0]))
+                continue
+        except FileNotFoundError:
+            continue
+        remaining += 1
+    return remaining
+
+def _claim_next(queue_dir, worker_id):
+    """Atomically claim the lowest-numbered todo task; None when todo is empty."""
+    todo_dir = _queue_path(queue_dir, 'todo')
+    for name in sorted(os.listdir(todo_dir)):
+        if not name.endswith('.json'):
+            continue
+        todo_path = os.path.join(todo_dir, name)
+        claimed_path = _queue_path(queue_dir, 'claimed', f'{name}@{worker_id}')
+        try:
+            # rename keeps the mtime, so touch first: the claim starts with a fresh lease
+            os.utime(todo_path)
+            os.rename(todo_path, claimed_path)
+            with open(claimed_path, 'r', encoding='utf-8') as f:
+                return name, claimed_path, json.load(f)
+        except FileNotFoundError:
+            continue  # another worker got it first, or reclaimed it from us
+    return None
+
+def _heartbeat(claimed_path, interval, stop):
+    while not stop.wait(interval):
+        try:
+            os.utime(claimed_path)
+        except FileNotFoundError:
+            return
+
+def work(queue_dir, worker_id=None, lease=DEFAULT_LEASE, base_path=None, timeout=DEFAULT_TIMEOUT,
+         max_memory_mb=None, poll_interval=1.0):
+    """Claim and extract tasks until the queue is drained; returns the number done.
+
+    base_path overrides the folder recorded at enqueue time, for hosts that
+    mount the corpus elsewhere. Claims are kept alive by touching the claim
+    file; a worker that dies stops touching it and, once `lease` seconds
+    pass, any other worker moves the task back to todo. Lease expiry
+    compares file mtimes with the local clock, so hosts need roughly
+    synchronized clocks.
+    """
+    with open(_queue_path(queue_dir, 'queue.json'), 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    base_path = base_path or config['base_path']
+    worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+    shard_path = _queue_path(queue_dir, 'shards', f'{worker_id}.jsonl')
+    done = 0
+
+    # One supervised process parses every file this worker claims
+    with open(shard_path, 'a', encoding='utf-8') as shard, extraction_worker(timeout, max_memory_mb) as extractor:
+        while True:
+            claim = _claim_next(queue_dir, worker_id)
+            if claim is None:
+                if _reclaim_expired(queue_dir, lease) == 0 and not os.listdir(_queue_path(queue_dir, 'todo')):
+                    return done
+                time.sleep(poll_interval)
+                continue
+
+            name, claimed_path, task = claim
+            stop = threading.Event()
+            heartbeat = threading.Thread(target=_heartbeat, args=(claimed_path, lease / 3, stop), daemon=True)
+            heartbeat.start()
+            try:
+                file_path = os.path.join(base_path, task['path'])
+                print(f"[{worker_id}] Processing: {task['path']}")
+                ok, result = extractor.call(file_path, config['engine'])
+            finally:
+                stop.set()
+                heartbeat.join()
+
+            record = {'run': config['run'], 'index': task['index'], 'path': task['path'], 'worker': worker_id}
+            if ok:
+                record['text'] = result[0]
+            else:
+                record['failure'] = result
+            shard.write(json.dumps(record, ensure_ascii=False) + '\n')
+            shard.flush()
+            os.fsync(shard.fileno())
+            try:
+                os.rename(claimed_path, _queue_path(queue_dir, 'done', name))
+            except FileNotFoundError:
+                pass  # lease expired and the task was reclaimed; merge keeps one result
+            done += 1
+
+def merge(queue_dir, output_file, output_format='json', quarantine_file=None):
+    """Combine the worker shards into one output, in discovery order.
+
+    Tasks processed twice (after a lease expiry) appear once; records from
+    another run of the queue are ignored. Returns (document count,
+    quarantined count, unfinished task count).
+    """
+    with open(_queue_path(queue_dir, 'queue.json'), 'r', encoding='utf-8') as f:
+        run = json.load(f)['run']
+    results = {}
+    shards_dir = _queue_path(queue_dir, 'shards')
+    for name in sorted(os.listdir(shards_dir)):
+        with open(os.path.join(shards_dir, name), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn last line of a worker that died mid-write
+                if record.get('run') != run:
+                    continue
+                previous = results.get(record['index'])
+                if previous is None or ('failure' in previous and 'text' in record):
+                    results[record['index']] = record
+
+    ordered = [results[index] for index in sorted(results)]
+    documents = [(record['path'], record['text']) for record in ordered if 'text' in record]
+    quarantine = [{'path': record['path'], **record['failure']} for record in ordered if 'failure' in record]
+    if output_format == 'jsonl':
+        write_jsonl(documents, output_file)
+    else:
+        write_json(documents, output_file)
+    if quarantine_file:
+        write_quarantine_report(quarantine, quarantine_file)
+    unfinished = len(os.listdir(_queue_path(queue_dir, 'todo'))) + len(os.listdir(_queue_path(queue_dir, 'claimed')))
+    return len(documents), len(quarantine), unfinished
+
+def run_local(base_path, queue_dir, output_file, processes, engine=DEFAULT_ENGINE, lease=DEFAULT_LEASE,
+              quarantine_file=None):
+    """Enqueue, run several worker processes on this machine, then merge."""
+    enqueue(base_path, queue_dir, engine)
+    script = os.path.abspath(__file__)
+    workers = [
+        subprocess.Popen([sys.executable, script, 'work', queue_dir, '--worker-id', f'local-{n}',
+                          '--lease', str(lease)])
+        for n in range(processes)
+    ]
+    for worker in workers:
+        worker.wait()
+    return merge(queue_dir, output_file, quarantine_file=quarantine_file)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract DOCX files with workers sharing a queue directory.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help="Create the work queue")
+    enqueue_parser.add_argument('base_path')
+    enqueue_parser.add_argument('queue_dir')
+    enqueue_parser.add_argument('--engine', choices=sorted(ENGINES), default=DEFAULT_ENGINE)
+
+    work_parser = subparsers.add_parser('work', help="Process tasks until the queue is empty")
+    work_parser.add_argument('queue_dir')
+    work_parser.add_argument('--worker-id')
+    work_parser.add_argument('--base-path', help="Where this host sees the DOCX folder")
+    work_parser.add_argument('--lease', type=float, default=DEFAULT_LEASE, help="Seconds before a silent claim expires")
+    work_parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT)
+    work_parser.add_argument('--max-memory', type=int, metavar='MB')
+
+    merge_parser = subparsers.add_parser('merge', help="Merge worker shards into the final output")
+    merge_parser.add_argument('queue_dir')
+    merge_parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT_FILE)
+    merge_parser.add_argument('--format', choices=['json', 'jsonl'], default='json')
+
+    local_parser = subparsers.add_parser('run-local', help="Enqueue, run N local workers and merge")
+    local_parser.add_argument('base_path')
+    local_parser.add_argument('queue_dir')
+    local_parser.add_argument('-n', '--processes', type=int, default=os.cpu_count() or 1)
+    local_parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT_FILE)
+    local_parser.add_argument('--engine', choices=sorted(ENGINES), default=DEFAULT_ENGINE)
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'enqueue':
+            print(f"Queued {enqueue(args.base_path, args.queue_dir, args.engine)} files in {args.queue_dir}")
+        elif args.command == 'work':
+            done = work(args.queue_dir, args.worker_id, args.lease, args.base_path, args.timeout or None, args.max_memory)
+            print(f"Worker finished {done} tasks")
+        else:
+            quarantine_file = os.path.splitext(args.output)[0] + '.quarantine.json'
+            if args.command == 'merge':
+                counts = merge(args.queue_dir, args.output, args.format, quarantine_file)
+            else:
+                counts = run_local(args.base_path, args.queue_dir, args.output, args.processes, args.engine,
+                                   quarantine_file=quarantine_file)
+            documents, quarantined, unfinished = counts
+            print(f"Merged {documents} documents into {args.output} ({quarantined} quarantined)")
+            if unfinished:
+                print(f"Warning: {unfinished} tasks are still queued or claimed")
+    except ValueError as error:
+        sys.exit(str(error))
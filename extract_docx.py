@@ -1,60 +1,649 @@
+import argparse
+import hashlib
+import io
 import os
-from docx import Document
+import sys
+import time
+import zipfile
+from xml.etree import ElementTree
 import json
+from corpus_store import (PROJECT_ROOT, InternedCorpusWriter, PackedCorpusWriter, document_key,
+                          load_corpus, write_interned_corpus, write_packed_corpus)
+from extraction_metrics import ExtractionMetrics
 
-def extract_text_from_docx(file_path):
-    """Extract all text from a DOCX file."""
-    try:
-        doc = Document(file_path)
-        text = []
+DEFAULT_BASE_PATH = os.path.join(PROJECT_ROOT, 'implementations')
+DEFAULT_OUTPUT_FILE = os.path.join(PROJECT_ROOT, 'implementations_extracted.json')
+MANIFEST_VERSION = 4
+DEFAULT_ENGINE = 'python-docx'
+DEFAULT_TIMEOUT = 60
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_BODY = W_NS + 'body'
+W_P = W_NS + 'p'
+W_R = W_NS + 'r'
+W_HYPERLINK = W_NS + 'hyperlink'
+W_TBL = W_NS + 'tbl'
+W_TR = W_NS + 'tr'
+W_TC = W_NS + 'tc'
+W_VAL = W_NS + 'val'
+# Text equivalents of run children, as python-docx's Run.text maps them
+RUN_TEXT = {
+    W_NS + 'tab': '\t',
+    W_NS + 'ptab': '\t',
+    W_NS + 'cr': '\n',
+    W_NS + 'noBreakHyphen': '-',
+}
+
+def _extract_python_docx(file_path, stats):
+    """Extract text through the python-docx object model."""
+    # Imported here: python-docx is slow to import and the xml engine does not need it
+    from docx import Document
+    from docx.table import _Cell
+
+    doc = Document(file_path)
+    text = []
+
+    for paragraph in doc.paragraphs:
+        stats['paragraphs'] += 1
+        if paragraph.text.strip():
+            text.append(paragraph.text)
+
+    # Also extract from tables
+    def cell_text(tc):
+        return _Cell(tc, doc).text
+
+    for table in doc.tables:
+        for cell in _iter_table_cells(table._tbl, cell_text, stats):
+            if cell.strip():
+                text.append(cell)
+
+    return "\n".join(text)
+
+def _run_text(run):
+    parts = []
+    for child in run:
+        if child.tag == W_NS + 't':
+            parts.append(child.text or '')
+        elif child.tag == W_NS + 'br':
+            if child.get(W_NS + 'type', 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif child.tag in RUN_TEXT:
+            parts.append(RUN_TEXT[child.tag])
+    return ''.join(parts)
+
+def _paragraph_text(p):
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(run) for run in child.iterfind(W_R))
+    return ''.join(parts)
+
+def _cell_props(tc):
+    """Return (grid_span, v_merge) for a w:tc element."""
+    tc_pr = tc.find(W_NS + 'tcPr')
+    if tc_pr is None:
+        return 1, None
+    span = tc_pr.find(W_NS + 'gridSpan')
+    v_merge = tc_pr.find(W_NS + 'vMerge')
+    return (
+        int(span.get(W_VAL)) if span is not None else 1,
+        v_merge.get(W_VAL, 'continue') if v_merge is not None else None,
+    )
+
+def _grid_before(tr):
+    grid_before = tr.find(W_NS + 'trPr/' + W_NS + 'gridBefore')
+    return int(grid_before.get(W_VAL)) if grid_before is not None else 0
+
+def _xml_cell_text(tc):
+    return "\n".join(_paragraph_text(p) for p in tc.iterfind(W_P))
+
+def _iter_table_cells(tbl, cell_text, stats):
+    """Yield the text of each physical cell of a table once, nested tables included.
+
+    Walking row.cells would return a horizontally merged cell once per grid
+    column it spans and a vertically merged cell again on every row it
+    covers. Each w:tc is read once instead; the grid bookkeeping only counts
+    the non-empty duplicates skipped into stats['duplicate_cells']. Nested
+    tables follow the cell that contains them.
+    """
+    above = {}
+    for tr in tbl.iterfind(W_TR):
+        row = {}
+        offset = _grid_before(tr)
+        for tc in tr.iterfind(W_TC):
+            span, v_merge = _cell_props(tc)
+            text = cell_text(tc)
+            if v_merge == 'continue':
+                # Content lives in the cell at the same offset in the row above
+                row[offset] = above.get(offset, '')
+                skipped = span
+            else:
+                row[offset] = text
+                skipped = span - 1
+            if row[offset].strip():
+                stats['duplicate_cells'] += skipped
+            stats['table_cells'] += 1
+            yield text
+            for nested in tc.iterfind(W_TBL):
+                yield from _iter_table_cells(nested, cell_text, stats)
+            offset += span
+        above = row
+
+def _extract_xml(file_path, stats):
+    """Extract text by streaming word/document.xml, without building a Document.
+
+    Produces the same text as the python-docx engine: body paragraphs first,
+    then the cells of each body-level table.
+    """
+    paragraphs = []
+    cells = []
+    with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as xml:
+        depth = 0
+        body = None
+        for event, elem in ElementTree.iterparse(xml, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 2 and elem.tag == W_BODY:
+                    body = elem
+                continue
+            depth -= 1
+            if depth != 2 or body is None:
+                continue
+            if elem.tag == W_P:
+                stats['paragraphs'] += 1
+                text = _paragraph_text(elem)
+                if text.strip():
+                    paragraphs.append(text)
+            elif elem.tag == W_TBL:
+                cells.extend(text for text in _iter_table_cells(elem, _xml_cell_text, stats) if text.strip())
+            # Body children are fully handled; drop them to keep memory flat
+            body.clear()
 
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text.append(paragraph.text)
+    return "\n".join(paragraphs + cells)
 
-        # Also extract from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text.append(cell.text)
+ENGINES = {
+    'python-docx': _extract_python_docx,
+    'xml': _extract_xml,
+}
 
-        return "\n".join(text)
-    except Exception as e:
-        return f"Error reading {file_path}: {str(e)}"
+def new_stats():
+    """Return zeroed per-file extraction counters."""
+    return {'paragraphs': 0, 'table_cells': 0, 'duplicate_cells': 0}
 
-def scan_implementations_folder(base_path):
-    """Scan all DOCX files in implementations folder."""
-    results = {}
+def extract_text_from_docx(file_path, engine=DEFAULT_ENGINE, stats=None):
+    """Extract all text from a DOCX file.
 
+    file_path may also be a binary file object. If a stats dict is given
+    (see new_stats) the paragraph and table counters are added to it.
+    Unreadable files raise; scan_implementations_folder quarantines them.
+    """
+    if stats is None:
+        stats = new_stats()
+    return ENGINES[engine](file_path, stats)
+
+def _parse_bytes(data, engine=DEFAULT_ENGINE):
+    """Parse DOCX bytes, returning (text, stats, parse_seconds)."""
+    start = time.perf_counter()
+    stats = new_stats()
+    text = extract_text_from_docx(io.BytesIO(data), engine, stats)
+    return text, stats, time.perf_counter() - start
+
+def _extract_with_stats(file_path, engine=DEFAULT_ENGINE):
+    """Read and parse one file, returning (text, stats, timings)."""
+    start = time.perf_counter()
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    text, stats, parse_seconds = _parse_bytes(data, engine)
+    wall_seconds = time.perf_counter() - start
+    return text, stats, {'bytes_read': len(data), 'parse_seconds': parse_seconds, 'wall_seconds': wall_seconds}
+
+def iter_docx_files(base_path):
+    """Yield (file_path, relative_path) for every DOCX file, in os.walk order.
+
+    relative_path is the document's key in the outputs (see corpus_store.document_key).
+    """
     for root, dirs, files in os.walk(base_path):
         for file in files:
             if file.endswith('.docx') and not file.startswith('~'):
                 file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, base_path)
+                yield file_path, document_key(os.path.relpath(file_path, base_path))
+
+def file_sha256(file_path):
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_manifest(manifest_path):
+    """Load the extraction manifest, or an empty one if missing or unreadable."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('files', {})
+
+def save_manifest(manifest_path, entries):
+    """Atomically write the extraction manifest."""
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': entries}, f, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+
+def extract_many(file_paths, workers, engine=DEFAULT_ENGINE, timeout=None, max_memory_mb=None):
+    """Yield (True, (text, stats, timings)) or (False, failure) for each file, in order.
+
+    See supervised_map for how workers, timeout and max_memory_mb isolate
+    each file and how failures are retried once before being reported.
+    """
+    # multiprocessing is imported on first use so `--help` stays fast
+    from supervised_pool import supervised_map
+
+    return supervised_map(_extract_with_stats, [(file_path, engine) for file_path in file_paths],
+                          workers=workers, timeout=timeout, max_memory_mb=max_memory_mb)
+
+def extraction_worker(timeout=None, max_memory_mb=None):
+    """A SupervisedWorker whose call(file_path, engine) extracts one file as extract_many does.
+
+    The same worker process, python-docx already imported, serves every call
+    until a file crashes it or times out.
+    """
+    from supervised_pool import SupervisedWorker
+
+    return SupervisedWorker(_extract_with_stats, timeout, max_memory_mb)
+
+def _plan_files(base_path, manifest_path=None):
+    """Yield (file_path, relative_path, entry) for every DOCX file, in discovery order.
+
+    entry holds the file's size and mtime, plus its SHA-256, cached text and
+    stats when the manifest shows the file is unchanged.
+    """
+    cached = load_manifest(manifest_path) if manifest_path else {}
+    for file_path, relative_path in iter_docx_files(base_path):
+        stat = os.stat(file_path)
+        entry = {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+        previous = cached.pop(relative_path, None)
+        if previous and previous['size'] == entry['size'] and previous['mtime'] == entry['mtime']:
+            entry['sha256'] = previous['sha256']
+            entry['text'] = previous['text']
+            entry['stats'] = previous['stats']
+        elif manifest_path:
+            entry['sha256'] = file_sha256(file_path)
+            if previous and previous['sha256'] == entry['sha256']:
+                entry['text'] = previous['text']
+                entry['stats'] = previous['stats']
+        yield file_path, relative_path, entry
+
+def _supervised_results(planned, workers, engine, timeout, max_memory_mb, report_cache=False):
+    """Yield (relative_path, entry, outcome) in order; outcome is None for cached files."""
+    planned = list(planned)
+    pending = [file_path for file_path, _, entry in planned if 'text' not in entry]
+    if report_cache:
+        print(f"Reusing {len(planned) - len(pending)} cached files, parsing {len(pending)}")
+
+    contents = extract_many(pending, workers, engine, timeout, max_memory_mb)
+    try:
+        for _, relative_path, entry in planned:
+            yield relative_path, entry, None if 'text' in entry else next(contents)
+    finally:
+        contents.close()
+
+def iter_extracted_documents(base_path, *, workers=1, manifest_path=None, engine=DEFAULT_ENGINE, stats=None,
+                             timeout=None, max_memory_mb=None, quarantine=None, metrics=None,
+                             pipeline=False, utilization=None, entries=None):
+    """Yield (relative_path, text) for every DOCX file, in discovery order.
+
+    Each document is yielded as soon as its text is available, so callers
+    can write results out without holding the whole corpus in memory. A
+    file that fails is retried once; if it fails again it is left out of
+    the results and of the manifest.
+
+    The options are keyword-only:
+
+      workers        processes parsing in parallel; results still come in
+                     discovery order, so the output matches a serial run
+      manifest_path  incremental cache: files whose size and mtime (or,
+                     failing that, content hash) match reuse their cached
+                     text; the manifest is rewritten with this run's files,
+                     and the texts stay in memory until the run ends
+      engine         'python-docx' (default) or 'xml', the streaming raw-XML
+                     reader that produces the same text faster
+      stats          dict (see new_stats) the counters of every file are summed into
+      timeout        wall-clock seconds allowed per file
+      max_memory_mb  address-space limit per worker process, in MiB
+      quarantine     list each failed file's {'path', 'reason', 'error',
+                     'attempts'} is appended to
+      metrics        ExtractionMetrics recording every file; a live
+                     throughput line is printed for each parsed file
+      pipeline       overlap discovery, reads, parsing and hand-off in the
+                     asyncio pipeline of extraction_pipeline.py
+      utilization    dict receiving the pipeline's per-stage utilization
+      entries        dict receiving each extracted file's manifest entry:
+                     the size and mtime seen when it was read, its stats
+                     and, when a manifest is kept, its SHA-256 and text
+    """
+    planned = _plan_files(base_path, manifest_path)
+    if pipeline:
+        from extraction_pipeline import iter_pipeline
+        results = iter_pipeline(planned, _parse_bytes, engine, workers, timeout, max_memory_mb, utilization)
+    else:
+        results = _supervised_results(planned, workers, engine, timeout, max_memory_mb,
+                                      report_cache=bool(manifest_path))
+
+    entries = {} if entries is None else entries
+    try:
+        for relative_path, entry, outcome in results:
+            if outcome is not None:
                 print(f"Processing: {relative_path}")
+                ok, result = outcome
+                if not ok:
+                    print(f"  Quarantined ({result['reason']}): {result['error']}")
+                    if quarantine is not None:
+                        quarantine.append({'path': relative_path, **result})
+                    if metrics is not None:
+                        metrics.record(relative_path, 'failed')
+                    continue
+                entry['text'], entry['stats'], timings = result
+                if metrics is not None:
+                    record = metrics.record(relative_path, 'parsed', timings, entry['stats'], len(entry['text']))
+                    print(metrics.progress_line(record))
+            elif metrics is not None:
+                metrics.record(relative_path, 'cached', stats=entry['stats'], output_chars=len(entry['text']))
+            entries[relative_path] = entry
+            if stats is not None:
+                for key, value in entry['stats'].items():
+                    stats[key] = stats.get(key, 0) + value
+            yield relative_path, entry['text']
+            if not manifest_path:
+                del entry['text']
+    finally:
+        results.close()
 
-                content = extract_text_from_docx(file_path)
-                results[relative_path] = content
+    if manifest_path:
+        save_manifest(manifest_path, entries)
 
-    return results
+def scan_implementations_folder(base_path, *, workers=1, manifest_path=None, engine=DEFAULT_ENGINE, stats=None,
+                                timeout=None, max_memory_mb=None, quarantine=None, metrics=None,
+                                pipeline=False, utilization=None, entries=None):
+    """Scan all DOCX files in implementations folder.
 
-if __name__ == "__main__":
-    base_path = r"C:\Users\Adeboye Adechi\Documents\ADSERVIO\IBTICAR_AI\ibticar-ai-mvp\implementations"
+    Returns {relative_path: text}; see iter_extracted_documents for the options.
+    """
+    return dict(iter_extracted_documents(base_path, workers=workers, manifest_path=manifest_path, engine=engine,
+                                         stats=stats, timeout=timeout, max_memory_mb=max_memory_mb,
+                                         quarantine=quarantine, metrics=metrics, pipeline=pipeline,
+                                         utilization=utilization, entries=entries))
 
-    print("Starting extraction...")
-    all_contents = scan_implementations_folder(base_path)
+def write_quarantine_report(quarantine, report_file):
+    """Write the files that could not be extracted, with the reason, as JSON."""
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump({'failed': quarantine}, f, ensure_ascii=False, indent=2)
 
-    # Save to JSON for analysis
-    output_file = r"C:\Users\Adeboye Adechi\Documents\ADSERVIO\IBTICAR_AI\ibticar-ai-mvp\implementations_extracted.json"
+def write_json(documents, output_file):
+    """Write (relative_path, text) pairs as the implementations_extracted.json layout."""
+    all_contents = dict(documents)
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(all_contents, f, ensure_ascii=False, indent=2)
+    return all_contents
+
+def write_jsonl(documents, output_file):
+    """Write (relative_path, text) pairs as JSON Lines, one flushed line per document.
+
+    Returns {relative_path: text length}. Convert the file to the JSON layout
+    with jsonl_to_json.py.
+    """
+    lengths = {}
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for relative_path, text in documents:
+            f.write(json.dumps({'path': relative_path, 'text': text}, ensure_ascii=False) + '\n')
+            f.flush()
+            lengths[relative_path] = len(text)
+    return lengths
+
+def _replace_file(output_file, write):
+    """Call write(tmp_path), then atomically move the result over output_file."""
+    tmp_path = output_file + '.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, output_file)
+
+def write_outputs_atomically(all_contents, output_file, output_format='json', pack_path=None):
+    """Rewrite the output (and packed corpus) so readers never see a partial file."""
+    documents = list(all_contents.items())
+    writer = {'jsonl': write_jsonl, 'interned': write_interned_corpus}.get(output_format, write_json)
+    _replace_file(output_file, lambda tmp_path: writer(documents, tmp_path))
+    if pack_path:
+        # PackedCorpusWriter fills <pack>.tmp and replaces the blob, then its index
+        write_packed_corpus(documents, pack_path)
 
-    print(f"\nExtraction complete! Found {len(all_contents)} files.")
+def watch_implementations_folder(base_path, output_file, output_format='json', manifest_path=None,
+                                 pack_path=None, search_index=None, engine=DEFAULT_ENGINE, timeout=None,
+                                 max_memory_mb=None, poll_interval=None, debounce=0.2):
+    """Keep the outputs up to date while DOCX files under base_path change.
+
+    Runs until interrupted. After one (cached) scan, only the files the
+    watcher reports are re-extracted, and the outputs are then rewritten
+    atomically. Uses inotify on Linux, else polls every poll_interval
+    seconds; ~$ lock files are ignored like in a normal scan.
+    """
+    from folder_watcher import RESCAN, open_watcher
+
+    # Start watching before the scan so edits made during it are not missed
+    watcher = open_watcher(base_path, poll_interval)
+    print(f"Watching {base_path} ({type(watcher).__name__})")
+    entries = {}
+    all_contents = scan_implementations_folder(base_path, manifest_path=manifest_path, engine=engine,
+                                               timeout=timeout, max_memory_mb=max_memory_mb, entries=entries)
+    # The size and mtime each file had when it was read, not a fresh stat:
+    # a file saved during the scan must still look changed to the first event
+    known = {relative_path: (entry['size'], entry['mtime']) for relative_path, entry in entries.items()}
+    write_outputs_atomically(all_contents, output_file, output_format, pack_path)
+    print(f"{len(all_contents)} files extracted to {output_file}; waiting for changes...")
+
+    try:
+        while True:
+            changed = watcher.wait()
+            while changed:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            if not changed:
+                continue
+            started = time.perf_counter()
+            if RESCAN in changed:
+                changed = {relative_path for _, relative_path in iter_docx_files(base_path)} | set(all_contents)
+
+            updated = []
+            for relative_path in sorted(changed):
+                file_path = os.path.join(base_path, relative_path)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    if all_contents.pop(relative_path, None) is not None:
+                        updated.append(f"- {relative_path}")
+                    known.pop(relative_path, None)
+                    entries.pop(relative_path, None)
+                    continue
+                if known.get(relative_path) == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                known[relative_path] = (stat.st_size, stat.st_mtime_ns)
+                entry = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha256': file_sha256(file_path)}
+                previous = entries.get(relative_path)
+                if previous and previous.get('sha256') == entry['sha256']:
+                    entries[relative_path] = {**previous, **entry}
+                    continue
+                ok, result = next(extract_many([file_path], 1, engine, timeout, max_memory_mb))
+                if not ok:
+                    print(f"  Quarantined {relative_path} ({result['reason']}): {result['error']}")
+                    all_contents.pop(relative_path, None)
+                    entries.pop(relative_path, None)
+                    continue
+                entry['text'], entry['stats'], _ = result
+                entries[relative_path] = entry
+                all_contents[relative_path] = entry['text']
+                updated.append(f"~ {relative_path}")
+
+            if not updated:
+                continue
+            write_outputs_atomically(all_contents, output_file, output_format, pack_path)
+            if manifest_path:
+                save_manifest(manifest_path, entries)
+            if search_index:
+                import corpus_index
+                corpus_index.update_index(corpus_index.connect(search_index), all_contents.items())
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"Updated {output_file} in {elapsed_ms:.0f} ms:")
+            for line in updated:
+                print(f"  {line}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+def parse_args(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Extract text from the implementations DOCX files.")
+    parser.add_argument('base_path', nargs='?', default=DEFAULT_BASE_PATH,
+                        help="Folder scanned for DOCX files")
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT_FILE,
+                        help="File the extracted text is written to")
+    parser.add_argument('--format', choices=['json', 'jsonl', 'interned'], default='json',
+                        help="json: one document map written at the end; "
+                             "jsonl: one line per document, written as it is extracted; "
+                             "interned: each distinct paragraph stored once (see corpus_store.py)")
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help="Number of worker processes (0 = one per CPU)")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default=DEFAULT_ENGINE,
+                        help="Text extraction engine")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="Overlap discovery, reads, parsing and writing in an asyncio pipeline "
+                             "and report each stage's utilization")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help="Seconds allowed per file before its worker is killed (0 = no limit)")
+    parser.add_argument('--max-memory', type=int, metavar='MB',
+                        help="Address-space limit per worker process, in MiB (POSIX only)")
+    parser.add_argument('--quarantine',
+                        help="Report of files that failed extraction (default: <output>.quarantine.json)")
+    parser.add_argument('--metrics',
+                        help="Base path of the metrics files, written as .json and .prom "
+                             "(default: <output>.metrics)")
+    parser.add_argument('--pack',
+                        help="Packed corpus also written for the analyzer (default: <output>.pack)")
+    parser.add_argument('--no-pack', action='store_true',
+                        help="Do not write the packed corpus")
+    parser.add_argument('--index',
+                        help="Also update this SQLite full-text index (see corpus_index.py)")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running and re-extract DOCX files as they change")
+    parser.add_argument('--poll-interval', type=float, metavar='SECONDS',
+                        help="With --watch, poll for changes instead of using inotify")
+    parser.add_argument('--manifest',
+                        help="Incremental cache manifest (default: <output>.manifest.json)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-parse every file and leave the manifest untouched")
+    args = parser.parse_args(argv)
+    # os.walk yields nothing for a missing folder, which would write an empty corpus
+    if not os.path.isdir(args.base_path):
+        parser.error(f"{args.base_path} is not a folder")
+    if args.workers == 0:
+        args.workers = os.cpu_count() or 1
+    if args.format != 'json' and args.output.endswith('.json') and not args.output.endswith('.interned.json'):
+        args.output = args.output[:-len('.json')] + ('.jsonl' if args.format == 'jsonl' else '.interned.json')
+    if not args.timeout:
+        args.timeout = None
+    if args.quarantine is None:
+        args.quarantine = os.path.splitext(args.output)[0] + '.quarantine.json'
+    if args.metrics is None:
+        args.metrics = os.path.splitext(args.output)[0] + '.metrics'
+    if args.no_pack:
+        args.pack = None
+    elif args.pack is None:
+        args.pack = os.path.splitext(args.output)[0] + '.pack'
+    if args.no_cache:
+        args.manifest = None
+    elif args.manifest is None:
+        args.manifest = os.path.splitext(args.output)[0] + '.manifest.json'
+    return args
+
+def main(argv=None, prog=None):
+    args = parse_args(argv, prog)
+
+    if (next(iter_docx_files(args.base_path), None) is None and os.path.exists(args.output)
+            and len(load_corpus(args.output))):
+        sys.exit(f"No DOCX files under {args.base_path}; "
+                         f"leaving the documents already in {args.output} as they are")
+
+    if args.watch:
+        watch_implementations_folder(args.base_path, args.output, args.format, manifest_path=args.manifest,
+                                     pack_path=args.pack, search_index=args.index, engine=args.engine,
+                                     timeout=args.timeout, max_memory_mb=args.max_memory,
+                                     poll_interval=args.poll_interval)
+        return
+
+    print("Starting extraction...")
+    stats = new_stats()
+    quarantine = []
+    metrics = ExtractionMetrics()
+    utilization = {}
+    documents = iter_extracted_documents(args.base_path, workers=args.workers,
+                                         manifest_path=args.manifest, engine=args.engine,
+                                         stats=stats, timeout=args.timeout,
+                                         max_memory_mb=args.max_memory, quarantine=quarantine,
+                                         metrics=metrics, pipeline=args.pipeline, utilization=utilization)
+    pack = PackedCorpusWriter(args.pack) if args.pack else None
+    if pack:
+        documents = pack.write_through(documents)
+
+    # Save for analysis
+    output_file = args.output
+    if args.format == 'jsonl':
+        lengths = write_jsonl(documents, output_file)
+    elif args.format == 'interned':
+        with InternedCorpusWriter(output_file) as interned:
+            lengths = {path: len(text) for path, text in interned.write_through(documents)}
+    else:
+        lengths = {path: len(text) for path, text in write_json(documents, output_file).items()}
+    if pack:
+        pack.close()
+    write_quarantine_report(quarantine, args.quarantine)
+    metrics.write_json(args.metrics + '.json')
+    metrics.write_prometheus(args.metrics + '.prom')
+
+    print(f"\nExtraction complete! Found {len(lengths)} files.")
     print(f"Results saved to: {output_file}")
+    if pack:
+        print(f"Packed corpus saved to: {args.pack}")
+    if args.index:
+        import corpus_index
+        counts = corpus_index.update_index(corpus_index.connect(args.index),
+                                           load_corpus(args.pack or output_file).items())
+        print(f"Search index updated: {args.index} "
+              f"({counts['added'] + counts['updated']} documents re-indexed, {counts['removed']} removed)")
+    print(f"Table cells read: {stats['table_cells']} "
+          f"({stats['duplicate_cells']} merged-cell duplicates skipped)")
+    if quarantine:
+        print(f"{len(quarantine)} files failed and were quarantined, see: {args.quarantine}")
+    summary = metrics.summary()
+    print(f"Parsed {summary['parsed_files']} files ({summary['cached_files']} cached) in "
+          f"{summary['elapsed_seconds']:.2f}s: {summary['files_per_s']:.1f} files/s, "
+          f"{summary['mb_per_s']:.2f} MB/s. Metrics saved to: {args.metrics}.json / .prom")
+    if utilization:
+        from extraction_pipeline import format_utilization
+        print("Pipeline stage utilization:")
+        print(format_utilization(utilization))
+    print("Slowest files:")
+    for record in metrics.slowest():
+        print(f"  - {record['path']} ({record['wall_seconds'] * 1000:.0f} ms, {record['bytes_read'] / 1024:.0f} KiB)")
 
     # Print summary
     print("\nFiles processed:")
-    for file_path in sorted(all_contents.keys()):
-        content_length = len(all_contents[file_path])
-        print(f"  - {file_path} ({content_length} chars)")
+    for file_path in sorted(lengths.keys()):
+        print(f"  - {file_path} ({lengths[file_path]} chars)")
+
+if __name__ == "__main__":
+    main()
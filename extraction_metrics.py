@@ -0,0 +1,102 @@
+import json
+import time
+
+METRIC_PREFIX = 'docx_extraction'
+
+def _label(value):
+    """Escape a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class ExtractionMetrics:
+    """Per-file timings and sizes for one extraction run.
+
+    Each record holds the relative path, status ('parsed', 'cached' or
+    'failed'), wall_seconds, parse_seconds, bytes_read, paragraphs,
+    table_cells and output_chars. Throughput counts parsed files only.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.files = []
+        self.parsed_files = 0
+        self.parsed_bytes = 0
+
+    def record(self, relative_path, status, timings=None, stats=None, output_chars=0):
+        timings = timings or {}
+        stats = stats or {}
+        record = {
+            'path': relative_path,
+            'status': status,
+            'wall_seconds': timings.get('wall_seconds', 0.0),
+            'parse_seconds': timings.get('parse_seconds', 0.0),
+            'bytes_read': timings.get('bytes_read', 0),
+            'paragraphs': stats.get('paragraphs', 0),
+            'table_cells': stats.get('table_cells', 0),
+            'output_chars': output_chars,
+        }
+        self.files.append(record)
+        if status == 'parsed':
+            self.parsed_files += 1
+            self.parsed_bytes += record['bytes_read']
+        return record
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def throughput(self):
+        """Return (files/s, MB/s) of parsed files since the run started."""
+        elapsed = self.elapsed() or 1e-9
+        return self.parsed_files / elapsed, self.parsed_bytes / elapsed / 1e6
+
+    def progress_line(self, record):
+        files_per_s, mb_per_s = self.throughput()
+        return (f"  {record['output_chars']} chars, {record['bytes_read'] / 1024:.0f} KiB in "
+                f"{record['wall_seconds'] * 1000:.0f} ms ({files_per_s:.1f} files/s, {mb_per_s:.2f} MB/s)")
+
+    def slowest(self, count=5):
+        return sorted(self.files, key=lambda record: record['wall_seconds'], reverse=True)[:count]
+
+    def summary(self):
+        files_per_s, mb_per_s = self.throughput()
+        totals = {'elapsed_seconds': self.elapsed(), 'files_per_s': files_per_s, 'mb_per_s': mb_per_s}
+        for status in ('parsed', 'cached', 'failed'):
+            totals[f'{status}_files'] = sum(1 for record in self.files if record['status'] == status)
+        for key in ('wall_seconds', 'parse_seconds', 'bytes_read', 'paragraphs', 'table_cells', 'output_chars'):
+            totals[key] = sum(record[key] for record in self.files)
+        return totals
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'summary': self.summary(), 'files': self.files}, f, ensure_ascii=False, indent=2)
+
+    def write_prometheus(self, path):
+        """Write the run in the Prometheus text exposition format."""
+        summary = self.summary()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {METRIC_PREFIX}_{name} {help_text}')
+            lines.append(f'# TYPE {METRIC_PREFIX}_{name} {kind}')
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_label(str(val))}"' for key, val in labels.items())
+                lines.append(f'{METRIC_PREFIX}_{name}{{{label_text}}} {value}' if label_text
+                             else f'{METRIC_PREFIX}_{name} {value}')
+
+        metric('files', 'gauge', 'Files seen in the last run, by status.',
+               [({'status': status}, summary[f'{status}_files']) for status in ('parsed', 'cached', 'failed')])
+        metric('elapsed_seconds', 'gauge', 'Wall-clock duration of the last run.', [({}, summary['elapsed_seconds'])])
+        metric('files_per_second', 'gauge', 'Parsed files per second.', [({}, summary['files_per_s'])])
+        metric('megabytes_per_second', 'gauge', 'Parsed DOCX megabytes per second.', [({}, summary['mb_per_s'])])
+        for key, help_text in (
+            ('wall_seconds', 'Wall-clock time spent on the file.'),
+            ('parse_seconds', 'Time spent parsing the file.'),
+            ('bytes_read', 'Bytes of DOCX read.'),
+            ('paragraphs', 'Body paragraphs read.'),
+            ('table_cells', 'Table cells read.'),
+            ('output_chars', 'Characters of extracted text.'),
+        ):
+            metric(f'file_{key}', 'gauge', help_text,
+                   [({'path': record['path'], 'status': record['status']}, record[key]) for record in self.files])
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
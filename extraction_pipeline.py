@@ -0,0 +1,256 @@
+import asyncio
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from supervised_pool import _Slot, _wait_for_outcome
+
+_DONE = object()
+STAGES = ('discover', 'read', 'parse', 'write')
+
+class StageTimer:
+    """Busy and waiting time of one pipeline stage, summed over its tasks."""
+
+    def __init__(self, name, tasks=1):
+        self.name = name
+        self.tasks = tasks
+        self.items = 0
+        self.busy = 0.0
+        self.waiting_input = 0.0
+        self.waiting_output = 0.0
+
+    async def get(self, source):
+        start = time.perf_counter()
+        item = await source.get()
+        self.waiting_input += time.perf_counter() - start
+        return item
+
+    async def put(self, sink, item):
+        start = time.perf_counter()
+        await sink.put(item)
+        self.waiting_output += time.perf_counter() - start
+
+    def report(self, elapsed):
+        capacity = elapsed * self.tasks or 1e-9
+        return {
+            'tasks': self.tasks,
+            'items': self.items,
+            'busy_seconds': self.busy,
+            'waiting_input_seconds': self.waiting_input,
+            'waiting_output_seconds': self.waiting_output,
+            'utilization': self.busy / capacity,
+        }
+
+def _read_file(file_path):
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+class _Pipeline:
+    """discover -> read -> parse -> write, connected by bounded asyncio queues.
+
+    Discovery (os.walk, stat, manifest hashing) and file reads run in
+    threads, each parse task has its own worker process, and the write stage
+    hands results, in discovery order, to the consuming thread. As in
+    supervised_map, a file that crashes or hangs its worker only takes that
+    worker down: it is replaced and the other files carry on. A window
+    semaphore caps the files in flight between discovery and hand-off, so
+    memory stays bounded even when one slow file holds up the reorder buffer.
+    """
+
+    def __init__(self, planned, parse, engine, workers, timeout, max_memory_mb, out, queue_size):
+        self.planned = planned
+        self.parse = parse
+        self.engine = engine
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.max_memory_mb = max_memory_mb
+        self.out = out
+        self.queue_size = queue_size
+        self.loop = None
+        self.task = None
+        self.timers = {name: StageTimer(name) for name in STAGES}
+        self.timers['parse'].tasks = self.workers
+        self.context = multiprocessing.get_context()
+        self.slots = []
+        self.waiters = None
+
+    def _new_slot(self):
+        return _Slot(self.context, self.parse, self.max_memory_mb)
+
+    def _kill_slots(self):
+        for slot in self.slots:
+            slot.kill()
+        self.waiters.shutdown(wait=False)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        to_read = asyncio.Queue(self.queue_size)
+        to_parse = asyncio.Queue(self.queue_size)
+        to_write = asyncio.Queue(self.queue_size)
+        window = asyncio.Semaphore(self.queue_size * 2 + self.workers)
+        self.loop = loop
+        self.task = asyncio.current_task()
+        # One thread per parse task blocks on its worker's pipe
+        self.waiters = ThreadPoolExecutor(self.workers, thread_name_prefix='parse-wait')
+        self.slots = [self._new_slot() for _ in range(self.workers)]
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(
+                self._discover(loop, to_read, window),
+                self._read(to_read, to_parse, to_write),
+                *(self._parse(loop, to_parse, to_write, position) for position in range(self.workers)),
+                self._write(loop, to_write, window),
+            )
+        except BaseException:
+            self._kill_slots()
+            raise
+        for slot in self.slots:
+            slot.stop()
+        self.waiters.shutdown()
+        return time.perf_counter() - start
+
+    async def _discover(self, loop, to_read, window):
+        timer = self.timers['discover']
+        planned = iter(self.planned)
+        index = 0
+        while True:
+            await window.acquire()
+            started = time.perf_counter()
+            item = await loop.run_in_executor(None, next, planned, None)
+            timer.busy += time.perf_counter() - started
+            if item is None:
+                window.release()
+                break
+            timer.items += 1
+            await timer.put(to_read, (index,) + item)
+            index += 1
+        await to_read.put(_DONE)
+
+    async def _read(self, to_read, to_parse, to_write):
+        timer = self.timers['read']
+        while (item := await timer.get(to_read)) is not _DONE:
+            index, file_path, relative_path, entry = item
+            if 'text' in entry:
+                await timer.put(to_write, (index, relative_path, entry, None))
+                continue
+            started = time.perf_counter()
+            data = await asyncio.to_thread(_read_file, file_path)
+            timer.busy += time.perf_counter() - started
+            timer.items += 1
+            await timer.put(to_parse, (index, relative_path, entry, data, started))
+        for _ in range(self.workers):
+            await to_parse.put(_DONE)
+
+    async def _parse_once(self, loop, position, index, data):
+        slot = self.slots[position]
+        slot.start((index, (data, self.engine)), self.timeout)
+        outcome = await loop.run_in_executor(self.waiters, _wait_for_outcome, slot, self.timeout)
+        if not outcome[0] and outcome[1] in ('crash', 'timeout'):
+            slot.kill()
+            self.slots[position] = self._new_slot()
+        return outcome
+
+    async def _parse(self, loop, to_parse, to_write, position):
+        timer = self.timers['parse']
+        while (item := await timer.get(to_parse)) is not _DONE:
+            index, relative_path, entry, data, read_started = item
+            started = time.perf_counter()
+            for attempt in (1, 2):
+                outcome = await self._parse_once(loop, position, index, data)
+                if outcome[0]:
+                    text, stats, parse_seconds = outcome[1]
+                    timings = {'bytes_read': len(data), 'parse_seconds': parse_seconds,
+                               'wall_seconds': time.perf_counter() - read_started}
+                    outcome = (True, (text, stats, timings))
+                    break
+            else:
+                outcome = (False, {'reason': outcome[1], 'error': outcome[2], 'attempts': attempt})
+            timer.busy += time.perf_counter() - started
+            timer.items += 1
+            await timer.put(to_write, (index, relative_path, entry, outcome))
+        await to_write.put(_DONE)
+
+    async def _write(self, loop, to_write, window):
+        timer = self.timers['write']
+        # Cached files reach this queue before the read stage releases the
+        # parse tasks, so the last parse task's _DONE ends the stream.
+        remaining = self.workers
+        buffered = {}
+        next_index = 0
+        while remaining:
+            item = await timer.get(to_write)
+            if item is _DONE:
+                remaining -= 1
+                continue
+            buffered[item[0]] = item[1:]
+            while next_index in buffered:
+                started = time.perf_counter()
+                await loop.run_in_executor(None, self.out.put, buffered.pop(next_index))
+                timer.waiting_output += time.perf_counter() - started
+                timer.items += 1
+                window.release()
+                next_index += 1
+
+def iter_pipeline(planned, parse, engine, workers=1, timeout=None, max_memory_mb=None,
+                  utilization=None, queue_size=8):
+    """Yield (relative_path, entry, outcome) for each planned file, in discovery order.
+
+    planned yields (file_path, relative_path, entry) as extract_docx's
+    _plan_files does; outcome is None when entry already holds cached text,
+    else (True, (text, stats, timings)) or (False, failure) after one retry.
+    parse(data, engine) must return (text, stats, parse_seconds).
+
+    The write stage's busy time is the time the consumer of this generator
+    spends before asking for the next document. When a utilization dict is
+    given it receives each stage's report (see StageTimer.report) once the
+    pipeline finishes.
+    """
+    out = queue.Queue(maxsize=queue_size)
+    pipeline = _Pipeline(planned, parse, engine, workers, timeout, max_memory_mb, out, queue_size)
+    result = {}
+
+    def run():
+        try:
+            result['elapsed'] = asyncio.run(pipeline.run())
+        except BaseException as e:
+            result['error'] = e
+        finally:
+            out.put(_DONE)
+
+    thread = threading.Thread(target=run, name='extraction-pipeline', daemon=True)
+    thread.start()
+    write_timer = pipeline.timers['write']
+    try:
+        while (item := out.get()) is not _DONE:
+            started = time.perf_counter()
+            yield item
+            write_timer.busy += time.perf_counter() - started
+    finally:
+        if thread.is_alive() and pipeline.task is not None:
+            # The consumer stopped early: cancel the stages and drain the hand-off
+            pipeline.loop.call_soon_threadsafe(pipeline.task.cancel)
+        while thread.is_alive():
+            try:
+                out.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        thread.join()
+
+    if 'error' in result and not isinstance(result['error'], asyncio.CancelledError):
+        raise result['error']
+    if utilization is not None and 'elapsed' in result:
+        utilization.update({name: timer.report(result['elapsed']) for name, timer in pipeline.timers.items()})
+
+def format_utilization(utilization):
+    """Render a stage report as a table, marking the most utilized stage."""
+    bottleneck = max(utilization, key=lambda name: utilization[name]['utilization'])
+    lines = [f"{'stage':10} {'tasks':>5} {'items':>6} {'busy s':>8} {'wait in s':>10} {'wait out s':>11} {'util':>6}"]
+    for name, stage in utilization.items():
+        lines.append(
+            f"{name:10} {stage['tasks']:5d} {stage['items']:6d} {stage['busy_seconds']:8.2f} "
+            f"{stage['waiting_input_seconds']:10.2f} {stage['waiting_output_seconds']:11.2f} "
+            f"{stage['utilization']:5.0%}{'  <- bottleneck' if name == bottleneck else ''}"
+        )
+    return '\n'.join(lines)
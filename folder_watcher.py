@@ -0,0 +1,149 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+from corpus_store import document_key
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+# Returned instead of file names when the tree must be re-listed
+RESCAN = None
+
+def is_watched_file(name):
+    """Same filter as extract_docx.iter_docx_files: DOCX files, no ~$ lock files."""
+    return name.endswith('.docx') and not name.startswith('~')
+
+class PollingWatcher:
+    """Detect changed DOCX files by comparing size and mtime snapshots."""
+
+    def __init__(self, base_path, interval=0.5):
+        self.base_path = base_path
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self):
+        snapshot = {}
+        for root, dirs, files in os.walk(self.base_path):
+            for file in files:
+                if is_watched_file(file):
+                    file_path = os.path.join(root, file)
+                    try:
+                        stat = os.stat(file_path)
+                    except FileNotFoundError:
+                        continue
+                    relative_path = document_key(os.path.relpath(file_path, self.base_path))
+                    snapshot[relative_path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout=None):
+        """Block until files change (or timeout) and return their relative paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._snapshot()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+class InotifyWatcher:
+    """Recursive inotify watch on a folder (Linux only)."""
+
+    def __init__(self, base_path):
+        self.base_path = base_path
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        for root, dirs, files in os.walk(base_path):
+            self._add_watch(root)
+
+    def _add_watch(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.watches[wd] = directory
+
+    def _read_events(self):
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            yield wd, mask, name
+
+    def wait(self, timeout=None):
+        """Block until files change (or timeout) and return their relative paths.
+
+        The result contains RESCAN when a directory was added, moved or
+        removed or the kernel queue overflowed; the caller should then
+        compare the whole tree against what it knows.
+        """
+        changed = set()
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return changed
+        for wd, mask, name in self._read_events():
+            if mask & IN_Q_OVERFLOW:
+                changed.add(RESCAN)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.watches[wd]
+                continue
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    for root, dirs, files in os.walk(os.path.join(directory, name)):
+                        self._add_watch(root)
+                changed.add(RESCAN)
+            elif mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                changed.add(RESCAN)
+            elif is_watched_file(name):
+                changed.add(document_key(os.path.relpath(os.path.join(directory, name), self.base_path)))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+def open_watcher(base_path, poll_interval=None):
+    """Return an inotify watcher where available, else a polling one.
+
+    Passing poll_interval forces polling.
+    """
+    if poll_interval is None and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(base_path)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(base_path, poll_interval or 0.5)
@@ -0,0 +1,99 @@
+import argparse
+import os
+import random
+
+from docx import Document
+from docx.exceptions import InvalidSpanError
+
+# Vocabulary for PRD / user-story shaped documents, in the corpus' language
+ROLES = ['gestionnaire de stock', 'commercial', 'client', 'comptable', 'administrateur', 'responsable atelier']
+ACTIONS = ['ajouter', 'rechercher', 'modifier', 'archiver', 'exporter', 'valider', 'importer', 'planifier']
+OBJECTS = ['un véhicule', 'une facture', 'un devis', 'un client', 'une commande', 'un rendez-vous', 'une pièce']
+GOALS = ["maintenir l'inventaire à jour", 'gagner du temps', 'réduire les erreurs de saisie',
+         'suivre le chiffre d\'affaires', 'améliorer la satisfaction client']
+FIELDS = ['VIN', 'marque', 'modèle', 'année', 'prix', 'statut', 'email', 'téléphone', 'montant', 'date']
+TYPES = ['String', 'Int', 'Decimal', 'DateTime', 'Boolean', 'Enum']
+
+def _sentence(rng):
+    return (f"En tant que {rng.choice(ROLES)} Je veux pouvoir {rng.choice(ACTIONS)} {rng.choice(OBJECTS)} "
+            f"Afin de {rng.choice(GOALS)}")
+
+def _criterion(rng):
+    return (f"Le champ {rng.choice(FIELDS)} est obligatoire et de type {rng.choice(TYPES)} "
+            f"({rng.randint(1, 500)} caractères max)")
+
+def _fill_table(table, rng, merged, depth):
+    for row in table.rows:
+        for cell in row.cells:
+            cell.text = f"{rng.choice(FIELDS)}: {rng.choice(TYPES)}"
+    rows, cols = len(table.rows), len(table.columns)
+    for _ in range(merged):
+        if rows < 2 and cols < 2:
+            break
+        row, col = rng.randrange(rows), rng.randrange(cols)
+        if cols > 1 and (rows < 2 or rng.random() < 0.5):
+            end = table.cell(row, min(cols - 1, col + 1)) if col + 1 < cols else table.cell(row, col - 1)
+        else:
+            end = table.cell(min(rows - 1, row + 1), col) if row + 1 < rows else table.cell(row - 1, col)
+        try:
+            table.cell(row, col).merge(end)
+        except (InvalidSpanError, ValueError):
+            # Overlapping an earlier merge: a non-rectangular span, or a cell
+            # python-docx no longer finds ("no `tc` element at grid_offset=...").
+            # Both are raised while sizing the span, before the table changes.
+            continue
+    if depth > 0:
+        nested = table.cell(rng.randrange(rows), rng.randrange(cols)).add_table(2, 2)
+        _fill_table(nested, rng, 0, depth - 1)
+
+def generate_document(file_path, rng, paragraphs=20, tables=1, rows=5, cols=4, merged=2, nesting=0):
+    """Write one synthetic user-story document."""
+    document = Document()
+    document.add_heading(f"US-{rng.randint(1, 999):03d}: {rng.choice(ACTIONS).capitalize()} {rng.choice(OBJECTS)}", 1)
+    document.add_paragraph(_sentence(rng))
+    document.add_paragraph("Critères d'Acceptation:")
+    table_positions = set(rng.sample(range(paragraphs), min(tables, paragraphs)))
+    for position in range(paragraphs):
+        document.add_paragraph(_criterion(rng))
+        if position in table_positions:
+            table = document.add_table(rows=rows, cols=cols)
+            _fill_table(table, rng, merged, nesting)
+    document.add_paragraph(f"Priorité: P{rng.randint(0, 3)} Estimation: {rng.choice([1, 2, 3, 5, 8, 13])} points")
+    document.save(file_path)
+
+def generate_corpus(output_dir, modules=10, stories=10, seed=0, **document_options):
+    """Write `modules` PRD folders of one PRD.docx and `stories` US-*.docx each.
+
+    The same seed and options always produce the same text. Returns the
+    number of files written.
+    """
+    rng = random.Random(seed)
+    count = 0
+    for module in range(modules):
+        folder = os.path.join(output_dir, f'PRD-{module:02d}-Module')
+        os.makedirs(folder, exist_ok=True)
+        generate_document(os.path.join(folder, 'PRD.docx'), rng, **document_options)
+        count += 1
+        for story in range(stories):
+            generate_document(os.path.join(folder, f'US-{story:03d}-Story.docx'), rng, **document_options)
+            count += 1
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic PRD/US DOCX corpus for benchmarks.")
+    parser.add_argument('output_dir')
+    parser.add_argument('--modules', type=int, default=10, help="PRD folders to create")
+    parser.add_argument('--stories', type=int, default=10, help="User-story documents per folder")
+    parser.add_argument('--paragraphs', type=int, default=20, help="Body paragraphs per document")
+    parser.add_argument('--tables', type=int, default=1, help="Tables per document")
+    parser.add_argument('--rows', type=int, default=5)
+    parser.add_argument('--cols', type=int, default=4)
+    parser.add_argument('--merged', type=int, default=2, help="Merge attempts per table")
+    parser.add_argument('--nesting', type=int, default=0, help="Depth of tables nested in a cell")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    count = generate_corpus(args.output_dir, args.modules, args.stories, args.seed,
+                            paragraphs=args.paragraphs, tables=args.tables, rows=args.rows, cols=args.cols,
+                            merged=args.merged, nesting=args.nesting)
+    print(f"Wrote {count} DOCX files to {args.output_dir}")
@@ -0,0 +1,37 @@
+import argparse
+import json
+import sys
+
+from corpus_store import DEFAULT_JSON_CORPUS
+
+def read_jsonl(jsonl_path):
+    """Yield (path, text) pairs from an extract_docx.py --format jsonl file.
+
+    A truncated last line, left by a run that crashed mid-write, is skipped.
+    """
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                print(f"Skipping unreadable line {line_number} of {jsonl_path}", file=sys.stderr)
+                continue
+            yield record['path'], record['text']
+
+def jsonl_to_json(jsonl_path, json_path):
+    """Convert a JSONL extraction file to the implementations_extracted.json layout."""
+    all_contents = dict(read_jsonl(jsonl_path))
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(all_contents, f, ensure_ascii=False, indent=2)
+    return all_contents
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert JSONL extraction output to implementations_extracted.json.")
+    parser.add_argument('jsonl_path')
+    parser.add_argument('json_path', nargs='?', default=DEFAULT_JSON_CORPUS)
+    args = parser.parse_args()
+
+    all_contents = jsonl_to_json(args.jsonl_path, args.json_path)
+    print(f"Wrote {len(all_contents)} documents to {args.json_path}")
@@ -0,0 +1,202 @@
+import argparse
+import re
+import time
+import unicodedata
+from collections import Counter, deque
+
+from corpus_store import InternedCorpus, find_corpus, load_corpus
+
+class _FoldTable(dict):
+    """str.translate table: lowercase and drop accents, one character for one.
+
+    Keeping lengths equal means offsets in folded text are offsets in the
+    original. Characters whose folded form is longer (like 'İ') are kept.
+    """
+
+    def __missing__(self, code):
+        char = chr(code)
+        base = unicodedata.normalize('NFD', char)[0].lower()
+        value = self[code] = base if len(base) == 1 else char
+        return value
+
+FOLD_TABLE = _FoldTable()
+
+def fold(text):
+    """'Entité' -> 'entite': case and accent folding that keeps offsets."""
+    return text.translate(FOLD_TABLE)
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over folded keywords.
+
+    Finds every keyword in one pass over a text, whatever the number of
+    keywords: the goto and failure links are compiled into a transition
+    dict per state. Keywords that fold to the same string ('entité',
+    'entite') are one pattern, reported under the first spelling given.
+    With whole_words, only matches not surrounded by letters or digits count.
+    With case_sensitive, keywords and text are matched as written.
+    """
+
+    def __init__(self, keywords, whole_words=True, case_sensitive=False):
+        self.whole_words = whole_words
+        self._fold = str if case_sensitive else fold
+        self.keywords = []
+        index = {}
+        for keyword in keywords:
+            folded = self._fold(keyword)
+            if folded and folded not in index:
+                index[folded] = len(self.keywords)
+                self.keywords.append(keyword)
+
+        # Trie
+        transitions = [{}]
+        outputs = [[]]
+        for folded, keyword_id in index.items():
+            state = 0
+            for char in folded:
+                if char not in transitions[state]:
+                    transitions[state][char] = len(transitions)
+                    transitions.append({})
+                    outputs.append([])
+                state = transitions[state][char]
+            outputs[state].append((keyword_id, len(folded)))
+
+        # Failure links, breadth first, folded into complete transition rows
+        failure = [0] * len(transitions)
+        queue = deque(transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] += outputs[failure[state]]
+            # The fallback state is shallower, so its row is already complete
+            fallback = transitions[failure[state]]
+            for char, target in transitions[state].items():
+                queue.append(target)
+                failure[target] = fallback.get(char, 0)
+            # Inherit the fallback state's moves for characters this state lacks
+            transitions[state] = {**fallback, **transitions[state]}
+        self._transitions = transitions
+        self._outputs = [tuple(output) for output in outputs]
+
+    def iter_matches(self, text):
+        """Yield (keyword, start, end) for every keyword occurrence, in end order."""
+        folded = self._fold(text)
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        for position, char in enumerate(folded):
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                end = position + 1
+                for keyword_id, length in outputs[state]:
+                    start = end - length
+                    if self.whole_words and (
+                        (start > 0 and folded[start - 1].isalnum()) or (end < len(folded) and folded[end].isalnum())
+                    ):
+                        continue
+                    yield self.keywords[keyword_id], start, end
+
+    def count(self, text):
+        """Return a Counter of keyword hits in text."""
+        return Counter(keyword for keyword, _, _ in self.iter_matches(text))
+
+def count_corpus_keywords(corpus, matcher):
+    """Return {relative_path: Counter} of keyword hits per document.
+
+    An interned corpus is counted one distinct paragraph at a time, each
+    paragraph once; paragraph boundaries are newlines, so whole-word
+    matches never span them and the counts are the same.
+    """
+    if not isinstance(corpus, InternedCorpus):
+        return {relative_path: matcher.count(text) for relative_path, text in corpus.items()}
+    paragraph_counts = {}
+    counts = {}
+    for relative_path in corpus:
+        total = Counter()
+        for paragraph_id in corpus.paragraph_ids(relative_path):
+            found = paragraph_counts.get(paragraph_id)
+            if found is None:
+                found = paragraph_counts[paragraph_id] = matcher.count(corpus.paragraphs[paragraph_id])
+            total.update(found)
+        counts[relative_path] = total
+    return counts
+
+def naive_count(text, keywords, whole_words=True):
+    """Reference implementation: one regex scan of the folded text per keyword."""
+    folded = fold(text)
+    counts = Counter()
+    seen = set()
+    for keyword in keywords:
+        pattern = fold(keyword)
+        if not pattern or pattern in seen:
+            continue
+        seen.add(pattern)
+        if whole_words:  # a whole-word match cannot overlap another of the same keyword
+            hits = len(re.findall(rf'(?<![^\W_]){re.escape(pattern)}(?![^\W_])', folded))
+        else:
+            hits = len(re.findall(f'(?=({re.escape(pattern)}))', folded))
+        if hits:
+            counts[keyword] = hits
+    return counts
+
+def benchmark(documents, keyword_sets, repeat=3):
+    """Time the automaton against naive_count for each keyword set; returns result dicts."""
+    texts = [text for _, text in documents]
+    results = []
+    for name, keywords in keyword_sets:
+        matcher = KeywordMatcher(keywords)
+        timings = {}
+        for label, count in (('naive', lambda text: naive_count(text, keywords)),
+                             ('aho-corasick', matcher.count)):
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                counts = [count(text) for text in texts]
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[label] = (best, counts)
+        results.append({
+            'keywords': name,
+            'keyword_count': len(matcher.keywords),
+            'naive_seconds': timings['naive'][0],
+            'aho_corasick_seconds': timings['aho-corasick'][0],
+            'same_counts': timings['naive'][1] == timings['aho-corasick'][1],
+        })
+    return results
+
+def format_benchmark(results, document_count, chars):
+    lines = [f"{document_count} documents, {chars} characters",
+             f"{'keywords':26} {'count':>6} {'naive s':>9} {'aho-corasick s':>15} {'speedup':>8} {'same':>5}"]
+    for result in results:
+        lines.append(f"{result['keywords']:26} {result['keyword_count']:6d} {result['naive_seconds']:9.3f} "
+                     f"{result['aho_corasick_seconds']:15.3f} "
+                     f"{result['naive_seconds'] / result['aho_corasick_seconds']:7.2f}x "
+                     f"{'yes' if result['same_counts'] else 'NO':>5}")
+    return '\n'.join(lines)
+
+if __name__ == "__main__":
+    from analyze_database_schema import FIELD_INDICATORS, TABLE_KEYWORDS, analyze_all_documents
+
+    parser = argparse.ArgumentParser(description="Count table keywords and field indicators per document.")
+    parser.add_argument('corpus', nargs='?', help="Extracted corpus (default: packed corpus or JSON)")
+    parser.add_argument('--top', type=int, default=5, help="Keywords shown per document")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Compare with one regex scan per keyword, for growing keyword sets")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus or find_corpus())
+    keywords = TABLE_KEYWORDS + FIELD_INDICATORS
+    if args.benchmark:
+        schema = analyze_all_documents()
+        field_names = sorted({field for model in schema.values() for field in model['fields']})
+        keyword_sets = [
+            ('table + field keywords', keywords),
+            ('+ schema model names', keywords + sorted(schema)),
+            ('+ schema field names', keywords + sorted(schema) + field_names),
+        ]
+        documents = list(corpus.items())
+        results = benchmark(documents, keyword_sets)
+        print(format_benchmark(results, len(documents), sum(len(text) for _, text in documents)))
+    else:
+        matcher = KeywordMatcher(keywords)
+        for relative_path, counts in count_corpus_keywords(corpus, matcher).items():
+            top = ', '.join(f'{keyword} {hits}' for keyword, hits in counts.most_common(args.top))
+            print(f"{relative_path}: {sum(counts.values())} hits ({top})")
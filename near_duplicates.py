@@ -0,0 +1,205 @@
+import argparse
+import json
+import re
+import zlib
+
+import numpy as np
+
+from corpus_store import find_corpus, load_corpus
+
+DEFAULT_SHINGLE_WORDS = 5
+DEFAULT_PERMUTATIONS = 128
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+# Columns of the (permutations x shingles) hash matrix computed at once
+BATCH_SHINGLES = 1 << 16
+
+WORD_PATTERN = re.compile(r'\w+')
+
+class _TokenHashes(dict):
+    """crc32 of each distinct word, computed once per run."""
+
+    def __missing__(self, word):
+        value = self[word] = zlib.crc32(word.encode('utf-8'))
+        return value
+
+def shingle_hashes(text, tokens, k=DEFAULT_SHINGLE_WORDS):
+    """Distinct 32-bit hashes of the k-word shingles of text, as a uint64 array."""
+    words = np.fromiter((tokens[word] for word in WORD_PATTERN.findall(text.lower())), dtype=np.uint64)
+    if len(words) == 0:
+        return words
+    k = min(k, len(words))
+    # Polynomial rolling combination of the k token hashes; uint64 wraps around
+    combined = np.zeros(len(words) - k + 1, dtype=np.uint64)
+    for offset in range(k):
+        combined = combined * np.uint64(1000003) + words[offset:len(words) - k + 1 + offset]
+    return np.unique((combined ^ (combined >> np.uint64(32))) & np.uint64(0xFFFFFFFF))
+
+class MinHasher:
+    """MinHash signatures under `permutations` hash functions splitmix64(x ^ seed).
+
+    Each permutation XORs the 32-bit shingle hashes with its own random
+    64-bit seed and runs them through the splitmix64 finalizer, a bijection
+    whose output bits all depend on every input bit; uint64 products wrap
+    around as the mixer expects.
+    """
+
+    def __init__(self, permutations=DEFAULT_PERMUTATIONS, seed=1):
+        rng = np.random.default_rng(seed)
+        self.seeds = rng.integers(0, np.iinfo(np.uint64).max, size=(permutations, 1), dtype=np.uint64,
+                                  endpoint=True)
+        self.permutations = permutations
+
+    def _min_hashes(self, shingles):
+        hashed = shingles[np.newaxis, :] ^ self.seeds
+        hashed += np.uint64(0x9E3779B97F4A7C15)
+        hashed ^= hashed >> np.uint64(30)
+        hashed *= np.uint64(0xBF58476D1CE4E5B9)
+        hashed ^= hashed >> np.uint64(27)
+        hashed *= np.uint64(0x94D049BB133111EB)
+        hashed ^= hashed >> np.uint64(31)
+        return hashed
+
+    def signatures(self, shingle_sets):
+        """Return a (documents x permutations) uint64 signature matrix.
+
+        Documents are hashed in batches of about BATCH_SHINGLES shingles:
+        the seed XOR and splitmix64 mixer run element-wise over one
+        (permutations x shingles) array per batch, then np.minimum.reduceat
+        takes each document's minima.
+        Documents without shingles get an all-max signature.
+        """
+        signatures = np.full((len(shingle_sets), self.permutations), np.iinfo(np.uint64).max, dtype=np.uint64)
+        start = 0
+        while start < len(shingle_sets):
+            end, size = start, 0
+            while end < len(shingle_sets) and (end == start or size + len(shingle_sets[end]) <= BATCH_SHINGLES):
+                size += len(shingle_sets[end])
+                end += 1
+            batch = [(position, shingles) for position, shingles in enumerate(shingle_sets[start:end], start)
+                     if len(shingles)]
+            if batch and size <= BATCH_SHINGLES:
+                lengths = np.array([len(shingles) for _, shingles in batch])
+                offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+                hashed = self._min_hashes(np.concatenate([shingles for _, shingles in batch]))
+                signatures[[position for position, _ in batch]] = np.minimum.reduceat(hashed, offsets, axis=1).T
+            elif batch:  # one document larger than a batch: running minimum over column chunks
+                position, shingles = batch[0]
+                for chunk in range(0, len(shingles), BATCH_SHINGLES):
+                    hashed = self._min_hashes(shingles[chunk:chunk + BATCH_SHINGLES])
+                    signatures[position] = np.minimum(signatures[position], hashed.min(axis=1))
+            start = end
+        return signatures
+
+def _find(parents, node):
+    while parents[node] != node:
+        parents[node] = parents[parents[node]]
+        node = parents[node]
+    return node
+
+def lsh_clusters(signatures, bands=DEFAULT_BANDS, threshold=DEFAULT_THRESHOLD, valid=None):
+    """Group documents whose estimated Jaccard similarity reaches threshold.
+
+    Signatures are cut into `bands` bands; documents whose band hashes
+    collide are candidates. Each bucket is checked against its first member
+    only, and matches are merged with union-find, so the work grows with
+    documents x bands rather than with the number of pairs. Returns lists
+    of row indexes, each with two or more members.
+    """
+    documents, permutations = signatures.shape
+    rows = permutations // bands
+    valid = np.ones(documents, dtype=bool) if valid is None else valid
+    parents = list(range(documents))
+    band_weights = np.random.default_rng(0).integers(1, 1 << 63, size=rows, dtype=np.uint64) | np.uint64(1)
+    candidates = np.flatnonzero(valid)
+
+    for band in range(bands):
+        block = signatures[candidates, band * rows:(band + 1) * rows]
+        keys = (block * band_weights).sum(axis=1, dtype=np.uint64)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+        ends = np.concatenate((starts[1:], [len(order)]))
+        for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+            members = candidates[order[start:end]]
+            representative = members[0]
+            agreement = (signatures[members[1:]] == signatures[representative]).mean(axis=1)
+            root = _find(parents, representative)
+            for member in members[1:][agreement >= threshold]:
+                parents[_find(parents, member)] = root
+
+    groups = {}
+    for document in candidates:
+        groups.setdefault(_find(parents, document), []).append(int(document))
+    return [members for members in groups.values() if len(members) > 1]
+
+def jaccard(a, b):
+    """Exact Jaccard similarity of two sorted, distinct shingle arrays."""
+    union = len(np.union1d(a, b))
+    return len(np.intersect1d(a, b, assume_unique=True)) / union if union else 1.0
+
+def find_near_duplicates(documents, threshold=DEFAULT_THRESHOLD, permutations=DEFAULT_PERMUTATIONS,
+                         bands=DEFAULT_BANDS, shingle_words=DEFAULT_SHINGLE_WORDS):
+    """Cluster (relative_path, text) pairs that are near-copies of each other.
+
+    Returns a list of clusters, largest first. Each cluster is
+    {'representative', 'min_similarity', 'members': [{'path', 'similarity',
+    'estimated_similarity'}]}, similarities being to the representative (the
+    member that comes first in the corpus): exact shingle Jaccard, and the
+    MinHash estimate that put it in the cluster.
+    """
+    tokens = _TokenHashes()
+    paths, shingle_sets = [], []
+    for relative_path, text in documents:
+        paths.append(relative_path)
+        shingle_sets.append(shingle_hashes(text, tokens, shingle_words))
+    signatures = MinHasher(permutations).signatures(shingle_sets)
+    valid = np.array([len(shingles) > 0 for shingles in shingle_sets], dtype=bool)
+
+    clusters = []
+    for members in lsh_clusters(signatures, bands, threshold, valid):
+        members.sort()
+        representative = members[0]
+        estimated = (signatures[members] == signatures[representative]).mean(axis=1)
+        entries = [{
+            'path': paths[member],
+            'similarity': round(jaccard(shingle_sets[member], shingle_sets[representative]), 4),
+            'estimated_similarity': round(float(estimate), 4),
+        } for member, estimate in zip(members, estimated)]
+        clusters.append({
+            'representative': paths[representative],
+            'min_similarity': min(entry['similarity'] for entry in entries[1:]),
+            'members': entries,
+        })
+    clusters.sort(key=lambda cluster: (-len(cluster['members']), cluster['representative']))
+    return clusters
+
+def format_clusters(clusters, document_count):
+    duplicates = sum(len(cluster['members']) - 1 for cluster in clusters)
+    lines = [f"{len(clusters)} near-duplicate clusters; {duplicates} of {document_count} documents "
+             f"are near-copies of another"]
+    for cluster in clusters:
+        lines.append(f"\n{cluster['representative']} ({len(cluster['members'])} documents, "
+                     f"min similarity {cluster['min_similarity']:.2f})")
+        for entry in cluster['members'][1:]:
+            lines.append(f"  {entry['similarity']:.2f}  {entry['path']}")
+    return '\n'.join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find near-duplicate documents in the extracted corpus.")
+    parser.add_argument('corpus', nargs='?', help="Extracted corpus (default: packed corpus or JSON)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Minimum estimated Jaccard similarity of word shingles")
+    parser.add_argument('--permutations', type=int, default=DEFAULT_PERMUTATIONS)
+    parser.add_argument('--bands', type=int, default=DEFAULT_BANDS)
+    parser.add_argument('--shingle-words', type=int, default=DEFAULT_SHINGLE_WORDS)
+    parser.add_argument('--output', help="Also write the clusters as JSON")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus or find_corpus())
+    clusters = find_near_duplicates(corpus.items(), args.threshold, args.permutations, args.bands,
+                                    args.shingle_words)
+    print(format_clusters(clusters, len(corpus)))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(clusters, f, ensure_ascii=False, indent=2)
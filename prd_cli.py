@@ -0,0 +1,46 @@
+"""Single entry point for the PRD tooling.
+
+    python prd_cli.py extract  [options]   DOCX folder -> implementations_extracted.json
+    python prd_cli.py analyze  [options]   summarize the schema found in the corpus
+    python prd_cli.py generate [options]   write database_schema_complete.prisma
+    python prd_cli.py report   [options]   write database_schema_report.md
+
+Each subcommand's module is imported only when that subcommand runs, so
+`--help` and the light subcommands do not pay for python-docx or
+multiprocessing.
+"""
+import argparse
+import sys
+
+# subcommand: (module, help)
+COMMANDS = {
+    'extract': ('extract_docx', "Extract text from the implementations DOCX files"),
+    'analyze': ('analyze_database_schema', "Analyze the extracted documents and summarize the schema"),
+    'generate': ('analyze_database_schema', "Write the Prisma schema derived from the documents"),
+    'report': ('analyze_database_schema', "Write the Markdown schema report"),
+}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='prd_cli.py', description="Extract and analyze the Ibticar.AI PRD documents.",
+        epilog="Run 'prd_cli.py <command> --help' for the options of a command.",
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='command', required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        # The subcommand's own parser handles its options, including --help
+        subparsers.add_parser(name, help=help_text, add_help=False)
+    return parser.parse_known_args(argv)
+
+def main(argv=None):
+    args, rest = parse_args(argv)
+    module_name, _ = COMMANDS[args.command]
+    prog = f'prd_cli.py {args.command}'
+    if module_name == 'extract_docx':
+        import extract_docx
+        extract_docx.main(rest, prog)
+    else:
+        import analyze_database_schema
+        analyze_database_schema.main(rest, args.command, prog)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,198 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+from corpus_store import PROJECT_ROOT
+from schema_model import Enum, Field, Model, Relation, SchemaRegistry, intern_attributes
+
+DEFAULT_SCHEMA_FILE = os.path.join(PROJECT_ROOT, 'prisma', 'schema.prisma')
+
+# Attribute arguments: anything but parentheses and quotes, quoted strings,
+# and one level of nested parentheses as in @default(cuid())
+_STRING = r'"(?:[^"\\]+|\\.)*"'
+_ARGUMENTS = rf'\((?:[^()"]+|{_STRING}|\((?:[^()"]+|{_STRING})*\))*\)'
+_ATTRIBUTE = rf'@[\w.]+(?:{_ARGUMENTS})?'
+_REST = r'[ \t]*(?://.*)?\r?'  # trailing blanks and comment, and the '\r' of CRLF files
+
+# One alternative per kind of line; finditer over the whole text yields one
+# match per line, named by match.lastgroup
+_LINE = re.compile(rf'''^(?:
+    (?P<field>(?P<indent>[ \t]+)(?P<name>\w+)(?P<gap>[ \t]+)(?P<type>\w+(?:\({_STRING}\))?)(?P<suffix>\[\]|\?)?
+        (?P<attributes>(?:[ \t]+{_ATTRIBUTE})*)(?P<rest>{_REST}))
+  | (?P<open>(?P<kind>model|enum|generator|datasource|type|view)[ \t]+(?P<block>\w+)[ \t]*\{{{_REST})
+  | (?P<close>[ \t]*\}}{_REST})
+  | (?P<block_attribute>[ \t]+(?P<block_attribute_text>@{_ATTRIBUTE}){_REST})
+  | (?P<enum_value>[ \t]+(?P<value>\w+)(?:[ \t]+{_ATTRIBUTE})*{_REST})
+  | (?P<trivia>{_REST})
+  | (?P<other>.*)
+)$''', re.MULTILINE | re.VERBOSE)
+_FIELD_ATTRIBUTE = re.compile(rf'([ \t]+)({_ATTRIBUTE})')
+
+_RELATION_NAME = re.compile(rf'@relation\((?:[ \t]*|.*?\bname:[ \t]*)({_STRING})')
+_RELATION_LIST = re.compile(r'\b(fields|references):[ \t]*\[([^\]]*)\]')
+
+class PrismaSchema:
+    """A parsed .prisma file.
+
+    models and enums are schema_model objects, in file order; blocks maps
+    each generator, datasource, type or view block name to its lines.
+    items is the file's top level in order, each a Model, an Enum or the
+    text of a line, so render() writes the file back exactly as it was.
+    """
+
+    def __init__(self, models, enums, blocks, items):
+        self.models = models
+        self.enums = enums
+        self.blocks = blocks
+        self.items = items
+
+    def registry(self):
+        return SchemaRegistry(self.models, self.enums)
+
+    def render(self):
+        lines = []
+        for item in self.items:
+            if isinstance(item, str):
+                lines.append(item)
+            else:
+                lines.extend(item.lines())
+        return '\n'.join(lines)
+
+class _LayoutTable(dict):
+    """One tuple per distinct field layout; column-aligned fields share a handful."""
+
+    def __missing__(self, layout):
+        self[layout] = layout
+        return layout
+
+def _description(comments):
+    """(description, sources) from the '// ...' lines right above a model, as the generator writes them."""
+    description, sources = [], ()
+    for comment in comments:
+        text = comment.strip()[2:].strip()
+        if text.startswith('Source:'):
+            sources = [source.strip() for source in text[len('Source:'):].split(',') if source.strip()]
+        elif text and not text.startswith('='):
+            description.append(text)
+    return ' '.join(description) or None, sources
+
+def _relation(source, field):
+    """Relation for a field whose type is a model, with its @relation arguments."""
+    attribute = field.attribute('@relation')
+    if attribute is None:
+        return Relation(source, field.base_type, field.name)
+    name = _RELATION_NAME.match(attribute)
+    lists = {key: [item.strip() for item in items.split(',') if item.strip()]
+             for key, items in _RELATION_LIST.findall(attribute)}
+    return Relation(source, field.base_type, field.name, name and name.group(1)[1:-1],
+                    lists.get('fields', ()), lists.get('references', ()))
+
+def _parse_field(match, layouts, attribute_lists):
+    indent, name, gap, base_type, suffix, attributes, rest = match.group(
+        'indent', 'name', 'gap', 'type', 'suffix', 'attributes', 'rest')
+    parsed = attribute_lists.get(attributes)
+    if parsed is None:
+        found = _FIELD_ATTRIBUTE.findall(attributes)
+        parsed = attribute_lists[attributes] = (tuple(gap for gap, _ in found),
+                                                intern_attributes(attribute for _, attribute in found))
+    gaps, attributes = parsed
+    return Field(name, base_type, suffix == '?', suffix == '[]', attributes, layouts[indent, gap, gaps, rest])
+
+def parse_prisma(text):
+    """Parse a Prisma schema into a PrismaSchema, in one pass over its lines.
+
+    Handles models (fields, attributes such as @id, @default(...) and
+    @relation(...), @@index, @@unique, @@map and other block attributes),
+    enums (values, @map, @@map) and comments; generator, datasource, type
+    and view blocks are kept as text. A single regex classifies and splits
+    every line. Relations are read from the fields whose type is a model
+    once every model is known. Raises ValueError, with the line number, on
+    a line it cannot read.
+    """
+    models, enums, blocks, items = {}, {}, {}, []
+    layouts = _LayoutTable()
+    attribute_lists = {}
+    comments = []
+    kind = None
+    for number, match in enumerate(_LINE.finditer(text), 1):
+        line_kind = match.lastgroup
+        line = match.group()
+        if kind is None:
+            if line_kind == 'open':
+                kind, name = match.group('kind', 'block')
+                layout = [line]
+                fields, values, attributes = [], [], []
+            elif line_kind == 'trivia':
+                items.append(line)
+                comments = comments + [line] if line.strip() else []
+            else:
+                raise ValueError(f"line {number}: expected a block or a comment, got {line!r}")
+        elif kind == 'model' and line_kind == 'field':
+            layout.append(len(fields))
+            fields.append(_parse_field(match, layouts, attribute_lists))
+        elif kind == 'enum' and line_kind == 'enum_value':
+            layout.append(line)
+            values.append(match.group('value'))
+        elif line_kind == 'close':
+            layout.append(line)
+            if kind == 'model':
+                description, sources = _description(comments)
+                items.append(Model(name, fields, (), description, sources, attributes, tuple(layout)))
+                models[name] = items[-1]
+            elif kind == 'enum':
+                items.append(Enum(name, values, attributes, tuple(layout)))
+                enums[name] = items[-1]
+            else:
+                blocks[name] = (kind, layout)
+                items.extend(layout)
+            kind = None
+            comments = []
+        elif kind not in ('model', 'enum') or line_kind == 'trivia':
+            layout.append(line)
+        elif line_kind == 'block_attribute':
+            layout.append(line)
+            attributes.append(match.group('block_attribute_text'))
+        else:
+            raise ValueError(f"line {number}: cannot read this line of {kind} {name}: {line!r}")
+
+    if kind is not None:
+        raise ValueError(f"{kind} {name} is not closed")
+    for model in models.values():
+        model.relations = tuple(_relation(model.name, field) for field in model.fields if field.base_type in models)
+    return PrismaSchema(models, enums, blocks, items)
+
+def load_prisma(path=DEFAULT_SCHEMA_FILE):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return parse_prisma(f.read())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse a Prisma schema and check it round-trips unchanged.")
+    parser.add_argument('schema', nargs='?', default=DEFAULT_SCHEMA_FILE)
+    parser.add_argument('--repeat', type=int, default=20, help="Keep the best of N timed parses")
+    args = parser.parse_args()
+
+    with open(args.schema, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        schema = parse_prisma(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    registry = schema.registry()
+    line_count = text.count('\n')
+    fields = sum(len(model.fields) for model in schema.models.values())
+    relations = sum(len(model.relations) for model in schema.models.values())
+    block_attributes = [attribute.split('(', 1)[0]
+                        for model in schema.models.values() for attribute in model.attributes]
+    print(f"{args.schema}: {line_count} lines parsed in {best * 1000:.2f} ms")
+    print(f"   - {len(schema.models)} models, {fields} fields, {relations} relation fields "
+          f"({len(registry.relation_pairs())} model pairs)")
+    print(f"   - {len(schema.enums)} enums, {sum(len(enum.values) for enum in schema.enums.values())} values")
+    print("   - block attributes: " + ', '.join(f"{name} {block_attributes.count(name)}"
+                                                for name in sorted(set(block_attributes))))
+    same = schema.render() == text
+    print(f"   - round trip: {'identical' if same else 'DIFFERENT'}")
+    sys.exit(0 if same else 1)
@@ -0,0 +1,164 @@
+import argparse
+import re
+import time
+from collections import namedtuple
+
+from corpus_store import as_interned, find_corpus, load_corpus
+from keyword_matcher import KeywordMatcher, fold
+
+# Enum values are matched case-sensitively; shorter ones, like a one-letter
+# grade, would match every capital initial
+MIN_ENUM_VALUE_LENGTH = 2
+
+_WORD_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+Mention = namedtuple('Mention', ['path', 'paragraph', 'char_offset'])
+
+def term_variants(term):
+    """Spellings of a schema name as prose would write it.
+
+    'purchasePrice' -> ['purchasePrice', 'purchase Price'];
+    'IN_TRANSIT' -> ['IN_TRANSIT', 'IN TRANSIT'].
+    """
+    spaced = ' '.join(_WORD_PATTERN.findall(term))
+    return [term, spaced] if spaced and spaced != term else [term]
+
+def schema_terms(schema, enums):
+    """Yield (kind, term) for every entity name, field name and enum value."""
+    yield from (('entity', entity_name) for entity_name in schema)
+    fields = {field for entity_data in schema.values() for field in entity_data['fields']}
+    yield from (('field', field) for field in sorted(fields))
+    values = {value for enum_values in enums.values() for value in enum_values}
+    yield from (('enum', value) for value in sorted(values))
+
+class ProvenanceIndex:
+    """Inverted index from schema terms to the paragraphs that mention them.
+
+    Entity and field names are matched whole-word, ignoring case and
+    accents, in their written form and split into words; enum values are
+    matched as written. The corpus is scanned once, one distinct paragraph at
+    a time with an Aho-Corasick automaton per matching mode, after which
+    lookup(term) is a dict access. char_offset is the offset of the mention
+    in the document text; paragraph is its line number.
+    """
+
+    def __init__(self, corpus, terms):
+        self.kinds = {}
+        targets = ({}, {})  # folded variant -> terms, variant -> terms
+        for kind, term in terms:
+            self.kinds.setdefault(term, set()).add(kind)
+            case_sensitive = kind == 'enum'
+            if case_sensitive and len(term) < MIN_ENUM_VALUE_LENGTH:
+                continue
+            for variant in term_variants(term):
+                key = variant if case_sensitive else fold(variant)
+                matched = targets[case_sensitive].setdefault(key, [])
+                if term not in matched:
+                    matched.append(term)
+        self.postings = {term: [] for term in self.kinds}
+        self._scan(as_interned(corpus), [
+            (KeywordMatcher(targets[False]), targets[False], fold),
+            (KeywordMatcher(targets[True], case_sensitive=True), targets[True], str),
+        ])
+
+    def _scan(self, corpus, matchers):
+        paragraph_hits = {}
+        for relative_path in corpus:
+            char_offset = 0
+            for paragraph, paragraph_id in enumerate(corpus.paragraph_ids(relative_path)):
+                found = paragraph_hits.get(paragraph_id)
+                if found is None:
+                    text = corpus.paragraphs[paragraph_id]
+                    hits = sorted((start, term)
+                                  for matcher, targets, key in matchers
+                                  for keyword, start, _ in matcher.iter_matches(text)
+                                  for term in targets[key(keyword)])
+                    found = paragraph_hits[paragraph_id] = (len(text) + 1, hits)
+                length, hits = found
+                for start, term in hits:
+                    self.postings[term].append(Mention(relative_path, paragraph, char_offset + start))
+                char_offset += length
+
+    def __contains__(self, term):
+        return term in self.postings
+
+    def __len__(self):
+        return len(self.postings)
+
+    def lookup(self, term):
+        """Mentions of term, in corpus order; [] for terms that are not indexed."""
+        return self.postings.get(term, [])
+
+    def documents(self, term):
+        """Distinct documents mentioning term, in corpus order."""
+        return list(dict.fromkeys(mention.path for mention in self.lookup(term)))
+
+    def modules(self, term):
+        """Sorted PRD folders of the documents mentioning term; root-level documents have none."""
+        return sorted({path.split('/', 1)[0] for path in self.documents(term) if '/' in path})
+
+    def coverage(self):
+        """{kind: (terms mentioned at least once, terms)}."""
+        counts = {}
+        for term, kinds in self.kinds.items():
+            for kind in kinds:
+                found, total = counts.get(kind, (0, 0))
+                counts[kind] = (found + bool(self.postings[term]), total + 1)
+        return counts
+
+def build_schema_index(corpus, schema, enums):
+    return ProvenanceIndex(corpus, schema_terms(schema, enums))
+
+def computed_sources(schema, index):
+    """{entity: modules} from the documents naming each entity.
+
+    Entities the corpus never names keep their hand-typed source list.
+    """
+    return {entity_name: index.modules(entity_name) or list(entity_data['source'])
+            for entity_name, entity_data in schema.items()}
+
+def with_computed_sources(schema, index):
+    """Copy of schema whose 'source' lists come from computed_sources."""
+    sources = computed_sources(schema, index)
+    return {entity_name: {**entity_data, 'source': sources[entity_name]}
+            for entity_name, entity_data in schema.items()}
+
+def _snippet(text, mention, width=40):
+    """The mentioning paragraph, cut to width characters either side of the mention."""
+    line_start = text.rfind('\n', 0, mention.char_offset) + 1
+    line_end = text.find('\n', mention.char_offset)
+    line_end = len(text) if line_end < 0 else line_end
+    start = max(line_start, mention.char_offset - width)
+    end = min(line_end, mention.char_offset + width)
+    return ('...' if start > line_start else '') + text[start:end] + ('...' if end < line_end else '')
+
+if __name__ == "__main__":
+    from analyze_database_schema import ENUMS, analyze_all_documents
+
+    parser = argparse.ArgumentParser(description="Find the documents and paragraphs mentioning schema terms.")
+    parser.add_argument('terms', nargs='*', help="Entity names, field names or enum values to look up")
+    parser.add_argument('--corpus', help="Extracted corpus (default: packed corpus or JSON)")
+    parser.add_argument('-n', '--limit', type=int, default=10, help="Mentions shown per term")
+    parser.add_argument('--sources', action='store_true',
+                        help="Compare the hand-typed source of each entity with the computed one")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus or find_corpus())
+    schema = analyze_all_documents()
+    start = time.perf_counter()
+    index = build_schema_index(corpus, schema, ENUMS)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    coverage = ', '.join(f"{kind} {found}/{total}" for kind, (found, total) in sorted(index.coverage().items()))
+    print(f"Indexed {len(index)} terms over {len(corpus)} documents in {elapsed_ms:.0f} ms ({coverage} mentioned)")
+
+    for term in args.terms:
+        mentions = index.lookup(term)
+        print(f"\n{term}: {len(mentions)} mentions in {len(index.documents(term))} documents")
+        for mention in mentions[:args.limit]:
+            print(f"  {mention.path} ¶{mention.paragraph}  {_snippet(corpus[mention.path], mention)}")
+
+    if args.sources:
+        for entity_name, sources in sorted(computed_sources(schema, index).items()):
+            typed = schema[entity_name]['source']
+            if sources != typed:
+                print(f"{entity_name}: {', '.join(typed)} -> {', '.join(sources)}")
@@ -0,0 +1,295 @@
+import sys
+from collections import namedtuple
+
+class Field:
+    """One field, its declaration parsed once.
+
+    'Decimal? @default(0)' becomes base_type 'Decimal', optional True and
+    attributes ('@default(0)',). Names, types and attributes are interned
+    and identical attribute tuples are shared, so the many fields declared
+    alike cost one copy of their strings.
+
+    layout, set by the .prisma parser, is (indent, gap after the name, gaps
+    before each attribute, rest of the line) so the line can be written back
+    as it was; it is shared between identically laid out fields and takes
+    no part in comparisons.
+    """
+
+    __slots__ = ('name', 'base_type', 'optional', 'is_list', 'attributes', 'layout')
+
+    def __init__(self, name, base_type, optional=False, is_list=False, attributes=(), layout=None):
+        self.name = sys.intern(name)
+        self.base_type = sys.intern(base_type)
+        self.optional = optional
+        self.is_list = is_list
+        self.attributes = intern_attributes(attributes)
+        self.layout = layout
+
+    @classmethod
+    def parse(cls, name, declaration):
+        """Field from its name and a declaration like 'String? @unique @default("")'."""
+        type_token, *attributes = split_declaration(declaration)
+        is_list = type_token.endswith('[]')
+        optional = type_token.endswith('?')
+        base_type = type_token[:-2] if is_list else type_token[:-1] if optional else type_token
+        return cls(name, base_type, optional, is_list, attributes)
+
+    @property
+    def type(self):
+        """The type as written: base type with its [] or ? suffix."""
+        return self.base_type + ('[]' if self.is_list else '?' if self.optional else '')
+
+    @property
+    def declaration(self):
+        """Type and attributes as written in a schema, one space apart."""
+        return ' '.join((self.type,) + self.attributes) if self.attributes else self.type
+
+    def attribute(self, name):
+        """The first attribute named name ('@default', '@relation'...), or None."""
+        for attribute in self.attributes:
+            if attribute == name or attribute.startswith(name + '('):
+                return attribute
+        return None
+
+    def line(self):
+        """The field's line: as laid out in the parsed file, else one space apart."""
+        if self.layout is None:
+            return f'  {self.name} {self.declaration}'
+        indent, gap, attribute_gaps, rest = self.layout
+        attributes = ''.join(map(str.__add__, attribute_gaps, self.attributes))
+        return f'{indent}{self.name}{gap}{self.type}{attributes}{rest}'
+
+    def __eq__(self, other):
+        if not isinstance(other, Field):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in Field.__slots__[:-1])
+
+    def __repr__(self):
+        return f'Field({self.name!r}, {self.declaration!r})'
+
+class Relation:
+    """source model relates to target model.
+
+    Relations read from a .prisma file also carry the relation field and
+    its @relation name, fields and references, when given.
+    """
+
+    __slots__ = ('source', 'target', 'field', 'name', 'fields', 'references')
+
+    def __init__(self, source, target, field=None, name=None, fields=(), references=()):
+        self.source = sys.intern(source)
+        self.target = sys.intern(target)
+        self.field = field
+        self.name = name
+        self.fields = tuple(fields)
+        self.references = tuple(references)
+
+    def __eq__(self, other):
+        if not isinstance(other, Relation):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in Relation.__slots__)
+
+    def __repr__(self):
+        return f'Relation({self.source!r} -> {self.target!r})'
+
+class Enum:
+    """An enum type and its values, in declaration order.
+
+    attributes are its @@ block attributes (@@map...). layout, set by the
+    .prisma parser, is the block's lines as written.
+    """
+
+    __slots__ = ('name', 'values', 'attributes', 'layout')
+
+    def __init__(self, name, values, attributes=(), layout=None):
+        self.name = sys.intern(name)
+        self.values = tuple(sys.intern(value) for value in values)
+        self.attributes = intern_attributes(attributes)
+        self.layout = layout
+
+    def lines(self):
+        """The enum block's lines: as written in the parsed file, else one value per line."""
+        if self.layout is not None:
+            return list(self.layout)
+        return ([f'enum {self.name} {{'] + [f'  {value}' for value in self.values]
+                + [f'  {attribute}' for attribute in self.attributes] + ['}'])
+
+    def __eq__(self, other):
+        if not isinstance(other, Enum):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in Enum.__slots__[:-1])
+
+    def __repr__(self):
+        return f'Enum({self.name!r}, {len(self.values)} values)'
+
+class Model:
+    """A model: its fields and relations in declaration order, and the PRD modules it comes from.
+
+    attributes are its @@ block attributes (@@index, @@unique, @@map...).
+    layout, set by the .prisma parser, lists the block's lines in order:
+    an index into fields for each field line, the text of any other line.
+    """
+
+    __slots__ = ('name', 'description', 'fields', 'relations', 'sources', 'attributes', 'layout')
+
+    def __init__(self, name, fields=(), relations=(), description=None, sources=(), attributes=(),
+                 layout=None):
+        self.name = sys.intern(name)
+        self.description = description
+        self.fields = tuple(fields)
+        self.relations = tuple(relations)
+        self.sources = tuple(sys.intern(source) for source in sources)
+        self.attributes = intern_attributes(attributes)
+        self.layout = layout
+
+    def lines(self):
+        """The model block's lines: as written in the parsed file, else one field per line."""
+        if self.layout is not None:
+            return [entry if isinstance(entry, str) else self.fields[entry].line() for entry in self.layout]
+        return ([f'model {self.name} {{'] + [field.line() for field in self.fields]
+                + [f'  {attribute}' for attribute in self.attributes] + ['}'])
+
+    def field(self, name):
+        """The field called name, or None."""
+        for field in self.fields:
+            if field.name == name:
+                return field
+        return None
+
+    def __eq__(self, other):
+        if not isinstance(other, Model):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in Model.__slots__[:-1])
+
+    def __repr__(self):
+        return f'Model({self.name!r}, {len(self.fields)} fields, {len(self.relations)} relations)'
+
+FieldUse = namedtuple('FieldUse', ['model', 'field'])
+
+class SchemaRegistry:
+    """Models and enums indexed for the lookups the generators and reports make.
+
+    The indexes, the module map and the set of related model pairs are
+    built in one pass over the models, after which each lookup is a dict
+    access:
+
+        registry.model('Vehicle')
+        registry.fields_named('createdAt')    FieldUses across every model
+        registry.enum_fields('Currency')      FieldUses whose type is that enum
+        registry.incoming('Customer')         Relations whose target it is
+        registry.models_from('PRD-04-CRM')    models whose sources list it
+
+    Index entries keep model order; the registry is not meant to be
+    modified once built.
+    """
+
+    def __init__(self, models, enums=None):
+        self.models = dict(models)
+        self.enums = dict(enums or {})
+        self._fields = {}
+        self._enum_fields = {}
+        self._incoming = {}
+        self._modules = {}
+        for model in self.models.values():
+            for field in model.fields:
+                use = FieldUse(model, field)
+                self._fields.setdefault(field.name, []).append(use)
+                if field.base_type in self.enums:
+                    self._enum_fields.setdefault(field.base_type, []).append(use)
+            for relation in model.relations:
+                self._incoming.setdefault(relation.target, []).append(relation)
+            for source in model.sources:
+                self._modules.setdefault(source, []).append(model)
+        self._module_names = {module: [model.name for model in models] for module, models in self._modules.items()}
+        self._relation_pairs = frozenset((relation.source, relation.target)
+                                         for relations in self._incoming.values() for relation in relations)
+
+    def __contains__(self, name):
+        return name in self.models
+
+    def __len__(self):
+        return len(self.models)
+
+    def model(self, name):
+        """The model called name, or None."""
+        return self.models.get(name)
+
+    def fields_named(self, name):
+        return self._fields.get(name, [])
+
+    def enum_fields(self, enum_name):
+        return self._enum_fields.get(enum_name, [])
+
+    def incoming(self, target):
+        return self._incoming.get(target, [])
+
+    def models_from(self, module):
+        return self._modules.get(module, [])
+
+    def modules(self):
+        """{module: [model name]} for every source module, models in registry order."""
+        return self._module_names
+
+    def relation_pairs(self):
+        """The frozenset of (source, target) model name pairs."""
+        return self._relation_pairs
+
+# One tuple per distinct attribute list, shared by every field that has it
+_SHARED_ATTRIBUTES = {}
+
+def intern_attributes(attributes):
+    attributes = tuple(attributes)
+    shared = _SHARED_ATTRIBUTES.get(attributes)
+    if shared is None:
+        shared = _SHARED_ATTRIBUTES[attributes] = tuple(map(sys.intern, attributes))
+    return shared
+
+def split_declaration(declaration):
+    """Split 'Type @a @b(x, "y z")' on spaces outside parentheses and quotes."""
+    tokens = []
+    start = None
+    depth = 0
+    quoted = False
+    escaped = False
+    for position, char in enumerate(declaration):
+        if quoted:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                quoted = False
+        elif char == '"':
+            quoted = True
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char.isspace() and depth == 0:
+            if start is not None:
+                tokens.append(declaration[start:position])
+                start = None
+            continue
+        if start is None:
+            start = position
+    if start is not None:
+        tokens.append(declaration[start:])
+    return tokens
+
+def model_from_entity(name, entity):
+    """Model from one entity of the schema definition (description, fields, relations, source)."""
+    return Model(
+        name,
+        [Field.parse(field_name, declaration) for field_name, declaration in entity['fields'].items()],
+        [Relation(name, target) for target in entity['relations']],
+        entity['description'],
+        entity['source'],
+    )
+
+def build_models(schema):
+    """{name: Model} for a schema definition's entities, in the same order."""
+    return {name: model_from_entity(name, entity) for name, entity in schema.items()}
+
+def build_enums(enums):
+    """{name: Enum} for a schema definition's enums, in the same order."""
+    return {name: Enum(name, values) for name, values in enums.items()}
@@ -0,0 +1,211 @@
+import multiprocessing
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:  # Windows: no per-process memory limit
+    resource = None
+
+def _apply_memory_limit(max_memory_mb):
+    if max_memory_mb and resource is not None:
+        limit = int(max_memory_mb * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def _call(func, args):
+    """Run func(*args), returning (True, value) or (False, reason, error)."""
+    try:
+        return True, func(*args)
+    except MemoryError:
+        return False, 'memory', 'MemoryError: memory limit exceeded'
+    except Exception as e:
+        return False, 'error', f"{type(e).__name__}: {e}"
+
+def _worker_main(conn, func, max_memory_mb):
+    _apply_memory_limit(max_memory_mb)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        index, args = task
+        conn.send((index, _call(func, args)))
+
+class _Slot:
+    """One worker process and the task it is currently running."""
+
+    def __init__(self, context, func, max_memory_mb):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, func, max_memory_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task = None
+        self.deadline = None
+
+    def start(self, task, timeout):
+        self.task = task
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.conn.send(task[:2])
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+def _wait_for_outcome(slot, timeout):
+    """Block until the slot's worker answers, dies or overruns timeout; returns the outcome."""
+    try:
+        ready = wait([slot.conn, slot.process.sentinel], timeout)
+        if slot.conn.poll():
+            return slot.conn.recv()[1]
+    except (EOFError, OSError):
+        ready = True  # the worker died mid-answer, or was killed
+    if not ready:
+        return False, 'timeout', f"No result after {timeout}s"
+    slot.process.join()
+    return False, 'crash', f"Worker exited with code {slot.process.exitcode}"
+
+class SupervisedWorker:
+    """One supervised worker process kept alive across calls.
+
+    call(*args) returns the outcome of func(*args) as supervised_map yields
+    it, for callers that get their arguments one at a time. The worker is
+    only replaced when a call crashes it or overruns `timeout`; without a
+    timeout or memory limit calls run in this process.
+    """
+
+    def __init__(self, func, timeout=None, max_memory_mb=None, retries=1):
+        self.func = func
+        self.timeout = timeout
+        self.max_memory_mb = max_memory_mb
+        self.retries = retries
+        self.context = multiprocessing.get_context()
+        self.slot = None
+        if timeout is not None or max_memory_mb is not None:
+            self.slot = _Slot(self.context, func, max_memory_mb)
+
+    def call(self, *args):
+        for attempt in range(1, self.retries + 2):
+            if self.slot is None:
+                outcome = _call(self.func, args)
+            else:
+                self.slot.start((0, args), self.timeout)
+                outcome = _wait_for_outcome(self.slot, self.timeout)
+                if not outcome[0] and outcome[1] in ('crash', 'timeout'):
+                    self.slot.kill()
+                    self.slot = _Slot(self.context, self.func, self.max_memory_mb)
+            if outcome[0]:
+                return outcome
+        return False, {'reason': outcome[1], 'error': outcome[2], 'attempts': attempt}
+
+    def close(self):
+        if self.slot is not None:
+            self.slot.stop()
+            self.slot = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def supervised_map(func, arg_list, workers=1, timeout=None, max_memory_mb=None, retries=1):
+    """Yield the outcome of func(*args) for each args tuple, in input order.
+
+    Each outcome is (True, value) or (False, failure) where failure is a dict
+    with 'reason' ('error', 'memory', 'timeout' or 'crash'), 'error' and
+    'attempts'. A failing call is retried `retries` times before it is
+    reported.
+
+    With a timeout or memory limit, or more than one worker, every call runs
+    in a supervised worker process: one that overruns `timeout` seconds is
+    killed and replaced, and `max_memory_mb` caps each worker's address
+    space (POSIX only). Otherwise calls run in this process.
+    """
+    arg_list = list(arg_list)
+    if workers <= 1 and timeout is None and max_memory_mb is None:
+        yield from _map_in_process(func, arg_list, retries)
+        return
+
+    context = multiprocessing.get_context()
+    queue = deque((index, args, 1) for index, args in enumerate(arg_list))
+    slots = [_Slot(context, func, max_memory_mb) for _ in range(min(workers, len(arg_list)))]
+    results = {}
+    next_index = 0
+
+    def finish(slot, outcome):
+        index, args, attempt = slot.task
+        slot.task = None
+        if outcome[0]:
+            results[index] = outcome
+        elif attempt <= retries:
+            queue.appendleft((index, args, attempt + 1))
+        else:
+            results[index] = (False, {'reason': outcome[1], 'error': outcome[2], 'attempts': attempt})
+
+    try:
+        while next_index < len(arg_list):
+            for slot in slots:
+                if slot.task is None and queue:
+                    slot.start(queue.popleft(), timeout)
+
+            busy = [slot for slot in slots if slot.task is not None]
+            deadlines = [slot.deadline for slot in busy if slot.deadline is not None]
+            wait_for = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+            wait([slot.conn for slot in busy] + [slot.process.sentinel for slot in busy], wait_for)
+
+            for position, slot in enumerate(slots):
+                if slot.task is None:
+                    continue
+                outcome = None
+                if slot.conn.poll():
+                    try:
+                        _, outcome = slot.conn.recv()
+                    except (EOFError, OSError):
+                        pass
+                if outcome is None and not slot.process.is_alive():
+                    outcome = (False, 'crash', f"Worker exited with code {slot.process.exitcode}")
+                elif outcome is None and slot.deadline is not None and time.monotonic() >= slot.deadline:
+                    outcome = (False, 'timeout', f"No result after {timeout}s")
+                if outcome is None:
+                    continue
+                if not outcome[0] and outcome[1] in ('crash', 'timeout'):
+                    slot.kill()
+                    replacement = _Slot(context, func, max_memory_mb)
+                    replacement.task = slot.task
+                    slots[position] = slot = replacement
+                finish(slot, outcome)
+
+            while next_index in results:
+                yield results.pop(next_index)
+                next_index += 1
+    finally:
+        for slot in slots:
+            if slot.task is None:
+                slot.stop()
+            else:
+                slot.kill()
+
+def _map_in_process(func, arg_list, retries):
+    for args in arg_list:
+        for attempt in range(1, retries + 2):
+            outcome = _call(func, args)
+            if outcome[0]:
+                yield outcome
+                break
+        else:
+            yield False, {'reason': outcome[1], 'error': outcome[2], 'attempts': attempt}
@@ -0,0 +1,107 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from distributed_extract import _claim_next, _reclaim_expired, enqueue, merge, work
+from generate_docx_corpus import generate_corpus
+
+SCRIPT = os.path.join(ROOT, 'distributed_extract.py')
+
+class QueueTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, *parts):
+        return os.path.join(self.tmp.name, *parts)
+
+class RunLocalTwiceTest(QueueTestCase):
+    """Re-using a queue directory for another corpus must not merge the previous run's results."""
+
+    def run_local(self, base_path, output):
+        subprocess.run([sys.executable, SCRIPT, 'run-local', base_path, self.path('queue'),
+                        '-n', '2', '-o', output], check=True, stdout=subprocess.DEVNULL)
+        with open(output, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_second_run_only_has_its_own_documents(self):
+        generate_corpus(self.path('first'), modules=2, stories=3, paragraphs=3, seed=1)
+        generate_corpus(self.path('second'), modules=1, stories=1, paragraphs=3, seed=2)
+
+        first = self.run_local(self.path('first'), self.path('first.json'))
+        second = self.run_local(self.path('second'), self.path('second.json'))
+
+        self.assertEqual(len(first), 8)
+        self.assertEqual(sorted(second), ['PRD-00-Module/PRD.docx', 'PRD-00-Module/US-000-Story.docx'])
+        self.assertNotEqual(second['PRD-00-Module/PRD.docx'], first['PRD-00-Module/PRD.docx'])
+
+    def test_merge_ignores_records_from_an_earlier_run(self):
+        generate_corpus(self.path('corpus'), modules=1, stories=1, paragraphs=3)
+        enqueue(self.path('corpus'), self.path('queue'))
+        stale = {'run': 'earlier', 'index': 0, 'path': 'stale.docx', 'worker': 'old', 'text': 'stale'}
+        with open(self.path('queue', 'shards', 'old.jsonl'), 'w', encoding='utf-8') as f:
+            f.write(json.dumps(stale) + '\n')
+
+        documents, _, unfinished = merge(self.path('queue'), self.path('out.json'))
+        self.assertEqual((documents, unfinished), (0, 2))
+
+    def test_enqueue_refuses_a_directory_that_is_not_a_queue(self):
+        os.makedirs(self.path('queue'))
+        with open(self.path('queue', 'notes.txt'), 'w', encoding='utf-8') as f:
+            f.write('keep me')
+        with self.assertRaises(ValueError):
+            enqueue(self.path('corpus'), self.path('queue'))
+
+class LeaseTest(QueueTestCase):
+    """Claims of a worker that stopped heartbeating go back to todo and get done by another."""
+
+    def setUp(self):
+        super().setUp()
+        generate_corpus(self.path('corpus'), modules=1, stories=2, paragraphs=3)
+        enqueue(self.path('corpus'), self.path('queue'))
+
+    def test_fresh_claim_is_not_reclaimed(self):
+        # A task that waited in todo longer than the lease must still start with a full lease
+        old = time.time() - 3600
+        for name in os.listdir(self.path('queue', 'todo')):
+            os.utime(self.path('queue', 'todo', name), (old, old))
+        name, claimed_path, _ = _claim_next(self.path('queue'), 'w1')
+
+        self.assertEqual(_reclaim_expired(self.path('queue'), lease=60), 1)
+        self.assertTrue(os.path.exists(claimed_path))
+
+    def test_expired_claim_is_reclaimed_and_done_by_another_worker(self):
+        name, claimed_path, _ = _claim_next(self.path('queue'), 'dead')
+        old = time.time() - 3600
+        os.utime(claimed_path, (old, old))
+
+        done = work(self.path('queue'), 'live', lease=60, timeout=None, poll_interval=0.05)
+        documents, quarantined, unfinished = merge(self.path('queue'), self.path('out.json'))
+
+        self.assertEqual(done, 3)
+        self.assertEqual((documents, quarantined, unfinished), (3, 0, 0))
+        self.assertTrue(os.path.exists(self.path('queue', 'done', name)))
+
+class RunLocalQuarantineTest(QueueTestCase):
+
+    def test_failed_file_is_reported(self):
+        generate_corpus(self.path('corpus'), modules=1, stories=1, paragraphs=3)
+        with open(self.path('corpus', 'broken.docx'), 'wb') as f:
+            f.write(b'not a zip file')
+        subprocess.run([sys.executable, SCRIPT, 'run-local', self.path('corpus'), self.path('queue'),
+                        '-n', '1', '-o', self.path('out.json')], check=True, stdout=subprocess.DEVNULL)
+
+        with open(self.path('out.quarantine.json'), 'r', encoding='utf-8') as f:
+            failed = json.load(f)['failed']
+        self.assertEqual([record['path'] for record in failed], ['broken.docx'])
+
+if __name__ == '__main__':
+    unittest.main()
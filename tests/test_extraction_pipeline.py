@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from extraction_pipeline import iter_pipeline
+
+def _parse(data, engine):
+    """Stand-in for extract_docx._parse_bytes: the file's content says how it behaves."""
+    if data == b'crash':
+        os._exit(1)
+    if data == b'hang':
+        time.sleep(60)
+    started = time.perf_counter()
+    if data.startswith(b'slow'):
+        time.sleep(0.3)
+    return data.decode(), {'paragraphs': 1}, time.perf_counter() - started
+
+class BadFileIsolationTest(unittest.TestCase):
+    """A file that kills or hangs its worker must not fail the files parsed next to it."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def planned(self, contents):
+        planned = []
+        for number, content in enumerate(contents):
+            file_path = os.path.join(self.tmp.name, f'{number:02d}.docx')
+            with open(file_path, 'wb') as f:
+                f.write(content)
+            planned.append((file_path, f'{number:02d}.docx', {}))
+        return planned
+
+    def outcomes(self, contents, **options):
+        return {relative_path: outcome
+                for relative_path, _, outcome in iter_pipeline(self.planned(contents), _parse, 'test', **options)}
+
+    def test_crash_only_quarantines_the_crashing_file(self):
+        contents = [b'slow 1', b'crash', b'slow 2', b'good 3', b'slow 4', b'good 5']
+        outcomes = self.outcomes(contents, workers=3, timeout=30)
+
+        self.assertEqual(outcomes['01.docx'][0], False)
+        self.assertEqual((outcomes['01.docx'][1]['reason'], outcomes['01.docx'][1]['attempts']), ('crash', 2))
+        for number, content in enumerate(contents):
+            if content != b'crash':
+                self.assertEqual(outcomes[f'{number:02d}.docx'][:1], (True,))
+                self.assertEqual(outcomes[f'{number:02d}.docx'][1][0], content.decode())
+
+    def test_timeout_only_quarantines_the_hanging_file(self):
+        outcomes = self.outcomes([b'hang', b'slow 1', b'good 2', b'slow 3'], workers=2, timeout=1)
+
+        self.assertEqual(outcomes['00.docx'][1]['reason'], 'timeout')
+        self.assertEqual([outcomes[f'{number:02d}.docx'][0] for number in (1, 2, 3)], [True, True, True])
+
+if __name__ == '__main__':
+    unittest.main()
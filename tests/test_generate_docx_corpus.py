@@ -0,0 +1,32 @@
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from extract_docx import ENGINES, extract_text_from_docx, iter_docx_files
+from generate_docx_corpus import generate_corpus
+
+class GenerateCorpusTest(unittest.TestCase):
+    """Merged and nested tables: the generator must not crash and both engines must read the result alike."""
+
+    def test_seeds_and_merge_counts(self):
+        # (4, 0, seed 3) and (6, 1, seed 3) used to overlap merges and crash python-docx
+        for merged in (2, 4, 6):
+            for nesting in (0, 1):
+                for seed in range(5):
+                    with self.subTest(merged=merged, nesting=nesting, seed=seed), \
+                            tempfile.TemporaryDirectory() as output_dir:
+                        count = generate_corpus(output_dir, modules=1, stories=3, seed=seed, paragraphs=2,
+                                                merged=merged, nesting=nesting)
+                        files = list(iter_docx_files(output_dir))
+                        self.assertEqual(len(files), count)
+                        for file_path, _ in files:
+                            texts = {engine: extract_text_from_docx(file_path, engine) for engine in ENGINES}
+                            self.assertIn('Critères', texts['python-docx'])
+                            self.assertEqual(texts['xml'], texts['python-docx'])
+
+if __name__ == '__main__':
+    unittest.main()